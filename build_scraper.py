@@ -18,9 +18,11 @@ from functions.functions_builder import (
     analyze_pagination,
     generate_xpaths_for_all_elements,
     find_xpath_for_string,
+    find_total_count_xpath,
     generalize_xpath,
     write_config_to_csv
 )
+from functions.functions_scraper import extract_total_count
 
 def parse_arguments() -> Tuple[str, bool]:
     """
@@ -102,8 +104,8 @@ def main() -> None:
         # Process page content
         if verbose:
             print("Processing page content...")
-        html = get_page_html(driver)
-        html = clean_page(html)
+        raw_html = get_page_html(driver)
+        html = clean_page(raw_html)
         html, _ = initialize_tokenizer(html)
         
         # Extract job listings
@@ -136,6 +138,14 @@ def main() -> None:
         if verbose:
             print(f"Generated XPath pattern: {generalized_xpath}")
             
+        # Learn where the listing states its total job count, if it does
+        total_count_xpath = find_total_count_xpath(raw_html)
+        total_count = extract_total_count(raw_html, total_count_xpath) if total_count_xpath else None
+        if not total_count or total_count < len(job_urls):
+            total_count_xpath = ''
+        elif verbose:
+            print(f"Found total job count {total_count} at {total_count_xpath}")
+            
         # Analyze and verify pagination
         if verbose:
             print("Analyzing pagination pattern...")
@@ -164,7 +174,8 @@ def main() -> None:
                 timestamp_unix,
                 generalized_xpath,
                 full_url,
-                page_increment
+                page_increment,
+                total_count_xpath=total_count_xpath
             )
         
         # Print summary
@@ -173,6 +184,7 @@ def main() -> None:
         print(f"- Pagniated link: {full_url}")
         print(f"- Page increment: {page_increment}")
         print(f"- Generic job XPath: {generalized_xpath}")
+        print(f"- Total count XPath: {total_count_xpath or 'not found'}")
         print(f"- OpenAI API cost: ${overall_cost:.4f}")
         print(f"- Total time: {total_time:.2f} seconds")
         if generalized_xpath == False:
@@ -10,7 +10,7 @@ import json
 from urllib.parse import urlparse
 import os
 from openai import OpenAI
-from lxml import etree
+from lxml import etree, html as lxml_html
 from urllib.parse import urljoin, urlunparse
 import csv
 
@@ -18,6 +18,7 @@ from collections import defaultdict
 import statistics
 
 from functions.functions_openai import gpt_me, open_ai_cost
+from functions.functions_scraper import parse_total_count
 import tiktoken
 from typing import Tuple
 
@@ -95,7 +96,8 @@ def write_config_to_csv(
     xpath: str,
     url: str,
     increment: int,
-    file_path: str = 'sites_to_scrape.csv'
+    file_path: str = 'sites_to_scrape.csv',
+    total_count_xpath: str = ''
 ) -> None:
     """
     Write scraper configuration to CSV file.
@@ -107,16 +109,19 @@ def write_config_to_csv(
         url: Base URL for scraping
         increment: Page increment value
         file_path: Path to output CSV file
+        total_count_xpath: Optional XPath of the listing's total job count text
     """
     headers = [
         'Human Readable Timestamp',
         'Unix Timestamp',
         'Generic Job XPath',
         'Paged Link URL',
-        'Page Increment Value'
+        'Page Increment Value',
+        'Lite Allowlist',
+        'Total Count XPath'
     ]
     
-    data = [timestamp_human, timestamp_unix, xpath, url, increment]
+    data = [timestamp_human, timestamp_unix, xpath, url, increment, '', total_count_xpath]
     
     # Ensure the directory exists
     os.makedirs(os.path.dirname(file_path) if os.path.dirname(file_path) else '.', exist_ok=True)
@@ -267,6 +272,45 @@ def generate_xpaths_for_all_elements(html_content: str) -> Dict[str, str]:
     # Sort by XPath complexity (number of slashes)
     return dict(sorted(xpaths.items(), key=lambda x: x[0].count('/'), reverse=True))
 
+def generate_element_locator(element: etree._Element) -> str:
+    """Build a locator for an element, preferring a unique id or class over its position."""
+    tree = element.getroottree()
+    for attribute in ('id', 'class'):
+        value = element.get(attribute)
+        if value and "'" not in value:
+            locator = f"//{element.tag}[@{attribute}='{value}']"
+            if len(tree.xpath(locator)) == 1:
+                return locator
+    return tree.getpath(element)
+
+def find_total_count_xpath(html: str) -> Optional[str]:
+    """
+    Find the element stating a listing's total job count, such as "1-20 of 437 jobs".
+    
+    Args:
+        html: Rendered HTML of the first listing page
+        
+    Returns:
+        XPath locating the total-count text, or None if no such text was found
+    """
+    try:
+        root = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+        
+    candidates = []
+    for element in root.iter():
+        if not isinstance(element.tag, str) or element.tag in ('script', 'style', 'noscript'):
+            continue
+        text = " ".join(element.text_content().split())
+        if text and len(text) <= 80 and parse_total_count(text) is not None:
+            candidates.append(element)
+            
+    if not candidates:
+        return None
+    # The deepest match is the element holding the text rather than a container around it
+    return generate_element_locator(max(candidates, key=lambda element: len(list(element.iterancestors()))))
+
 def find_xpath_for_string(xpaths_dict: Dict[str, str], html_fragments: List[str]) -> Dict[str, str]:
     """Find matching XPaths for given HTML fragments."""
     return {
@@ -0,0 +1,188 @@
+"""
+Functions for the crash-resumable scrape checkpoint journal.
+Records, per listing, the pages crawled and job links discovered, and which
+sites of the current run are finished, so a restarted run skips finished
+sites and picks pagination up where it stopped. Downloaded pages need no
+entry here: each one is already recorded in the cache manifest as it is saved.
+The journal remembers when its run started, so a run abandoned long ago can
+be discarded instead of resumed.
+"""
+from typing import Iterable, List, Optional
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .functions_manifest import connect_database
+
+# Constants
+CHECKPOINT_FILENAME = 'checkpoint.sqlite3'
+CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listing_progress (
+    listing_url TEXT PRIMARY KEY,
+    next_page INTEGER NOT NULL,
+    last_page INTEGER,
+    finished INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS listing_links (
+    listing_url TEXT NOT NULL,
+    link TEXT NOT NULL,
+    PRIMARY KEY (listing_url, link)
+);
+CREATE TABLE IF NOT EXISTS finished_sites (
+    listing_url TEXT PRIMARY KEY,
+    finished_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_info (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    started_at REAL NOT NULL
+);
+"""
+
+@dataclass
+class ListingProgress:
+    """Pagination state of a listing saved after its last crawled page."""
+    next_page: int
+    last_page: Optional[int] = None
+    finished: bool = False
+
+class CheckpointJournal:
+    """SQLite journal of an in-progress scrape run."""
+
+    def __init__(self, path: Path):
+        """
+        Open the journal, creating it if needed.
+
+        A new journal records the current time as the start of its run.
+
+        Args:
+            path: Journal database file
+        """
+        self.connection = connect_database(path, CHECKPOINT_SCHEMA)
+        self._lock = threading.Lock()
+        self.connection.execute(
+            "INSERT OR IGNORE INTO run_info (id, started_at) VALUES (1, ?)",
+            (datetime.now().timestamp(),)
+        )
+
+    def get_run_started(self) -> datetime:
+        """Get the time the journaled run started."""
+        with self._lock:
+            row = self.connection.execute("SELECT started_at FROM run_info WHERE id = 1").fetchone()
+        return datetime.fromtimestamp(row[0])
+
+    def clear_if_older_than(self, max_age: timedelta) -> bool:
+        """
+        Discard the progress of a run that started too long ago.
+
+        Its listings have moved on and its pages have expired from the cache,
+        so resuming it would skip sites that need crawling again.
+
+        Args:
+            max_age: Oldest run start worth resuming
+
+        Returns:
+            True if the journal was cleared
+        """
+        if datetime.now() - self.get_run_started() <= max_age:
+            return False
+        self.clear()
+        return True
+
+    def get_listing_progress(self, listing_url: str) -> Optional[ListingProgress]:
+        """Get the saved pagination state of a listing, if it was started."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT next_page, last_page, finished FROM listing_progress WHERE listing_url = ?",
+                (listing_url,)
+            ).fetchone()
+        return ListingProgress(row[0], row[1], bool(row[2])) if row else None
+
+    def get_links(self, listing_url: str) -> List[str]:
+        """Get the job links discovered on a listing's crawled pages."""
+        with self._lock:
+            return [row[0] for row in self.connection.execute(
+                "SELECT link FROM listing_links WHERE listing_url = ?",
+                (listing_url,)
+            )]
+
+    def record_page(
+        self,
+        listing_url: str,
+        links: Iterable[str],
+        next_page: int,
+        last_page: Optional[int] = None
+    ) -> None:
+        """
+        Record a crawled listing page and the links it added, in one transaction.
+
+        Args:
+            listing_url: Listing URL from the site config
+            links: New job links found on the page
+            next_page: Page number to continue from
+            last_page: Last page of the listing, if known
+        """
+        now = datetime.now().timestamp()
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO listing_links (listing_url, link) VALUES (?, ?)",
+                    [(listing_url, link) for link in links]
+                )
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO listing_progress (listing_url, next_page, last_page, finished, updated_at) "
+                    "VALUES (?, ?, ?, 0, ?)",
+                    (listing_url, next_page, last_page, now)
+                )
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def mark_listing_finished(self, listing_url: str) -> None:
+        """Record that pagination of a listing has reached its end."""
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO listing_progress (listing_url, next_page, finished, updated_at) VALUES (?, 0, 1, ?) "
+                "ON CONFLICT(listing_url) DO UPDATE SET finished = 1, updated_at = excluded.updated_at",
+                (listing_url, datetime.now().timestamp())
+            )
+
+    def is_site_done(self, listing_url: str) -> bool:
+        """Check whether a site was fully scraped earlier in this run."""
+        with self._lock:
+            return self.connection.execute(
+                "SELECT 1 FROM finished_sites WHERE listing_url = ?",
+                (listing_url,)
+            ).fetchone() is not None
+
+    def mark_site_done(self, listing_url: str) -> None:
+        """Record that a site's pagination and downloads are complete."""
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO finished_sites (listing_url, finished_at) VALUES (?, ?)",
+                (listing_url, datetime.now().timestamp())
+            )
+
+    def count_finished_sites(self) -> int:
+        """Number of sites finished in this run."""
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM finished_sites").fetchone()[0]
+
+    def clear(self) -> None:
+        """Forget all progress, ready for a fresh run starting now."""
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            for table in ('listing_progress', 'listing_links', 'finished_sites'):
+                self.connection.execute(f"DELETE FROM {table}")
+            self.connection.execute(
+                "INSERT OR REPLACE INTO run_info (id, started_at) VALUES (1, ?)",
+                (datetime.now().timestamp(),)
+            )
+            self.connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the journal."""
+        self.connection.close()
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Functions for cache garbage collection.
+Sweeps entries past their revalidation grace period, enforces a total size
+cap by evicting each site's oldest pages first, and can run in a background
+thread during a scrape.
+"""
+from typing import Dict, Optional
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from . import functions_scraper
+from .functions_scraper import (
+    DEFAULT_CACHE_MAX_AGE,
+    find_cache_file,
+    get_entry_filename,
+    get_object_path
+)
+from .functions_manifest import (
+    ManifestEntry,
+    get_manifest,
+    manifest_transaction,
+    list_entries,
+    delete_entry_if_unchanged,
+    count_content_references,
+    count_all_content_references
+)
+
+# Constants
+OBJECT_GRACE_PERIOD: float = 3600.0  # Unreferenced objects younger than this may be mid-write
+MTIME_SLACK: float = 1.0  # Files modified after their manifest entry have been rewritten
+REVALIDATION_GRACE_PERIOD = timedelta(days=28)  # Stale pages keep their validators for conditional requests
+
+@dataclass
+class GCReport:
+    """Summary of a garbage collection pass."""
+    expired: int = 0
+    evicted: int = 0
+    orphans: int = 0
+    bytes_reclaimed: int = 0
+
+def format_gc_report(report: GCReport) -> str:
+    """Format a garbage collection report for printing."""
+    return (
+        f"Removed {report.expired} expired and {report.evicted} evicted entries "
+        f"and {report.orphans} orphaned objects, reclaimed {report.bytes_reclaimed / 1e6:.2f} MB"
+    )
+
+def get_file_size(path: Path) -> int:
+    """Size of a file in bytes, or 0 if it does not exist."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+def get_entry_disk_bytes(entry: ManifestEntry, references: Dict[str, int]) -> int:
+    """
+    Estimate the disk space attributable to a manifest entry.
+
+    Compressed objects shared by several URLs are split evenly between them.
+
+    Args:
+        entry: Manifest entry
+        references: Reference count of every object, from count_all_content_references
+    """
+    if entry.compressed:
+        return get_file_size(get_object_path(entry.content_hash)) // max(references.get(entry.content_hash, 0), 1)
+    return get_file_size(find_cache_file(get_entry_filename(entry)))
+
+def remove_cache_entry(manifest: sqlite3.Connection, entry: ManifestEntry) -> Optional[int]:
+    """
+    Remove a cache entry and its stored page, unless a scrape has just refreshed it.
+
+    Args:
+        manifest: Manifest connection
+        entry: Entry as previously read from the manifest
+
+    Returns:
+        Bytes reclaimed on disk, or None if no cached page was removed because
+        the entry was refreshed or its page was already missing
+    """
+    with manifest_transaction(manifest):
+        if not delete_entry_if_unchanged(manifest, entry):
+            return None
+
+        if entry.compressed:
+            object_path = get_object_path(entry.content_hash)
+            if not object_path.exists():
+                return None
+            if count_content_references(manifest, entry.content_hash) > 0:
+                return 0
+            return remove_object(object_path)
+
+        cache_file = find_cache_file(get_entry_filename(entry))
+        try:
+            stat = cache_file.stat()
+        except FileNotFoundError:
+            return None
+        if stat.st_mtime > entry.fetched_at + MTIME_SLACK:
+            return None
+        cache_file.unlink(missing_ok=True)
+        return stat.st_size
+
+def remove_object(object_path: Path, grace_period: float = OBJECT_GRACE_PERIOD) -> int:
+    """Delete an unreferenced object unless it was written or reused recently."""
+    try:
+        stat = object_path.stat()
+    except FileNotFoundError:
+        return 0
+    if time.time() - stat.st_mtime < grace_period:
+        return 0
+    object_path.unlink(missing_ok=True)
+    return stat.st_size
+
+def sweep_expired_entries(
+    manifest: sqlite3.Connection,
+    max_age: timedelta,
+    report: GCReport,
+    grace_period: timedelta = REVALIDATION_GRACE_PERIOD
+) -> None:
+    """
+    Remove every entry older than the maximum cache age plus the grace period.
+
+    Pages past the maximum age are stale but still hold the ETag and
+    Last-Modified validators a 304 revalidation needs, so they are kept
+    for the grace period before being removed.
+    """
+    cutoff = datetime.now().timestamp() - (max_age + grace_period).total_seconds()
+    for entry in list_entries(manifest, fetched_before=cutoff):
+        reclaimed = remove_cache_entry(manifest, entry)
+        if reclaimed is not None:
+            report.expired += 1
+            report.bytes_reclaimed += reclaimed
+
+def enforce_size_cap(
+    manifest: sqlite3.Connection,
+    max_bytes: int,
+    report: GCReport
+) -> None:
+    """
+    Evict entries until the cache fits within the size cap.
+
+    Entries are taken oldest-first from whichever site currently uses the
+    most space, so one large board cannot push every other site out.
+    """
+    queues: Dict[str, deque] = {}
+    usage: Dict[str, int] = {}
+    references = count_all_content_references(manifest)
+    for entry in list_entries(manifest):
+        entry_bytes = get_entry_disk_bytes(entry, references)
+        queues.setdefault(entry.site, deque()).append((entry, entry_bytes))
+        usage[entry.site] = usage.get(entry.site, 0) + entry_bytes
+
+    total_bytes = sum(usage.values())
+    while total_bytes > max_bytes and usage:
+        site = max(usage, key=usage.get)
+        entry, entry_bytes = queues[site].popleft()
+        reclaimed = remove_cache_entry(manifest, entry)
+        if reclaimed is not None:
+            report.evicted += 1
+            report.bytes_reclaimed += reclaimed
+
+        usage[site] -= entry_bytes
+        total_bytes -= entry_bytes
+        if not queues[site]:
+            del usage[site]
+
+def sweep_orphan_objects(manifest: sqlite3.Connection, report: GCReport) -> None:
+    """Remove compressed objects no manifest entry points at any more."""
+    objects_dir = functions_scraper.CACHE_DIR / functions_scraper.CACHE_OBJECTS_DIRNAME
+    references = count_all_content_references(manifest)
+    for object_path in objects_dir.rglob('*.html.gz'):
+        content_hash = object_path.name[:-len('.html.gz')]
+        # Objects written since the count are protected by the grace period
+        if content_hash not in references:
+            reclaimed = remove_object(object_path)
+            if reclaimed:
+                report.orphans += 1
+                report.bytes_reclaimed += reclaimed
+
+def collect_garbage(
+    max_age: timedelta = DEFAULT_CACHE_MAX_AGE,
+    max_bytes: Optional[int] = None,
+    grace_period: timedelta = REVALIDATION_GRACE_PERIOD
+) -> GCReport:
+    """
+    Run one garbage collection pass over the cache.
+
+    Only pages indexed in the manifest are considered; run a manifest
+    rebuild first to pick up files written by older versions.
+
+    Args:
+        max_age: Entries fetched longer ago than this are stale
+        max_bytes: Optional cap on total cache size in bytes
+        grace_period: Stale entries are kept this long for revalidation
+
+    Returns:
+        GCReport with counts and bytes reclaimed
+    """
+    manifest = get_manifest(functions_scraper.CACHE_DIR)
+    report = GCReport()
+    sweep_expired_entries(manifest, max_age, report, grace_period)
+    if max_bytes is not None:
+        enforce_size_cap(manifest, max_bytes, report)
+    sweep_orphan_objects(manifest, report)
+    return report
+
+def start_background_gc(
+    interval: float,
+    max_age: timedelta = DEFAULT_CACHE_MAX_AGE,
+    max_bytes: Optional[int] = None,
+    grace_period: timedelta = REVALIDATION_GRACE_PERIOD
+) -> threading.Event:
+    """
+    Run garbage collection periodically in a daemon thread.
+
+    Args:
+        interval: Seconds between passes
+        max_age: Entries fetched longer ago than this are stale
+        max_bytes: Optional cap on total cache size in bytes
+        grace_period: Stale entries are kept this long for revalidation
+
+    Returns:
+        Event that stops the background thread when set
+    """
+    stop_event = threading.Event()
+
+    def gc_loop() -> None:
+        while not stop_event.wait(interval):
+            try:
+                print(f"Cache GC: {format_gc_report(collect_garbage(max_age, max_bytes, grace_period))}")
+            except Exception as e:
+                print(f"Cache GC failed: {str(e)}")
+
+    threading.Thread(target=gc_loop, name='cache-gc', daemon=True).start()
+    return stop_event
\ No newline at end of file
@@ -0,0 +1,349 @@
+"""
+Utility functions for fetching pages over plain HTTP.
+Module provides pooled session setup, page retrieval with conditional
+revalidation, JS-gate detection, plus a small persistent store of which
+fetch mode works for each site.
+"""
+from typing import Callable, Dict, List, Mapping, Optional
+import asyncio
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlparse
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from .functions_ratelimit import AdaptiveRateLimiter
+
+# Constants
+DEFAULT_HTTP_TIMEOUT: float = 15.0
+DEFAULT_POOL_SIZE: int = 10
+DEFAULT_PER_HOST_LIMIT: int = 4
+DEFAULT_TOTAL_LIMIT: int = 32
+MIN_VISIBLE_TEXT_LENGTH: int = 200
+FETCH_MODE_HTTP = 'http'
+FETCH_MODE_BROWSER = 'selenium'
+FETCH_MODE_BROWSER_SAMPLES: int = 3  # Failed HTTP samples in a row before a site switches to the browser
+FETCH_MODE_MAX_AGE: float = 7 * 86400.0  # Seconds before a remembered mode is probed again
+JS_GATE_MARKERS = [
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    "requires javascript",
+    "turn on javascript",
+    "checking your browser",
+]
+DEFAULT_HEADERS: Dict[str, str] = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_INVISIBLE_BLOCKS = re.compile(r"<(script|style|noscript|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAGS = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
+
+_fetch_modes_lock = threading.Lock()
+
+@dataclass
+class FetchResult:
+    """Response to a page fetch, with the validators needed to revalidate it later."""
+    content: str = ""
+    status: int = 0
+    etag: str = ""
+    last_modified: str = ""
+
+    @property
+    def not_modified(self) -> bool:
+        """True if the server confirmed the cached copy is still current."""
+        return self.status == 304
+
+@dataclass
+class DownloadStats:
+    """Outcome and timing of an asynchronous download batch."""
+    fetched: int = 0
+    not_modified: int = 0
+    failed_urls: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def jobs_per_second(self) -> float:
+        """Pages successfully fetched per second of wall-clock time."""
+        return self.fetched / self.elapsed if self.elapsed > 0 else 0.0
+
+def create_http_session(
+    user_agent: Optional[str] = None,
+    pool_size: int = DEFAULT_POOL_SIZE
+) -> requests.Session:
+    """
+    Create a keep-alive HTTP session with a pooled connection adapter.
+
+    Args:
+        user_agent: User agent string to send (ideally the browser's own)
+        pool_size: Number of connections to keep open per host
+
+    Returns:
+        Configured requests Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
+
+def build_conditional_headers(etag: str = "", last_modified: str = "") -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+def get_validators(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Extract the ETag and Last-Modified validators from response headers."""
+    return {
+        "etag": headers.get("ETag", ""),
+        "last_modified": headers.get("Last-Modified", ""),
+    }
+
+def is_html_response(headers: Mapping[str, str]) -> bool:
+    """Check whether a response declares an HTML body (or no type at all)."""
+    return "html" in headers.get("Content-Type", "html").lower()
+
+def fetch_page(
+    session: requests.Session,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = DEFAULT_HTTP_TIMEOUT
+) -> FetchResult:
+    """
+    Fetch a page over HTTP, optionally as a conditional request.
+
+    Args:
+        session: HTTP session
+        url: Page URL
+        headers: Extra request headers, e.g. from build_conditional_headers
+        timeout: Request timeout in seconds
+
+    Returns:
+        FetchResult; content is empty unless the response was a 200 HTML page
+    """
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return FetchResult(status=304, **get_validators(response.headers))
+        if response.status_code != 200 or not is_html_response(response.headers):
+            return FetchResult(status=response.status_code)
+        return FetchResult(response.text or "", 200, **get_validators(response.headers))
+    except Exception as e:
+        print(f"Error fetching {url} over HTTP: {str(e)}")
+        return FetchResult()
+
+def fetch_html(
+    session: requests.Session,
+    url: str,
+    timeout: float = DEFAULT_HTTP_TIMEOUT
+) -> str:
+    """Fetch HTML content of a URL over HTTP, returning an empty string on failure."""
+    return fetch_page(session, url, timeout=timeout).content
+
+async def fetch_page_async(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = DEFAULT_HTTP_TIMEOUT
+) -> FetchResult:
+    """Asynchronously fetch a page, optionally as a conditional request."""
+    try:
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status == 304:
+                return FetchResult(status=304, **get_validators(response.headers))
+            if response.status != 200 or not is_html_response(response.headers):
+                return FetchResult(status=response.status)
+            content = await response.text(errors="replace")
+            return FetchResult(content, 200, **get_validators(response.headers))
+    except Exception as e:
+        print(f"Error fetching {url} over HTTP: {str(e)}")
+        return FetchResult()
+
+async def fetch_html_async(
+    session: aiohttp.ClientSession,
+    url: str,
+    timeout: float = DEFAULT_HTTP_TIMEOUT
+) -> str:
+    """Asynchronously fetch HTML content of a URL, returning an empty string on failure."""
+    return (await fetch_page_async(session, url, timeout=timeout)).content
+
+async def fetch_all_async(
+    urls: List[str],
+    on_page: Callable[[str, FetchResult], bool],
+    user_agent: Optional[str] = None,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    total_limit: int = DEFAULT_TOTAL_LIMIT,
+    delay: float = 0,
+    request_headers: Optional[Dict[str, Dict[str, str]]] = None,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+) -> DownloadStats:
+    """
+    Fetch many URLs concurrently with a per-host concurrency limit.
+
+    Args:
+        urls: URLs to fetch
+        on_page: Callback receiving (url, result) for pages and 304 responses;
+            returns True if the response was accepted
+        user_agent: User agent string to send
+        per_host_limit: Maximum requests in flight to any single host
+        total_limit: Maximum requests in flight overall
+        delay: Seconds each request slot stays reserved after a fetch, for politeness
+        request_headers: Optional per-URL extra headers, e.g. conditional validators
+        rate_limiter: Per-host pacing; each request waits for its host's next
+            slot and reports its outcome back
+
+    Returns:
+        DownloadStats with counts, rejected URLs and elapsed time
+    """
+    stats = DownloadStats()
+    semaphores: Dict[str, asyncio.Semaphore] = {}
+    headers = dict(DEFAULT_HEADERS)
+    if user_agent:
+        headers["User-Agent"] = user_agent
+
+    connector = aiohttp.TCPConnector(limit=total_limit, limit_per_host=per_host_limit)
+    start_time = time.time()
+
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        async def fetch_one(url: str) -> None:
+            host = urlparse(url).netloc
+            semaphore = semaphores.setdefault(host, asyncio.Semaphore(per_host_limit))
+            async with semaphore:
+                if rate_limiter is not None:
+                    await asyncio.sleep(rate_limiter.reserve(host))
+                started = time.monotonic()
+                result = await fetch_page_async(session, url, (request_headers or {}).get(url))
+                accepted = bool(result.content or result.not_modified) and on_page(url, result)
+                if rate_limiter is not None:
+                    rate_limiter.record(host, time.monotonic() - started, accepted, result.status)
+                if accepted:
+                    stats.fetched += 1
+                    stats.not_modified += int(result.not_modified)
+                else:
+                    stats.failed_urls.append(url)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+        await asyncio.gather(*(fetch_one(url) for url in urls))
+
+    stats.elapsed = time.time() - start_time
+    return stats
+
+def download_all_async(
+    urls: List[str],
+    on_page: Callable[[str, FetchResult], bool],
+    user_agent: Optional[str] = None,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    delay: float = 0,
+    request_headers: Optional[Dict[str, Dict[str, str]]] = None,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+) -> DownloadStats:
+    """Run fetch_all_async to completion from synchronous code."""
+    return asyncio.run(fetch_all_async(
+        urls,
+        on_page,
+        user_agent=user_agent,
+        per_host_limit=per_host_limit,
+        delay=delay,
+        request_headers=request_headers,
+        rate_limiter=rate_limiter
+    ))
+
+def get_visible_text(html: str) -> str:
+    """Strip scripts, styles and tags from HTML, leaving collapsed visible text."""
+    text = _INVISIBLE_BLOCKS.sub(" ", html)
+    text = _TAGS.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+def looks_js_gated(html: str, min_text_length: int = MIN_VISIBLE_TEXT_LENGTH) -> bool:
+    """
+    Guess whether a page needs JavaScript to render its content.
+
+    Args:
+        html: Raw HTML returned by a plain HTTP request
+        min_text_length: Minimum visible text expected from a rendered page
+
+    Returns:
+        True if the page looks like an empty app shell or a JS challenge
+    """
+    visible_text = get_visible_text(html)
+    if len(visible_text) < min_text_length:
+        return True
+
+    lowered = visible_text.lower()
+    return any(marker in lowered for marker in JS_GATE_MARKERS)
+
+def load_fetch_modes(path: Path) -> Dict[str, Dict]:
+    """
+    Load the per-site fetch mode map, returning an empty map if unavailable.
+
+    Each site maps to its settled mode (or None while still sampling), the
+    time the mode was recorded and the number of failed HTTP samples in a
+    row. Bare mode strings from older files count as long expired.
+    """
+    try:
+        modes = json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error reading fetch modes {path}: {e}")
+        return {}
+    return {
+        site: state if isinstance(state, dict) else {'mode': state, 'recorded_at': 0, 'http_failures': 0}
+        for site, state in modes.items()
+    }
+
+def get_fetch_mode(path: Path, site: str, max_age: float = FETCH_MODE_MAX_AGE) -> Optional[str]:
+    """Get the remembered fetch mode for a site, or None if unknown or due for a new probe."""
+    state = load_fetch_modes(path).get(site)
+    if state is None or time.time() - state.get('recorded_at', 0) > max_age:
+        return None
+    return state.get('mode')
+
+def record_fetch_mode(path: Path, site: str, mode: str, samples: int = 1) -> Optional[str]:
+    """
+    Record which fetch mode served a sample of a site's pages.
+
+    One usable HTTP response settles the site on HTTP. The browser is only
+    remembered after FETCH_MODE_BROWSER_SAMPLES failed HTTP samples in a
+    row, so a single slow or gated page does not switch a site for good.
+
+    Args:
+        path: Fetch mode file
+        site: Site name
+        mode: Mode that produced the pages
+        samples: Number of pages the mode was sampled on
+
+    Returns:
+        The site's settled mode, or None while it is still being sampled
+    """
+    with _fetch_modes_lock:
+        modes = load_fetch_modes(path)
+        state = modes.get(site, {'mode': None, 'http_failures': 0})
+        if mode == FETCH_MODE_BROWSER:
+            failures = state.get('http_failures', 0) + samples
+            settled = FETCH_MODE_BROWSER if failures >= FETCH_MODE_BROWSER_SAMPLES else None
+        else:
+            failures = 0
+            settled = mode
+        modes[site] = {'mode': settled, 'recorded_at': time.time(), 'http_failures': failures}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        temp_path.write_text(json.dumps(modes, indent=2, sort_keys=True), encoding='utf-8')
+        temp_path.replace(path)
+        return settled
\ No newline at end of file
@@ -0,0 +1,370 @@
+"""
+Functions for the SQLite cache manifest.
+The manifest indexes cached pages by URL hash, storing site, URL, fetch time,
+size, content hash and HTTP validators so freshness checks never have to
+touch the HTML files.
+"""
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+# Constants
+MANIFEST_FILENAME = 'manifest.sqlite3'
+CACHE_FILE_PATTERN = '*.html'
+MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    url_hash TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    compressed INTEGER NOT NULL DEFAULT 0,
+    etag TEXT NOT NULL DEFAULT '',
+    last_modified TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_site ON cache_entries (site, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_content ON cache_entries (content_hash);
+CREATE TABLE IF NOT EXISTS listing_fingerprints (
+    listing_url TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+);
+"""
+# Columns added after the first manifest release, applied to older databases
+MANIFEST_COLUMNS: Dict[str, str] = {
+    'compressed': 'INTEGER NOT NULL DEFAULT 0',
+    'etag': "TEXT NOT NULL DEFAULT ''",
+    'last_modified': "TEXT NOT NULL DEFAULT ''",
+}
+
+SQLITE_MAX_VARIABLES = 900  # Stay under SQLite's default bound parameter limit
+
+ENTRY_COLUMNS = "url_hash, site, url, fetched_at, size, content_hash, compressed, etag, last_modified"
+
+_connections: Dict[Path, sqlite3.Connection] = {}
+_lock = threading.RLock()
+
+@dataclass
+class ManifestEntry:
+    """A single cached page as recorded in the manifest."""
+    url_hash: str
+    site: str
+    url: str
+    fetched_at: float
+    size: int
+    content_hash: str
+    compressed: bool = False
+    etag: str = ''
+    last_modified: str = ''
+
+def connect_database(path: Path, schema: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database shared between threads and processes.
+
+    Args:
+        path: Database file path
+        schema: SQL script creating the tables the caller needs
+
+    Returns:
+        Open connection in autocommit mode with WAL journaling
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(schema)
+    return connection
+
+def ensure_columns(connection: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+    """Add any missing columns to a table created by an older schema."""
+    existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+    for name, declaration in columns.items():
+        if name not in existing:
+            connection.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+
+def get_manifest(cache_dir: Path) -> sqlite3.Connection:
+    """Get the manifest connection for a cache directory, opening it on first use."""
+    path = (cache_dir / MANIFEST_FILENAME).resolve()
+    with _lock:
+        if path not in _connections:
+            connection = connect_database(path, MANIFEST_SCHEMA)
+            ensure_columns(connection, 'cache_entries', MANIFEST_COLUMNS)
+            _connections[path] = connection
+        return _connections[path]
+
+def close_manifests() -> None:
+    """Close every open manifest connection."""
+    with _lock:
+        for connection in _connections.values():
+            connection.close()
+        _connections.clear()
+
+@contextmanager
+def manifest_transaction(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run a block of manifest statements as one write transaction."""
+    with _lock:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+def hash_content(content: str) -> str:
+    """Generate SHA256 hash of page content."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def parse_cache_filename(filename: str) -> Tuple[str, str]:
+    """
+    Split a cache filename into its site name and URL hash.
+
+    Args:
+        filename: Cache filename in the form '{site}_{url_hash}.html'
+
+    Returns:
+        Tuple of (site, url_hash); site is empty if the name has no prefix
+    """
+    stem = Path(filename).stem
+    site, _, url_hash = stem.rpartition('_')
+    return site, url_hash
+
+def record_entry(connection: sqlite3.Connection, entry: ManifestEntry) -> None:
+    """Insert or replace a manifest entry."""
+    with _lock:
+        connection.execute(
+            "INSERT OR REPLACE INTO cache_entries "
+            f"({ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry.url_hash,
+                entry.site,
+                entry.url,
+                entry.fetched_at,
+                entry.size,
+                entry.content_hash,
+                int(entry.compressed),
+                entry.etag,
+                entry.last_modified
+            )
+        )
+
+def row_to_entry(row: Tuple) -> ManifestEntry:
+    """Convert a cache_entries row selected with ENTRY_COLUMNS to a ManifestEntry."""
+    url_hash, site, url, fetched_at, size, content_hash, compressed, etag, last_modified = row
+    return ManifestEntry(url_hash, site, url, fetched_at, size, content_hash, bool(compressed), etag, last_modified)
+
+def get_entry(connection: sqlite3.Connection, url_hash: str) -> Optional[ManifestEntry]:
+    """Look up a manifest entry by URL hash."""
+    with _lock:
+        row = connection.execute(
+            f"SELECT {ENTRY_COLUMNS} FROM cache_entries WHERE url_hash = ?",
+            (url_hash,)
+        ).fetchone()
+    return row_to_entry(row) if row else None
+
+def touch_entry(
+    connection: sqlite3.Connection,
+    url_hash: str,
+    fetched_at: float,
+    etag: str,
+    last_modified: str
+) -> None:
+    """Mark an unchanged entry as freshly fetched and store its latest validators."""
+    with _lock:
+        connection.execute(
+            "UPDATE cache_entries SET fetched_at = ?, etag = ?, last_modified = ? WHERE url_hash = ?",
+            (fetched_at, etag, last_modified, url_hash)
+        )
+
+def delete_entry(connection: sqlite3.Connection, url_hash: str) -> None:
+    """Remove a manifest entry."""
+    with _lock:
+        connection.execute("DELETE FROM cache_entries WHERE url_hash = ?", (url_hash,))
+
+def delete_entry_if_unchanged(connection: sqlite3.Connection, entry: ManifestEntry) -> bool:
+    """
+    Remove a manifest entry only if it has not been refreshed since it was read.
+
+    Returns:
+        True if the entry was removed, False if a newer fetch replaced it
+    """
+    with _lock:
+        cursor = connection.execute(
+            "DELETE FROM cache_entries WHERE url_hash = ? AND fetched_at = ?",
+            (entry.url_hash, entry.fetched_at)
+        )
+    return cursor.rowcount > 0
+
+def list_entries(
+    connection: sqlite3.Connection,
+    fetched_before: Optional[float] = None
+) -> List[ManifestEntry]:
+    """
+    List manifest entries, oldest first.
+
+    Args:
+        connection: Manifest connection
+        fetched_before: Only return entries fetched before this timestamp
+
+    Returns:
+        List of ManifestEntry ordered by fetch time
+    """
+    query = f"SELECT {ENTRY_COLUMNS} FROM cache_entries"
+    params: Tuple = ()
+    if fetched_before is not None:
+        query += " WHERE fetched_at < ?"
+        params = (fetched_before,)
+    with _lock:
+        rows = connection.execute(query + " ORDER BY fetched_at", params).fetchall()
+    return [row_to_entry(row) for row in rows]
+
+def find_known_hashes(connection: sqlite3.Connection, url_hashes: List[str]) -> Set[str]:
+    """Return the subset of URL hashes that have a manifest entry."""
+    known: Set[str] = set()
+    with _lock:
+        for start in range(0, len(url_hashes), SQLITE_MAX_VARIABLES):
+            chunk = url_hashes[start:start + SQLITE_MAX_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            known.update(row[0] for row in connection.execute(
+                f"SELECT url_hash FROM cache_entries WHERE url_hash IN ({placeholders})",
+                chunk
+            ))
+    return known
+
+def get_listing_fingerprint(connection: sqlite3.Connection, listing_url: str) -> Optional[str]:
+    """Get the first-page job fingerprint recorded for a listing on its last run."""
+    with _lock:
+        row = connection.execute(
+            "SELECT fingerprint FROM listing_fingerprints WHERE listing_url = ?",
+            (listing_url,)
+        ).fetchone()
+    return row[0] if row else None
+
+def record_listing_fingerprint(
+    connection: sqlite3.Connection,
+    listing_url: str,
+    fingerprint: str,
+    recorded_at: float
+) -> None:
+    """Store the first-page job fingerprint of a listing."""
+    with _lock:
+        connection.execute(
+            "INSERT OR REPLACE INTO listing_fingerprints (listing_url, fingerprint, recorded_at) VALUES (?, ?, ?)",
+            (listing_url, fingerprint, recorded_at)
+        )
+
+def count_content_references(connection: sqlite3.Connection, content_hash: str) -> int:
+    """Count compressed entries pointing at a stored object."""
+    with _lock:
+        return connection.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE compressed = 1 AND content_hash = ?",
+            (content_hash,)
+        ).fetchone()[0]
+
+def count_all_content_references(connection: sqlite3.Connection) -> Dict[str, int]:
+    """Count the compressed entries pointing at each stored object, in one query."""
+    with _lock:
+        return dict(connection.execute(
+            "SELECT content_hash, COUNT(*) FROM cache_entries WHERE compressed = 1 GROUP BY content_hash"
+        ))
+
+def count_entries(connection: sqlite3.Connection) -> int:
+    """Count entries in the manifest."""
+    with _lock:
+        return connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+def summarize_manifest(connection: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Summarize manifest contents for reporting.
+
+    Returns:
+        Dictionary with entry counts, logical size and distinct stored objects
+    """
+    with _lock:
+        entries, logical_bytes, compressed, objects = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(compressed), 0), "
+            "COUNT(DISTINCT CASE WHEN compressed = 1 THEN content_hash END) FROM cache_entries"
+        ).fetchone()
+    return {
+        'entries': entries,
+        'logical_bytes': logical_bytes,
+        'compressed_entries': compressed,
+        'objects': objects
+    }
+
+def read_cache_file_entry(cache_file: Path) -> Optional[ManifestEntry]:
+    """
+    Build a manifest entry by reading a cache file from disk.
+
+    Args:
+        cache_file: Path to a cached page
+
+    Returns:
+        ManifestEntry, or None if the file cannot be read
+    """
+    try:
+        text = cache_file.read_text(encoding='utf-8')
+        fetched_at = cache_file.stat().st_mtime
+    except Exception as e:
+        print(f"Error reading file {cache_file}: {e}")
+        return None
+
+    first_line, _, body = text.partition('\n')
+    url = ''
+    if first_line.startswith('<!--') and first_line.endswith('-->'):
+        url = first_line[4:-3].strip()
+    else:
+        body = text
+
+    site, url_hash = parse_cache_filename(cache_file.name)
+    return ManifestEntry(
+        url_hash=url_hash,
+        site=site,
+        url=url,
+        fetched_at=fetched_at,
+        size=len(text),
+        content_hash=hash_content(body)
+    )
+
+def scan_cache_files(cache_dir: Path) -> List[Path]:
+    """List the cached page files in a cache directory and its shards."""
+    return sorted(cache_dir.rglob(CACHE_FILE_PATTERN))
+
+def rebuild_manifest(cache_dir: Path) -> int:
+    """
+    Rebuild the manifest from scratch by rescanning the cache directory.
+
+    Compressed entries are kept, since the manifest is the only record of
+    which URLs point at each shared object; plain files are re-indexed,
+    keeping their stored validators if the content has not changed.
+
+    Args:
+        cache_dir: Cache directory to scan
+
+    Returns:
+        Number of entries indexed
+    """
+    entries = [
+        entry for entry in map(read_cache_file_entry, scan_cache_files(cache_dir))
+        if entry is not None
+    ]
+    connection = get_manifest(cache_dir)
+    with manifest_transaction(connection):
+        validators = {
+            url_hash: (content_hash, etag, last_modified)
+            for url_hash, content_hash, etag, last_modified in connection.execute(
+                "SELECT url_hash, content_hash, etag, last_modified FROM cache_entries WHERE compressed = 0"
+            )
+        }
+        connection.execute("DELETE FROM cache_entries WHERE compressed = 0")
+        for entry in entries:
+            content_hash, etag, last_modified = validators.get(entry.url_hash, ('', '', ''))
+            if content_hash == entry.content_hash:
+                entry.etag, entry.last_modified = etag, last_modified
+            record_entry(connection, entry)
+    return len(entries)
\ No newline at end of file
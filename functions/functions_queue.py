@@ -0,0 +1,484 @@
+"""
+Functions for the shared scrape task queue.
+Sites, listing pages and job pages become tasks that any number of worker
+processes can lease, complete or fail back for a retry. The SQLite backend
+serves every process on one machine; the remote backend forwards the same
+operations over a pluggable transport, such as HTTP to a queue server, so
+workers on other machines can share it. The queue server only answers
+requests carrying its shared token. Leasing enforces a per-host delay for
+the whole queue, so politeness holds however many workers there are.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+from .functions_manifest import connect_database
+
+# Constants
+TASK_SITE = 'site'
+TASK_LISTING_PAGE = 'listing_page'
+TASK_DETAIL_PAGE = 'detail_page'
+# Lower runs first: keep pagination moving, then download, then start new sites
+TASK_PRIORITIES: Dict[str, int] = {TASK_LISTING_PAGE: 0, TASK_DETAIL_PAGE: 1, TASK_SITE: 2}
+DEFAULT_LEASE_SECONDS: float = 300.0  # Tasks of a worker that disappears become available again after this
+DEFAULT_POLITENESS_DELAY: float = 2.0  # Minimum seconds between leases of tasks for one host
+DEFAULT_MAX_ATTEMPTS: int = 3
+DEFAULT_RETRY_DELAY: float = 60.0  # Doubles with each failed attempt
+QUEUE_REQUEST_TIMEOUT: float = 30.0
+QUEUE_TOKEN_ENV = 'QUEUE_TOKEN'  # Environment variable holding the queue server's shared token
+QUEUE_TOKEN_HEADER = 'X-Queue-Token'
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    host TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_until REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (state, priority, available_at);
+CREATE TABLE IF NOT EXISTS host_slots (
+    host TEXT PRIMARY KEY,
+    next_allowed REAL NOT NULL
+);
+"""
+TASK_COLUMNS = "task_id, task_key, kind, host, payload, attempts"
+
+@dataclass
+class Task:
+    """A unit of scrape work."""
+    task_key: str
+    kind: str
+    host: str = ''
+    payload: Dict[str, Any] = field(default_factory=dict)
+    task_id: Optional[int] = None
+    attempts: int = 0
+
+class QueueBackend(ABC):
+    """Operations every task queue backend provides."""
+
+    @abstractmethod
+    def put(self, tasks: List[Task]) -> int:
+        """Add tasks, ignoring any whose key was queued before. Returns the number added."""
+
+    @abstractmethod
+    def lease(
+        self,
+        worker_id: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        politeness_delay: float = DEFAULT_POLITENESS_DELAY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> Optional[Task]:
+        """
+        Lease the next runnable task whose host may be contacted now, if any.
+
+        An expired lease that has already used max_attempts is marked failed
+        instead of being handed out again.
+        """
+
+    @abstractmethod
+    def complete(self, task_id: int, worker_id: str) -> bool:
+        """Mark a leased task done. Returns False if the lease was lost."""
+
+    @abstractmethod
+    def fail(
+        self,
+        task_id: int,
+        worker_id: str,
+        error: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY
+    ) -> bool:
+        """Return a leased task for a later retry, or give up after max_attempts. Returns False if the lease was lost."""
+
+    @abstractmethod
+    def count_open(self) -> int:
+        """Number of tasks still pending or leased."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Number of tasks in each state."""
+
+    @abstractmethod
+    def next_lease_time(self) -> Optional[float]:
+        """Earliest time an open task could be leased, or None if no task is open."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Remove every task and host slot."""
+
+def row_to_task(row: Tuple[Any, ...]) -> Task:
+    """Build a task from a tasks row selected with TASK_COLUMNS."""
+    task_id, task_key, kind, host, payload, attempts = row
+    return Task(task_key, kind, host, json.loads(payload), task_id, attempts)
+
+class SQLiteQueueBackend(QueueBackend):
+    """Task queue in a SQLite database, shared by the processes of one machine."""
+
+    def __init__(self, path: Path):
+        """
+        Open the queue database, creating it if needed.
+
+        Args:
+            path: Queue database file
+        """
+        self.connection = connect_database(path, QUEUE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _write(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run statements as one write transaction."""
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = operation(self.connection)
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+            return result
+
+    def put(self, tasks: List[Task]) -> int:
+        now = time.time()
+        rows = [
+            (task.task_key, task.kind, task.host, json.dumps(task.payload), TASK_PRIORITIES.get(task.kind, 0), now)
+            for task in tasks
+        ]
+
+        def insert(connection: sqlite3.Connection) -> int:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO tasks (task_key, kind, host, payload, priority, available_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return connection.total_changes - before
+        return self._write(insert)
+
+    def lease(
+        self,
+        worker_id: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        politeness_delay: float = DEFAULT_POLITENESS_DELAY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> Optional[Task]:
+        now = time.time()
+
+        def take(connection: sqlite3.Connection) -> Optional[Task]:
+            # A task whose worker keeps dying mid-task must not be retried forever
+            connection.execute(
+                "UPDATE tasks SET state = 'failed', lease_owner = NULL, lease_until = NULL, last_error = ? "
+                "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+                ("Lease expired", now, max_attempts)
+            )
+            row = connection.execute(
+                f"SELECT {', '.join('t.' + column for column in TASK_COLUMNS.split(', '))} FROM tasks t "
+                "LEFT JOIN host_slots h ON h.host = t.host "
+                "WHERE ((t.state = 'pending' AND t.available_at <= ?) OR (t.state = 'leased' AND t.lease_until < ?)) "
+                "AND COALESCE(h.next_allowed, 0) <= ? "
+                "ORDER BY t.priority, t.available_at, t.task_id LIMIT 1",
+                (now, now, now)
+            ).fetchone()
+            if row is None:
+                return None
+            task = row_to_task(row)
+            task.attempts += 1
+            connection.execute(
+                "UPDATE tasks SET state = 'leased', lease_owner = ?, lease_until = ?, attempts = ? WHERE task_id = ?",
+                (worker_id, now + lease_seconds, task.attempts, task.task_id)
+            )
+            # Tasks without a host, such as seeding a site, never contact one
+            if task.host:
+                connection.execute(
+                    "INSERT OR REPLACE INTO host_slots (host, next_allowed) VALUES (?, ?)",
+                    (task.host, now + politeness_delay)
+                )
+            return task
+        return self._write(take)
+
+    def complete(self, task_id: int, worker_id: str) -> bool:
+        def finish(connection: sqlite3.Connection) -> bool:
+            return connection.execute(
+                "UPDATE tasks SET state = 'done', lease_owner = NULL, lease_until = NULL "
+                "WHERE task_id = ? AND state = 'leased' AND lease_owner = ?",
+                (task_id, worker_id)
+            ).rowcount > 0
+        return self._write(finish)
+
+    def fail(
+        self,
+        task_id: int,
+        worker_id: str,
+        error: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY
+    ) -> bool:
+        now = time.time()
+
+        def release(connection: sqlite3.Connection) -> bool:
+            row = connection.execute(
+                "SELECT attempts FROM tasks WHERE task_id = ? AND state = 'leased' AND lease_owner = ?",
+                (task_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return False
+            attempts = row[0]
+            state = 'failed' if attempts >= max_attempts else 'pending'
+            connection.execute(
+                "UPDATE tasks SET state = ?, available_at = ?, lease_owner = NULL, lease_until = NULL, last_error = ? "
+                "WHERE task_id = ?",
+                (state, now + retry_delay * 2 ** (attempts - 1), error, task_id)
+            )
+            return True
+        return self._write(release)
+
+    def count_open(self) -> int:
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM tasks WHERE state IN ('pending', 'leased')"
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.connection.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+
+    def next_lease_time(self) -> Optional[float]:
+        with self._lock:
+            return self.connection.execute(
+                "SELECT MIN(MAX(COALESCE(h.next_allowed, 0), "
+                "CASE t.state WHEN 'pending' THEN t.available_at ELSE t.lease_until END)) "
+                "FROM tasks t LEFT JOIN host_slots h ON h.host = t.host "
+                "WHERE t.state IN ('pending', 'leased')"
+            ).fetchone()[0]
+
+    def reset(self) -> None:
+        def delete(connection: sqlite3.Connection) -> None:
+            connection.execute("DELETE FROM tasks")
+            connection.execute("DELETE FROM host_slots")
+        self._write(delete)
+
+    def close(self) -> None:
+        """Close the queue database."""
+        self.connection.close()
+
+Transport = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+class RemoteQueueBackend(QueueBackend):
+    """Task queue held by another process, reached through a request/response transport."""
+
+    def __init__(self, transport: Transport):
+        """
+        Create a remote queue client.
+
+        Args:
+            transport: Callable sending a JSON-serializable request and
+                returning the decoded response, e.g. create_http_transport()
+        """
+        self.transport = transport
+
+    def _request(self, op: str, **arguments: Any) -> Any:
+        response = self.transport({'op': op, **arguments})
+        if 'error' in response:
+            raise RuntimeError(f"Queue server error on {op}: {response['error']}")
+        return response.get('result')
+
+    def put(self, tasks: List[Task]) -> int:
+        return self._request('put', tasks=[asdict(task) for task in tasks])
+
+    def lease(
+        self,
+        worker_id: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        politeness_delay: float = DEFAULT_POLITENESS_DELAY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> Optional[Task]:
+        task = self._request(
+            'lease',
+            worker_id=worker_id,
+            lease_seconds=lease_seconds,
+            politeness_delay=politeness_delay,
+            max_attempts=max_attempts
+        )
+        return Task(**task) if task else None
+
+    def complete(self, task_id: int, worker_id: str) -> bool:
+        return self._request('complete', task_id=task_id, worker_id=worker_id)
+
+    def fail(
+        self,
+        task_id: int,
+        worker_id: str,
+        error: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY
+    ) -> bool:
+        return self._request(
+            'fail',
+            task_id=task_id,
+            worker_id=worker_id,
+            error=error,
+            max_attempts=max_attempts,
+            retry_delay=retry_delay
+        )
+
+    def count_open(self) -> int:
+        return self._request('count_open')
+
+    def stats(self) -> Dict[str, int]:
+        return self._request('stats')
+
+    def next_lease_time(self) -> Optional[float]:
+        return self._request('next_lease_time')
+
+    def reset(self) -> None:
+        self._request('reset')
+
+def handle_queue_request(backend: QueueBackend, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a remote queue request against a local backend.
+
+    Args:
+        backend: Backend holding the queue
+        request: Decoded request with an 'op' name and its arguments
+
+    Returns:
+        Response with a 'result', or an 'error' message
+    """
+    arguments = dict(request)
+    op = arguments.pop('op', None)
+    try:
+        if op == 'put':
+            return {'result': backend.put([Task(**task) for task in arguments['tasks']])}
+        if op == 'lease':
+            task = backend.lease(**arguments)
+            return {'result': asdict(task) if task else None}
+        if op in ('complete', 'fail', 'count_open', 'stats', 'next_lease_time', 'reset'):
+            return {'result': getattr(backend, op)(**arguments)}
+        return {'error': f"Unknown operation {op!r}"}
+    except Exception as e:
+        return {'error': str(e)}
+
+def get_queue_token(token: Optional[str] = None) -> str:
+    """
+    Get the queue server's shared token from argument or environment.
+
+    Args:
+        token: Optional token provided directly
+
+    Returns:
+        Token to use
+
+    Raises:
+        ValueError: If no token is available
+    """
+    token = token or os.getenv(QUEUE_TOKEN_ENV)
+    if token:
+        return token
+
+    raise ValueError(
+        f"Queue token must be provided either as an argument or set in the environment variable '{QUEUE_TOKEN_ENV}'"
+    )
+
+def create_http_transport(
+    url: str,
+    token: Optional[str] = None,
+    session: Optional[requests.Session] = None
+) -> Transport:
+    """
+    Create a transport posting queue requests to a queue server as JSON.
+
+    Args:
+        url: Base URL of the server started with serve_queue
+        token: Shared token of the server, defaulting to the QUEUE_TOKEN
+            environment variable
+        session: HTTP session to reuse
+
+    Returns:
+        Transport for RemoteQueueBackend
+
+    Raises:
+        ValueError: If no token is available
+    """
+    headers = {QUEUE_TOKEN_HEADER: get_queue_token(token)}
+    session = session or requests.Session()
+
+    def send(request: Dict[str, Any]) -> Dict[str, Any]:
+        response = session.post(url, json=request, headers=headers, timeout=QUEUE_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+    return send
+
+def serve_queue(backend: QueueBackend, host: str, port: int, token: Optional[str] = None) -> ThreadingHTTPServer:
+    """
+    Create an HTTP server exposing a queue backend to remote workers.
+
+    Requests without the shared token in their X-Queue-Token header are
+    refused with 401 before they reach the queue.
+
+    Args:
+        backend: Backend holding the queue
+        host: Interface to listen on
+        port: Port to listen on
+        token: Shared token workers must send, defaulting to the QUEUE_TOKEN
+            environment variable
+
+    Returns:
+        Server; call serve_forever() to handle requests
+
+    Raises:
+        ValueError: If no token is available
+    """
+    expected_token = get_queue_token(token).encode()
+
+    class QueueRequestHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if not hmac.compare_digest(self.headers.get(QUEUE_TOKEN_HEADER, '').encode(), expected_token):
+                self.send_error(401, "Missing or wrong queue token")
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                body = json.dumps(handle_queue_request(backend, request)).encode()
+                self.send_response(200)
+            except ValueError as e:
+                body = json.dumps({'error': f"Bad request: {e}"}).encode()
+                self.send_response(400)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return ThreadingHTTPServer((host, port), QueueRequestHandler)
+
+def open_queue(target: str, token: Optional[str] = None) -> QueueBackend:
+    """
+    Open a task queue from a command line target.
+
+    Args:
+        target: Queue server URL (http:// or https://) or SQLite database path
+        token: Shared token of a queue server, defaulting to the QUEUE_TOKEN
+            environment variable
+
+    Returns:
+        Queue backend
+    """
+    if target.startswith(('http://', 'https://')):
+        return RemoteQueueBackend(create_http_transport(target, token))
+    return SQLiteQueueBackend(Path(target))
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Functions for adaptive per-host rate limiting.
+Replaces fixed sleeps with an AIMD controller: each healthy response adds a
+little to a host's request rate, while throttling, errors, empty pages or
+latency spikes cut it multiplicatively. Learned delays persist between runs.
+"""
+from typing import Dict, Optional
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+# Constants
+DEFAULT_MIN_DELAY: float = 0.5
+DEFAULT_MAX_DELAY: float = 30.0
+DEFAULT_INITIAL_DELAY: float = 2.0
+RATE_INCREASE: float = 0.05  # Requests per second added after each healthy response
+BACKOFF_FACTOR: float = 2.0  # Delay multiplier on throttling, errors or empty pages
+SLOWDOWN_FACTOR: float = 2.0  # Latency this many times the running average counts as a slowdown
+SLOWDOWN_BACKOFF: float = 1.5  # Delay multiplier on a slowdown
+LATENCY_SMOOTHING: float = 0.2  # Weight of the newest sample in the latency average
+THROTTLE_STATUSES = {429, 503}
+
+_host_rates_lock = threading.Lock()
+
+@dataclass
+class HostRate:
+    """Learned pacing state for one host."""
+    delay: float
+    latency: float = 0.0
+    next_allowed: float = 0.0
+
+def load_host_rates(path: Path) -> Dict[str, float]:
+    """Load the per-host delay map, returning an empty map if unavailable."""
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error reading host rates {path}: {e}")
+        return {}
+
+def save_host_rates(path: Path, delays: Dict[str, float]) -> None:
+    """Merge learned per-host delays into the host rate file."""
+    with _host_rates_lock:
+        rates = load_host_rates(path)
+        rates.update({host: round(delay, 3) for host, delay in delays.items()})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        temp_path.write_text(json.dumps(rates, indent=2, sort_keys=True), encoding='utf-8')
+        temp_path.replace(path)
+
+class AdaptiveRateLimiter:
+    """AIMD request pacing for each host, persisted to a JSON file."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        min_delay: float = DEFAULT_MIN_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        initial_delay: float = DEFAULT_INITIAL_DELAY
+    ):
+        """
+        Create a rate limiter, loading delays learned on earlier runs.
+
+        Args:
+            path: Host rate file, or None to keep rates in memory only
+            min_delay: Shortest delay between requests to one host (rate ceiling)
+            max_delay: Longest delay between requests to one host (rate floor)
+            initial_delay: Delay for hosts with no learned rate yet
+        """
+        self.path = path
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.initial_delay = initial_delay
+        self._saved_delays = load_host_rates(path) if path else {}
+        self._hosts: Dict[str, HostRate] = {}
+        self._lock = threading.Lock()
+
+    def clamp(self, delay: float) -> float:
+        """Keep a delay between the configured floor and ceiling."""
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def get_host_rate(self, host: str) -> HostRate:
+        """Get the pacing state of a host, starting from its saved delay."""
+        with self._lock:
+            if host not in self._hosts:
+                delay = self._saved_delays.get(host, self.initial_delay)
+                self._hosts[host] = HostRate(delay=self.clamp(delay))
+            return self._hosts[host]
+
+    def get_delay(self, host: str) -> float:
+        """Current delay between requests to a host."""
+        return self.get_host_rate(host).delay
+
+    def reserve(self, host: str) -> float:
+        """
+        Claim the next request slot for a host without blocking.
+
+        Returns:
+            Seconds until the claimed slot starts
+        """
+        state = self.get_host_rate(host)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, state.next_allowed)
+            state.next_allowed = start + state.delay
+        return start - now
+
+    def wait(self, host: str) -> float:
+        """
+        Block until the next request to a host is allowed.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def record(
+        self,
+        host: str,
+        latency: float,
+        success: bool,
+        status: Optional[int] = None
+    ) -> float:
+        """
+        Adjust a host's delay from the outcome of a request.
+
+        Args:
+            host: Host the request went to
+            latency: Seconds the request took
+            success: Whether the response was usable
+            status: HTTP status code, if known
+
+        Returns:
+            The host's new delay
+        """
+        state = self.get_host_rate(host)
+        with self._lock:
+            slowdown = state.latency > 0 and latency > SLOWDOWN_FACTOR * state.latency
+            if not success or status in THROTTLE_STATUSES:
+                state.delay *= BACKOFF_FACTOR
+            elif slowdown:
+                state.delay *= SLOWDOWN_BACKOFF
+            else:
+                state.delay = 1 / (1 / state.delay + RATE_INCREASE)
+            state.delay = self.clamp(state.delay)
+
+            if state.latency > 0:
+                state.latency += LATENCY_SMOOTHING * (latency - state.latency)
+            else:
+                state.latency = latency
+            return state.delay
+
+    def save(self) -> None:
+        """Persist the delays learned for the hosts used by this limiter."""
+        if self.path is None:
+            return
+        with self._lock:
+            delays = {host: state.delay for host, state in self._hosts.items()}
+        if delays:
+            save_host_rates(self.path, delays)
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Functions for scheduling recurring scrapes in daemon mode.
+Each listing's next crawl is planned from how fast it has been posting new
+jobs: busy boards come due often, quiet ones back off towards a weekly
+check. Schedule state persists between runs in a JSON file.
+"""
+from typing import Any, Dict, List, Optional
+import json
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+# Constants
+SCHEDULE_FILENAME = 'schedule.json'
+MIN_CRAWL_INTERVAL: float = 15 * 60.0  # Hot boards are never polled more often than this
+MAX_CRAWL_INTERVAL: float = 7 * 24 * 3600.0  # Dead boards are still checked weekly
+DEFAULT_CRAWL_INTERVAL: float = 24 * 3600.0  # Interval after the first crawl of a listing
+TARGET_NEW_JOBS: float = 5.0  # New jobs a crawl should expect to find
+RATE_SMOOTHING: float = 0.3  # Weight of the newest crawl in the posting rate average
+FAILED_CRAWL_RETRY: float = MIN_CRAWL_INTERVAL  # A failed crawl is retried after this
+
+@dataclass
+class SiteSchedule:
+    """Crawl history and next due time of one listing."""
+    last_crawl: float = 0.0
+    next_due: float = 0.0
+    new_jobs_per_hour: Optional[float] = None
+
+def load_schedule(path: Path) -> Dict[str, SiteSchedule]:
+    """Load the schedule file, returning an empty schedule if unavailable."""
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        return {url: SiteSchedule(**entry) for url, entry in data.items()}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error reading schedule {path}: {e}")
+        return {}
+
+def save_schedule(path: Path, schedule: Dict[str, SiteSchedule]) -> None:
+    """Write the schedule file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + '.tmp')
+    data = {url: asdict(entry) for url, entry in schedule.items()}
+    temp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding='utf-8')
+    temp_path.replace(path)
+
+def plan_crawl_interval(new_jobs_per_hour: Optional[float]) -> float:
+    """
+    Pick the time until a listing's next crawl from its posting rate.
+
+    Args:
+        new_jobs_per_hour: Smoothed rate of new jobs, or None if unknown
+
+    Returns:
+        Seconds until the next crawl
+    """
+    if new_jobs_per_hour is None:
+        return DEFAULT_CRAWL_INTERVAL
+    if new_jobs_per_hour <= 0:
+        return MAX_CRAWL_INTERVAL
+    interval = TARGET_NEW_JOBS / new_jobs_per_hour * 3600
+    return min(MAX_CRAWL_INTERVAL, max(MIN_CRAWL_INTERVAL, interval))
+
+class CrawlScheduler:
+    """Freshness-driven crawl schedule for a set of listings."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Load the schedule.
+
+        Args:
+            path: Schedule file, or None to keep the schedule in memory only
+        """
+        self.path = path
+        self.sites = load_schedule(path) if path else {}
+        self._lock = threading.Lock()
+
+    def get_due_configs(self, configs: List[Dict[str, Any]], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Select the listings due for a crawl, most overdue first.
+
+        Listings never crawled before are always due.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            due = [
+                (self.sites[config['url']].next_due if config['url'] in self.sites else 0.0, index, config)
+                for index, config in enumerate(configs)
+            ]
+        return [config for next_due, _, config in sorted(due) if next_due <= now]
+
+    def get_seconds_until_due(self, configs: List[Dict[str, Any]], now: Optional[float] = None) -> float:
+        """Seconds until the next listing comes due, or 0 if one already is."""
+        now = time.time() if now is None else now
+        with self._lock:
+            next_due = min(
+                (self.sites[config['url']].next_due if config['url'] in self.sites else 0.0 for config in configs),
+                default=now + MAX_CRAWL_INTERVAL
+            )
+        return max(0.0, next_due - now)
+
+    def record_crawl(self, url: str, new_jobs: int, now: Optional[float] = None) -> SiteSchedule:
+        """
+        Update a listing's posting rate from a finished crawl and plan its next one.
+
+        Args:
+            url: Listing URL from the site config
+            new_jobs: Number of jobs the crawl found that had not been seen before
+            now: Time the crawl finished
+
+        Returns:
+            The listing's updated schedule
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self.sites.setdefault(url, SiteSchedule())
+            # The first crawl finds the whole backlog, which says nothing about the rate
+            if entry.last_crawl:
+                hours = max(now - entry.last_crawl, MIN_CRAWL_INTERVAL) / 3600
+                observed = new_jobs / hours
+                if entry.new_jobs_per_hour is None:
+                    entry.new_jobs_per_hour = observed
+                else:
+                    entry.new_jobs_per_hour += RATE_SMOOTHING * (observed - entry.new_jobs_per_hour)
+            entry.last_crawl = now
+            entry.next_due = now + plan_crawl_interval(entry.new_jobs_per_hour)
+            return entry
+
+    def record_failure(self, url: str, now: Optional[float] = None) -> SiteSchedule:
+        """
+        Plan a retry of a listing whose crawl failed.
+
+        The failed crawl says nothing about the posting rate, so the rate and
+        the time of the last real crawl are left alone.
+
+        Args:
+            url: Listing URL from the site config
+            now: Time the crawl failed
+
+        Returns:
+            The listing's updated schedule
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self.sites.setdefault(url, SiteSchedule())
+            entry.next_due = now + FAILED_CRAWL_RETRY
+            return entry
+
+    def save(self) -> None:
+        """Persist the schedule."""
+        if self.path is None:
+            return
+        with self._lock:
+            save_schedule(self.path, dict(self.sites))
\ No newline at end of file
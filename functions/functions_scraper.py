@@ -2,25 +2,140 @@
 Functions for running scrapers and managing the scraping process.
 Includes pagination handling, content downloading, caching, and configuration management.
 """
-from typing import List, Set, Optional, Dict, Any
+from typing import List, Set, Optional, Dict, Any, Deque, Tuple, Iterator
+import gzip
 import hashlib
+import heapq
+import math
 import os
+import re
 import secrets
+import socket
+import threading
 import time
 import csv
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
+from collections import deque
+from queue import Queue
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import lru_cache
+import requests
+from lxml import etree, html as lxml_html
 from selenium.webdriver.remote.webdriver import WebDriver
 
 # Local module imports
-from .functions_selenium import navigate_and_wait, get_page_html, extract_links_by_xpath
+from .functions_selenium import (
+    navigate_and_wait,
+    get_page_html,
+    extract_links_by_xpath,
+    TabPool,
+    TabTask,
+    get_user_agent,
+    apply_resource_blocking
+)
+from .functions_manifest import (
+    ManifestEntry,
+    get_manifest,
+    get_entry,
+    record_entry,
+    touch_entry,
+    delete_entry,
+    list_entries,
+    get_listing_fingerprint,
+    record_listing_fingerprint,
+    hash_content,
+    parse_cache_filename,
+    read_cache_file_entry
+)
+from .functions_seen import SeenStore, get_seen_store
+from .functions_checkpoint import CheckpointJournal, ListingProgress
+from .functions_queue import (
+    Task,
+    QueueBackend,
+    TASK_SITE,
+    TASK_LISTING_PAGE,
+    TASK_DETAIL_PAGE,
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_POLITENESS_DELAY,
+    DEFAULT_RETRY_DELAY
+)
+from .functions_ratelimit import AdaptiveRateLimiter, DEFAULT_MIN_DELAY, DEFAULT_MAX_DELAY
+from .functions_http import (
+    FetchResult,
+    create_http_session,
+    fetch_page,
+    build_conditional_headers,
+    download_all_async,
+    looks_js_gated,
+    get_fetch_mode,
+    record_fetch_mode,
+    FETCH_MODE_HTTP,
+    FETCH_MODE_BROWSER
+)
 
 # Constants
 CACHE_DIR = Path('cache')
 DEFAULT_CACHE_MAX_AGE = timedelta(days=28)  # 28 days in seconds
 DEFAULT_MIN_FILE_LENGTH = 100
 DEFAULT_SLEEP_TIME = 5
+CACHE_SHARD_WIDTH = 2  # Hex characters per directory level
+CACHE_SHARD_DEPTH = 2  # Directory levels, e.g. cache/ab/cd/
+CACHE_OBJECTS_DIRNAME = 'objects'
+CACHE_COMPRESSION_LEVEL = 6
+FETCH_MODES_FILENAME = 'fetch_modes.json'
+HOST_RATES_FILENAME = 'host_rates.json'
+# Texts such as "Showing 1-20 of 437 jobs" or "437 results", tried in order. A bare
+# "of N" is only a total after a range or before a job noun, since "Page 1 of 22"
+# and "1 of 5 locations" count something else
+TOTAL_COUNT_NUMBER = r'(\d{1,3}(?:[,.\s]\d{3})+|\d+)'
+TOTAL_COUNT_NOUNS = r'(?:jobs?|results?|positions?|openings?|vacancies|roles?|listings?|opportunities)'
+TOTAL_COUNT_PATTERNS = [
+    re.compile(r'\d+\s*[-–]\s*\d+\s+of\s+(?:about\s+|over\s+)?' + TOTAL_COUNT_NUMBER + r'\b', re.IGNORECASE),
+    re.compile(r'\bof\s+(?:about\s+|over\s+)?' + TOTAL_COUNT_NUMBER + r'\+?\s+' + TOTAL_COUNT_NOUNS + r'\b', re.IGNORECASE),
+    re.compile(r'\b' + TOTAL_COUNT_NUMBER + r'\+?\s+' + TOTAL_COUNT_NOUNS + r'\b', re.IGNORECASE),
+]
+PAGE_POSITION_PATTERN = re.compile(r'\bpage\s+\d+\s*(?:of|/)\s*\d+', re.IGNORECASE)
+
+@dataclass
+class ScrapeOptions:
+    """Runtime options controlling how sites are scraped."""
+    http_first: bool = False
+    async_per_host_limit: int = 0
+    lite: bool = False
+    offline_xpath: bool = False
+    compress_cache: bool = False
+    incremental_pages: int = 0
+    adaptive_rate: bool = False
+    min_delay: float = DEFAULT_MIN_DELAY
+    max_delay: float = DEFAULT_MAX_DELAY
+    parallel_pages: int = 1
+    detail_tabs: int = 1
+    stream_downloads: bool = False
+    interleave_downloads: bool = False
+
+@dataclass
+class IncrementalPagination:
+    """
+    Early-stop settings and results for one incremental pagination run.
+    
+    Pagination stops after max_known_pages consecutive pages whose jobs are
+    all already cached, and the listing is skipped outright if its first
+    page matches the fingerprint recorded on the previous run.
+    """
+    max_known_pages: int
+    previous_fingerprint: Optional[str] = None
+    fingerprint: Optional[str] = None
+    unchanged: bool = False
+
+@dataclass
+class DeferredSite:
+    """A paginated site whose job pages are left for the interleaved download pass."""
+    config: Dict[str, Any]
+    name: str
+    links: List[str]
+    incremental: Optional[IncrementalPagination] = None
 
 def ensure_cache_dir_exists() -> None:
     """Create cache directory if it doesn't exist."""
@@ -36,6 +151,70 @@ def create_cache_filename(name: str, url: str) -> str:
     url_hash = generate_url_hash(url)
     return f"{sanitized_name}_{url_hash}.html"
 
+def get_cache_path(filename: str) -> Path:
+    """
+    Get the sharded location of a cache file, keyed on its URL hash prefix.
+    
+    Args:
+        filename: Cache filename from create_cache_filename
+        
+    Returns:
+        Path such as cache/ab/cd/{site}_{abcd...}.html
+    """
+    _, url_hash = parse_cache_filename(filename)
+    shards = [
+        url_hash[level * CACHE_SHARD_WIDTH:(level + 1) * CACHE_SHARD_WIDTH]
+        for level in range(CACHE_SHARD_DEPTH)
+    ]
+    return CACHE_DIR.joinpath(*[shard for shard in shards if shard], filename)
+
+def create_cache_path(name: str, url: str) -> Path:
+    """Generate the sharded cache path for a site name and URL."""
+    return get_cache_path(create_cache_filename(name, url))
+
+def find_cache_file(filename: str) -> Path:
+    """
+    Locate a cache file, reading transparently from the old flat layout.
+    
+    Returns the sharded path if it exists or the file has not been cached yet,
+    otherwise the legacy flat path if the file is still stored there.
+    """
+    cache_path = get_cache_path(filename)
+    if cache_path.exists():
+        return cache_path
+    legacy_path = CACHE_DIR / filename
+    return legacy_path if legacy_path.exists() else cache_path
+
+def migrate_cache_layout(progress_every: int = 10000) -> int:
+    """
+    Move cache files from the flat layout into the sharded layout.
+    
+    Each file is moved with an atomic rename, so the migration can be
+    interrupted and simply run again to pick up where it stopped.
+    
+    Args:
+        progress_every: Print progress after this many files
+        
+    Returns:
+        Number of files migrated
+    """
+    ensure_cache_dir_exists()
+    migrated = 0
+    for legacy_path in CACHE_DIR.glob('*.html'):
+        cache_path = get_cache_path(legacy_path.name)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # A page re-downloaded since sharding is newer than the flat copy
+        if cache_path.exists() and cache_path.stat().st_mtime >= legacy_path.stat().st_mtime:
+            legacy_path.unlink()
+        else:
+            os.replace(legacy_path, cache_path)
+            
+        migrated += 1
+        if migrated % progress_every == 0:
+            print(f"Migrated {migrated} cache files")
+    return migrated
+
 def get_file_length(file_path: Path) -> int:
     """Get the length of text content in a file with error handling."""
     try:
@@ -66,6 +245,13 @@ def should_update_cache(
         
     return False
 
+def is_entry_fresh(
+    entry: ManifestEntry,
+    max_age: timedelta = DEFAULT_CACHE_MAX_AGE
+) -> bool:
+    """Check whether a manifest entry is younger than the maximum cache age."""
+    return datetime.now().timestamp() - entry.fetched_at < max_age.total_seconds()
+
 def manage_cache_file(
     filename: str,
     max_age: timedelta = DEFAULT_CACHE_MAX_AGE,
@@ -74,24 +260,205 @@ def manage_cache_file(
     """
     Manage cache file: check existence, age, and length.
     Returns True if cache is valid, False if needs update.
+    
+    Freshness is answered from the cache manifest when the page is indexed.
+    Files not yet in the manifest are checked on disk and indexed if valid.
     """
     ensure_cache_dir_exists()
-    cache_file = CACHE_DIR / filename
-    return not should_update_cache(cache_file, max_age, min_length)
+    manifest = get_manifest(CACHE_DIR)
+    site, url_hash = parse_cache_filename(filename)
+    
+    # The path is only resolved when the file itself is touched, so the
+    # common fresh-entry check costs no filesystem lookups
+    entry = get_entry(manifest, url_hash)
+    if entry is not None and entry.site == site:
+        if entry.size < min_length:
+            delete_entry(manifest, url_hash)
+            find_cache_file(filename).unlink(missing_ok=True)
+            return False
+        return is_entry_fresh(entry, max_age)
+        
+    cache_file = find_cache_file(filename)
+    if should_update_cache(cache_file, max_age, min_length):
+        return False
+        
+    file_entry = read_cache_file_entry(cache_file)
+    if file_entry is not None:
+        record_entry(manifest, file_entry)
+    return True
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temporary file and rename, so readers never see partial content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+def get_object_path(content_hash: str) -> Path:
+    """Get the path of a compressed, content-addressed cache object."""
+    return CACHE_DIR / CACHE_OBJECTS_DIRNAME / content_hash[:CACHE_SHARD_WIDTH] / f"{content_hash}.html.gz"
+
+def write_cache_object(content: str, content_hash: str) -> Path:
+    """
+    Store page content compressed under its content hash.
+    
+    Identical bodies are written only once; later pages with the same hash
+    simply point at the existing object.
+    
+    Args:
+        content: Page HTML
+        content_hash: SHA256 hash of the content
+        
+    Returns:
+        Path of the stored object
+    """
+    object_path = get_object_path(content_hash)
+    if object_path.exists():
+        # Refresh the mtime so garbage collection sees the object is in use
+        os.utime(object_path)
+        return object_path
+        
+    write_bytes_atomic(object_path, gzip.compress(content.encode('utf-8'), compresslevel=CACHE_COMPRESSION_LEVEL))
+    return object_path
 
-def save_to_cache(name: str, url: str, content: str) -> None:
-    """Save content to cache with URL as comment."""
+def read_cache_object(content_hash: str) -> Optional[str]:
+    """Read and decompress a cache object, returning None if it is missing."""
+    try:
+        return gzip.decompress(get_object_path(content_hash).read_bytes()).decode('utf-8')
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error reading cache object {content_hash}: {e}")
+        return None
+
+def get_entry_filename(entry: ManifestEntry) -> str:
+    """Rebuild the cache filename of a manifest entry."""
+    return f"{entry.site}_{entry.url_hash}.html" if entry.site else f"{entry.url_hash}.html"
+
+def get_cache_entry(name: str, url: str) -> Optional[ManifestEntry]:
+    """Look up the manifest entry of a cached page, or None if it is not indexed."""
+    site, url_hash = parse_cache_filename(create_cache_filename(name, url))
+    entry = get_entry(get_manifest(CACHE_DIR), url_hash)
+    return entry if entry is not None and entry.site == site else None
+
+def refresh_cache_entry(entry: ManifestEntry, etag: str = '', last_modified: str = '') -> bool:
+    """
+    Mark an unchanged cached page as freshly fetched without rewriting it.
+    
+    Args:
+        entry: Manifest entry of the page
+        etag: Latest ETag, if the server sent one
+        last_modified: Latest Last-Modified value, if the server sent one
+        
+    Returns:
+        True if the stored page was found and refreshed, False if it is missing
+    """
+    if entry.compressed:
+        stored_path = get_object_path(entry.content_hash)
+    else:
+        stored_path = find_cache_file(get_entry_filename(entry))
+    try:
+        # Keep file mtimes in step for garbage collection and legacy freshness checks
+        os.utime(stored_path)
+    except FileNotFoundError:
+        return False
+        
+    touch_entry(
+        get_manifest(CACHE_DIR),
+        entry.url_hash,
+        datetime.now().timestamp(),
+        etag or entry.etag,
+        last_modified or entry.last_modified
+    )
+    return True
+
+def save_to_cache(
+    name: str,
+    url: str,
+    content: str,
+    compress: bool = False,
+    etag: str = '',
+    last_modified: str = ''
+) -> None:
+    """
+    Save content to the sharded cache with URL as comment and index it in the manifest.
+    
+    With compress enabled the page body is stored gzip-compressed in the
+    content-addressed object store and the manifest entry points at it.
+    If the page is already cached with the same content, only its freshness
+    metadata is updated and the stored copy is not rewritten.
+    """
     ensure_cache_dir_exists()
     filename = create_cache_filename(name, url)
-    cache_path = CACHE_DIR / filename
-    
     cache_content = f"<!-- {url} -->\n{content}"
-    cache_path.write_text(cache_content, encoding='utf-8')
+    content_hash = hash_content(content)
+    
+    entry = get_cache_entry(name, url)
+    if entry is not None and entry.content_hash == content_hash and entry.compressed == compress:
+        if refresh_cache_entry(entry, etag, last_modified):
+            return
+    
+    if compress:
+        write_cache_object(content, content_hash)
+        find_cache_file(filename).unlink(missing_ok=True)
+    else:
+        write_bytes_atomic(get_cache_path(filename), cache_content.encode('utf-8'))
+    
+    record_entry(get_manifest(CACHE_DIR), ManifestEntry(
+        url_hash=generate_url_hash(url),
+        site=name.strip(),
+        url=url,
+        fetched_at=datetime.now().timestamp(),
+        size=len(cache_content),
+        content_hash=content_hash,
+        compressed=compress,
+        etag=etag,
+        last_modified=last_modified
+    ))
+    get_seen_urls().add(url, name.strip())
+
+def load_from_cache(name: str, url: str) -> Optional[str]:
+    """
+    Read a cached page, decompressing it transparently if needed.
+    
+    Args:
+        name: Site name
+        url: Page URL
+        
+    Returns:
+        Cached text with the URL comment line, or None if not cached
+    """
+    entry = get_cache_entry(name, url)
+    if entry is not None and entry.compressed:
+        content = read_cache_object(entry.content_hash)
+        return f"<!-- {url} -->\n{content}" if content is not None else None
+        
+    try:
+        return find_cache_file(create_cache_filename(name, url)).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
 
 def normalize_url(base_url: str, link: str) -> str:
     """Convert relative URLs to absolute URLs."""
     return urljoin(base_url, link) if not link.startswith('http') else link
 
+def get_seen_urls() -> SeenStore:
+    """Open the persistent seen-URL store, seeding it from the cache manifest on first use."""
+    store = get_seen_store(CACHE_DIR)
+    if store.is_empty():
+        entries = [entry for entry in list_entries(get_manifest(CACHE_DIR)) if entry.url]
+        for site in {entry.site for entry in entries}:
+            store.add_many((entry.url for entry in entries if entry.site == site), site)
+    return store
+
+def find_known_jobs(jobs: List[str]) -> Set[str]:
+    """Return the jobs that have been downloaded on this or any earlier run."""
+    return get_seen_urls().find_seen(jobs)
+
+def fingerprint_jobs(jobs: List[str]) -> str:
+    """Fingerprint a page's job set, independent of the order links appear in."""
+    return hashlib.sha256("\n".join(sorted(set(jobs))).encode()).hexdigest()
+
 def is_new_job(job: str, existing_jobs: Set[str]) -> bool:
     """Check if job URL is new and not already processed."""
     return job not in existing_jobs
@@ -100,71 +467,681 @@ def should_stop_scraping(consecutive_single_pages: int, max_consecutive: int = 5
     """Determine if scraping should stop based on consecutive single-page results."""
     return consecutive_single_pages >= max_consecutive
 
+@lru_cache(maxsize=None)
+def compile_job_xpath(xpath: str) -> etree.XPath:
+    """Compile a job XPath once and reuse it for the rest of the run."""
+    return etree.XPath(xpath)
+
+def extract_links_from_html(page_html: str, xpath: str, page_url: str) -> List[str]:
+    """
+    Evaluate a job XPath against rendered HTML without querying the browser.
+    
+    Args:
+        page_html: Rendered page source
+        xpath: Job link XPath from the site configuration
+        page_url: URL the HTML was loaded from, used to resolve relative links
+        
+    Returns:
+        List of absolute job URLs in document order
+    """
+    if not page_html.strip():
+        return []
+    try:
+        tree = lxml_html.fromstring(page_html)
+    except (etree.ParserError, ValueError) as e:
+        print(f"Error parsing page HTML: {e}")
+        return []
+        
+    base = tree.find('.//base[@href]')
+    base_url = urljoin(page_url, base.get('href')) if base is not None else page_url
+    
+    links = []
+    for node in compile_job_xpath(xpath)(tree):
+        href = node if isinstance(node, str) else node.get('href')
+        if href is not None:
+            links.append(urljoin(base_url, href.strip()))
+    return links
+
 def process_jobs_page(
     driver: WebDriver,
     xpath: str,
     base_url: str,
-    existing_jobs: Set[str]
+    existing_jobs: Set[str],
+    offline: bool = False
 ) -> List[str]:
-    """Process a single page of job listings and extract new job URLs."""
-    jobs = extract_links_by_xpath(driver, xpath)
+    """
+    Process a single page of job listings and extract new job URLs.
+    
+    In offline mode the rendered HTML is pulled once and the XPath is
+    evaluated locally with lxml, keeping WebDriver out of the extraction.
+    """
+    if offline:
+        jobs = extract_links_from_html(get_page_html(driver), xpath, driver.current_url)
+    else:
+        jobs = extract_links_by_xpath(driver, xpath)
     if not jobs:
         return []
         
     normalized_jobs = [normalize_url(base_url, job) for job in jobs]
     return [job for job in normalized_jobs if is_new_job(job, existing_jobs)]
 
-def generic_paged_scraper_by_xpath(
+@dataclass
+class PaginationTracker:
+    """Accumulates jobs across listing pages and decides when to stop paginating."""
+    incremental: Optional[IncrementalPagination] = None
+    debug: bool = False
+    found_links: Set[str] = field(default_factory=set)
+    consecutive_single_job_pages: int = 0
+    consecutive_known_pages: int = 0
+    checkpoint: Optional[CheckpointJournal] = None
+    listing_url: str = ''
+    
+    def resume(self) -> Optional[ListingProgress]:
+        """
+        Restore the jobs found before an interrupted run from the checkpoint journal.
+        
+        Returns:
+            Saved pagination state, or None if the listing was not started
+        """
+        if self.checkpoint is None:
+            return None
+        progress = self.checkpoint.get_listing_progress(self.listing_url)
+        if progress is not None:
+            self.found_links.update(self.checkpoint.get_links(self.listing_url))
+            if self.debug:
+                state = "finished" if progress.finished else f"resuming at page {progress.next_page}"
+                print(f"\tCheckpoint: {len(self.found_links)} jobs found, {state}")
+        return progress
+        
+    def save_progress(self, new_jobs: List[str], next_page: int, last_page: Optional[int]) -> None:
+        """Journal an accepted page so an interrupted run can continue after it."""
+        if self.checkpoint is not None:
+            self.checkpoint.record_page(self.listing_url, new_jobs, next_page, last_page)
+            
+    def finish(self) -> None:
+        """Journal that pagination reached the end of the listing."""
+        if self.checkpoint is not None:
+            self.checkpoint.mark_listing_finished(self.listing_url)
+    
+    def accept_page(self, new_jobs: List[str]) -> bool:
+        """
+        Record the new jobs found on the next page in order.
+        
+        Args:
+            new_jobs: Jobs on the page not already found on earlier pages
+            
+        Returns:
+            True if pagination should continue with the following page
+        """
+        if not new_jobs:
+            return False
+            
+        incremental = self.incremental
+        if incremental is not None:
+            if not self.found_links:
+                incremental.fingerprint = fingerprint_jobs(new_jobs)
+                if incremental.fingerprint == incremental.previous_fingerprint:
+                    incremental.unchanged = True
+                    if self.debug:
+                        print("\tFirst page unchanged since the last run. Skipping site.")
+                    return False
+                    
+            if len(find_known_jobs(new_jobs)) == len(new_jobs):
+                self.consecutive_known_pages += 1
+            else:
+                self.consecutive_known_pages = 0
+            
+        self.found_links.update(new_jobs)
+        
+        if incremental is not None and self.consecutive_known_pages >= incremental.max_known_pages:
+            if self.debug:
+                print(f"\tOnly known jobs for {self.consecutive_known_pages} consecutive pages. Ending scraping.")
+            return False
+        
+        if len(new_jobs) == 1:
+            self.consecutive_single_job_pages += 1
+        else:
+            self.consecutive_single_job_pages = 0
+            
+        if should_stop_scraping(self.consecutive_single_job_pages):
+            if self.debug:
+                print("\tFound only one job for five consecutive pages. Ending scraping.")
+            return False
+            
+        return True
+
+def unique_new_jobs(jobs: List[str], tracker: PaginationTracker) -> List[str]:
+    """Drop repeated links on a page, e.g. title and Apply links, and links yielded on earlier pages."""
+    return list(dict.fromkeys(job for job in jobs if job not in tracker.found_links))
+
+def iter_paged_jobs_by_xpath(
     url: str,
     driver: WebDriver,
     xpath: str,
     debug: bool = False,
     page: int = 1,
-    increment: int = 1
-) -> List[str]:
-    """Scrape pages using XPath pattern with pagination."""
-    found_links: Set[str] = set()
-    consecutive_single_job_pages = 0
+    increment: int = 1,
+    offline: bool = False,
+    incremental: Optional[IncrementalPagination] = None,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    total_count_xpath: str = '',
+    checkpoint: Optional[CheckpointJournal] = None
+) -> Iterator[List[str]]:
+    """
+    Scrape pages using XPath pattern with pagination, yielding each page's new jobs.
+    
+    Jobs restored from the checkpoint journal are yielded first. Each page
+    is fully read and journaled before its jobs are yielded, so the caller
+    may use the browser between pages.
+    
+    With incremental settings, pagination also stops early once pages only
+    list already-cached jobs, and nothing is returned if the first page is
+    unchanged since the last run. With a rate limiter, pages are paced by
+    the host's learned delay instead of a fixed sleep. With a total-count
+    XPath, the last page is computed from the first page instead of being
+    found by loading an empty one. With a checkpoint journal, each page is
+    journaled as it is accepted and an interrupted listing resumes after
+    its last journaled page.
+    """
+    host = get_site_name(url)
+    tracker = PaginationTracker(incremental, debug, checkpoint=checkpoint, listing_url=url)
+    first_page = page
+    last_page = None
+    progress = tracker.resume()
+    if tracker.found_links:
+        yield list(tracker.found_links)
+    if progress is not None:
+        if progress.finished:
+            return
+        page, last_page = progress.next_page, progress.last_page
     
     while True:
         if debug:
             print(f"Scraping page {page}")
             
         current_url = f"{url}{page}"
+        if rate_limiter is not None:
+            rate_limiter.wait(host)
+        started = time.monotonic()
         navigate_and_wait(driver, current_url)
-        time.sleep(DEFAULT_SLEEP_TIME)
+        latency = time.monotonic() - started
+        if rate_limiter is None:
+            time.sleep(DEFAULT_SLEEP_TIME)
         
-        new_jobs = process_jobs_page(driver, xpath, url, found_links)
+        new_jobs = unique_new_jobs(process_jobs_page(driver, xpath, url, tracker.found_links, offline), tracker)
         
-        if not new_jobs:
+        if rate_limiter is not None:
+            # Running out of new jobs is the normal end of a listing; only an
+            # empty first page suggests the host is blocking or struggling
+            rate_limiter.record(host, latency, bool(new_jobs or tracker.found_links))
+        
+        found_before = len(tracker.found_links)
+        accepted = tracker.accept_page(new_jobs)
+        if accepted:
+            if page == first_page and total_count_xpath:
+                last_page = plan_last_page(get_page_html(driver), total_count_xpath, len(set(new_jobs)), page, increment)
+                if debug and last_page is not None:
+                    print(f"\tListing ends at page {last_page}")
+            tracker.save_progress(new_jobs, page + increment, last_page)
+        if len(tracker.found_links) > found_before:
+            yield new_jobs
+            
+        if not accepted or (last_page is not None and page + increment > last_page):
             break
             
-        found_links.update(new_jobs)
+        page += increment
+    
+    tracker.finish()
+
+def generic_paged_scraper_by_xpath(
+    url: str,
+    driver: WebDriver,
+    xpath: str,
+    debug: bool = False,
+    page: int = 1,
+    increment: int = 1,
+    offline: bool = False,
+    incremental: Optional[IncrementalPagination] = None,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    total_count_xpath: str = '',
+    checkpoint: Optional[CheckpointJournal] = None
+) -> List[str]:
+    """Scrape every page of a listing, returning all jobs found (see iter_paged_jobs_by_xpath)."""
+    return [
+        job
+        for jobs in iter_paged_jobs_by_xpath(
+            url, driver, xpath, debug, page, increment, offline, incremental, rate_limiter, total_count_xpath, checkpoint
+        )
+        for job in jobs
+    ]
+
+def iter_speculative_jobs_by_xpath(
+    url: str,
+    driver: WebDriver,
+    xpath: str,
+    tabs: int,
+    rate_limiter: AdaptiveRateLimiter,
+    debug: bool = False,
+    page: int = 1,
+    increment: int = 1,
+    offline: bool = False,
+    incremental: Optional[IncrementalPagination] = None,
+    total_count_xpath: str = '',
+    checkpoint: Optional[CheckpointJournal] = None
+) -> Iterator[List[str]]:
+    """
+    Scrape predictable pagination by loading several pages at once in tabs,
+    yielding each page's new jobs.
+    
+    The first page is read on its own; after that, pages are requested ahead
+    of the one being read, paced by the host's rate limiter, and processed
+    strictly in page order so the stop conditions match sequential
+    pagination. After the first page that ends the listing, no new pages are
+    requested and speculative pages beyond it are discarded. With a
+    total-count XPath, no page past the computed last page is ever requested.
+    
+    Args:
+        url: Paged listing URL the page number is appended to
+        driver: Selenium WebDriver instance
+        xpath: Job link XPath
+        tabs: Number of pages to keep loading at once
+        rate_limiter: Per-host pacing for page requests
+        debug: Print progress
+        page: First page number
+        increment: Page number step
+        offline: Evaluate the XPath locally with lxml
+        incremental: Optional incremental pagination settings
+        total_count_xpath: Optional locator of the listing's total-count text
+        checkpoint: Optional journal to resume from and record accepted pages in
         
-        if len(new_jobs) == 1:
-            consecutive_single_job_pages += 1
-        else:
-            consecutive_single_job_pages = 0
+    Yields:
+        Jobs restored from the checkpoint, then each page's new jobs. The
+        listing tabs stay open in between, so the caller must not use the
+        browser until the generator is exhausted
+    """
+    host = get_site_name(url)
+    tracker = PaginationTracker(incremental, debug, checkpoint=checkpoint, listing_url=url)
+    in_flight: Deque[Tuple[TabTask, int]] = deque()
+    first_page = page
+    last_page = None
+    progress = tracker.resume()
+    if tracker.found_links:
+        yield list(tracker.found_links)
+    if progress is not None:
+        if progress.finished:
+            return
+        page, last_page = progress.next_page, progress.last_page
+    
+    with TabPool(driver, tabs) as pool:
+        rate_limiter.wait(host)
+        in_flight.append((pool.submit(f"{url}{page}"), page))
+        page += increment
             
-        if should_stop_scraping(consecutive_single_job_pages):
+        while in_flight:
+            task, page_number = in_flight.popleft()
             if debug:
-                print("\tFound only one job for five consecutive pages. Ending scraping.")
-            break
+                print(f"Scraping page {page_number}")
+            pool.wait_for(task)
+            latency = time.monotonic() - task.started
             
-        page += increment
+            new_jobs = unique_new_jobs(process_jobs_page(driver, xpath, url, tracker.found_links, offline), tracker)
+            rate_limiter.record(host, latency, bool(new_jobs or tracker.found_links))
+            
+            found_before = len(tracker.found_links)
+            accepted = tracker.accept_page(new_jobs)
+            if accepted:
+                if page_number == first_page and total_count_xpath:
+                    last_page = plan_last_page(get_page_html(driver), total_count_xpath, len(set(new_jobs)), page_number, increment)
+                    if debug and last_page is not None:
+                        print(f"\tListing ends at page {last_page}")
+                tracker.save_progress(new_jobs, page_number + increment, last_page)
+            if len(tracker.found_links) > found_before:
+                yield new_jobs
+                
+            if not accepted:
+                if debug and in_flight:
+                    print(f"\tDiscarding {len(in_flight)} speculative pages")
+                break
+                    
+            pool.release(task)
+            while pool.has_idle_tab and (last_page is None or page <= last_page):
+                rate_limiter.wait(host)
+                in_flight.append((pool.submit(f"{url}{page}"), page))
+                page += increment
+    
+    tracker.finish()
+
+def speculative_paged_scraper_by_xpath(
+    url: str,
+    driver: WebDriver,
+    xpath: str,
+    tabs: int,
+    rate_limiter: AdaptiveRateLimiter,
+    debug: bool = False,
+    page: int = 1,
+    increment: int = 1,
+    offline: bool = False,
+    incremental: Optional[IncrementalPagination] = None,
+    total_count_xpath: str = '',
+    checkpoint: Optional[CheckpointJournal] = None
+) -> List[str]:
+    """Scrape every page of a listing in tabs, returning all jobs found (see iter_speculative_jobs_by_xpath)."""
+    return [
+        job
+        for jobs in iter_speculative_jobs_by_xpath(
+            url, driver, xpath, tabs, rate_limiter, debug, page, increment, offline, incremental, total_count_xpath, checkpoint
+        )
+        for job in jobs
+    ]
+
+def parse_total_count(text: str) -> Optional[int]:
+    """
+    Read the total number of jobs from a listing's summary text.
     
-    return list(found_links)
+    Args:
+        text: Text such as "Showing 1-20 of 437 jobs"
+        
+    Returns:
+        Total job count, or None if the text does not state one
+    """
+    # A "page N of M" position says how many pages there are, not how many jobs
+    if PAGE_POSITION_PATTERN.search(text):
+        return None
+    for pattern in TOTAL_COUNT_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return int(re.sub(r'\D', '', match.group(1)))
+    return None
+
+def extract_total_count(page_html: str, xpath: str) -> Optional[int]:
+    """Evaluate a total-count XPath against rendered HTML and parse the count."""
+    try:
+        nodes = compile_job_xpath(xpath)(lxml_html.fromstring(page_html))
+    except (etree.ParserError, etree.XPathError, ValueError) as e:
+        print(f"Error reading total count: {e}")
+        return None
+        
+    for node in nodes:
+        text = node if isinstance(node, str) else node.text_content()
+        total = parse_total_count(" ".join(text.split()))
+        if total is not None:
+            return total
+    return None
+
+def plan_last_page(
+    page_html: str,
+    total_count_xpath: str,
+    jobs_per_page: int,
+    first_page: int,
+    increment: int
+) -> Optional[int]:
+    """
+    Work out the last page number of a listing from its total job count.
+    
+    Args:
+        page_html: Rendered HTML of the first page
+        total_count_xpath: Locator of the total-count text from the site config
+        jobs_per_page: Number of jobs on the first page
+        first_page: Page number of the first page
+        increment: Page increment; 1 for page numbers, otherwise an item offset
+        
+    Returns:
+        Last page number to request, or None if the count could not be read
+    """
+    total = extract_total_count(page_html, total_count_xpath)
+    if not total or jobs_per_page <= 0:
+        return None
+    if increment == 1:
+        return first_page + math.ceil(total / jobs_per_page) - 1
+    return first_page + (math.ceil(total / increment) - 1) * increment
+
+def get_fetch_modes_path() -> Path:
+    """Get the path of the per-site fetch mode file."""
+    return CACHE_DIR / FETCH_MODES_FILENAME
+
+def get_host_rates_path() -> Path:
+    """Get the path of the learned per-host rate file."""
+    return CACHE_DIR / HOST_RATES_FILENAME
+
+def create_fixed_rate_limiter(delay: float) -> AdaptiveRateLimiter:
+    """Create a limiter that spaces requests to each host by a fixed delay, as the plain sleeps do."""
+    delay = delay or DEFAULT_MIN_DELAY
+    return AdaptiveRateLimiter(None, delay, delay, delay)
+
+def is_usable_page(content: str, min_length: int = DEFAULT_MIN_FILE_LENGTH) -> bool:
+    """Check whether fetched content is long enough and not a JS-gated shell."""
+    return len(content) >= min_length and not looks_js_gated(content)
+
+def fetch_detail_page(
+    url: str,
+    driver: WebDriver,
+    session: Optional[requests.Session] = None,
+    mode: Optional[str] = None,
+    cached: Optional[ManifestEntry] = None
+) -> Tuple[FetchResult, str]:
+    """
+    Fetch a detail page over HTTP first, falling back to the browser.
+    
+    When a stale cached copy has validators, the HTTP request is made
+    conditional so an unchanged page costs a bodiless 304 response.
+    
+    Args:
+        url: Page URL to fetch
+        driver: Selenium WebDriver instance used for the fallback
+        session: HTTP session, or None to always use the browser
+        mode: Remembered fetch mode for the site, if known
+        cached: Manifest entry of the stale cached copy, if any
+        
+    Returns:
+        Tuple of (fetch_result, mode_used)
+    """
+    if session is not None and mode != FETCH_MODE_BROWSER:
+        headers = build_conditional_headers(cached.etag, cached.last_modified) if cached else None
+        result = fetch_page(session, url, headers)
+        if (result.not_modified and cached) or is_usable_page(result.content):
+            return result, FETCH_MODE_HTTP
+            
+    navigate_and_wait(driver, url)
+    return FetchResult(get_page_html(driver), 200), FETCH_MODE_BROWSER
+
+def fetch_detail_page_revalidated(
+    url: str,
+    driver: WebDriver,
+    session: Optional[requests.Session] = None,
+    mode: Optional[str] = None,
+    cached: Optional[ManifestEntry] = None
+) -> Tuple[FetchResult, str]:
+    """
+    Fetch a detail page and settle a 304 answer against the cache.
+    
+    A 304 refreshes the cached copy in place. If that copy has gone missing,
+    the page is fetched again without validators, so the returned result is
+    only ever "not modified" when the cache already holds the page.
+    
+    Args:
+        url: Page URL to fetch
+        driver: Selenium WebDriver instance used for the fallback
+        session: HTTP session, or None to always use the browser
+        mode: Remembered fetch mode for the site, if known
+        cached: Manifest entry of the stale cached copy, if any
+        
+    Returns:
+        Tuple of (fetch_result, mode_used)
+    """
+    result, mode_used = fetch_detail_page(url, driver, session, mode, cached)
+    if not result.not_modified or refresh_cache_entry(cached, result.etag, result.last_modified):
+        return result, mode_used
+        
+    print(f"\t\tCached copy of {url} is missing, fetching it again")
+    return fetch_detail_page(url, driver, session, mode)
+
+def download_links_async(
+    links: List[str],
+    name: str,
+    per_host_limit: int,
+    delay: float = 0,
+    user_agent: Optional[str] = None,
+    compress: bool = False,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+) -> Tuple[int, List[str]]:
+    """
+    Download uncached links concurrently over HTTP.
+    
+    Args:
+        links: Absolute job URLs to download
+        name: Site name used for cache filenames
+        per_host_limit: Maximum requests in flight to one host
+        delay: Politeness delay held per request slot
+        user_agent: User agent string to send
+        compress: Store pages in the compressed object store
+        rate_limiter: Per-host pacing, keyed on each URL's own host and fed
+            the outcome of every request
+        
+    Returns:
+        Tuple of (pages_saved, urls_needing_browser_fallback)
+    """
+    pending = [link for link in links if not manage_cache_file(create_cache_filename(name, link))]
+    if not pending:
+        return 0, []
+        
+    stale_entries = {url: get_cache_entry(name, url) for url in pending}
+    request_headers = {
+        url: build_conditional_headers(entry.etag, entry.last_modified)
+        for url, entry in stale_entries.items() if entry is not None
+    }
+        
+    def save_if_usable(url: str, result: FetchResult) -> bool:
+        if result.not_modified:
+            entry = stale_entries.get(url)
+            return entry is not None and refresh_cache_entry(entry, result.etag, result.last_modified)
+        if not is_usable_page(result.content):
+            return False
+        save_to_cache(name, url, result.content, compress, result.etag, result.last_modified)
+        return True
+        
+    stats = download_all_async(
+        pending,
+        save_if_usable,
+        user_agent,
+        per_host_limit,
+        delay,
+        request_headers=request_headers,
+        rate_limiter=rate_limiter
+    )
+    print(
+        f"\tFetched {stats.fetched}/{len(pending)} pages over HTTP ({stats.not_modified} not modified) "
+        f"in {stats.elapsed:.2f}s ({stats.jobs_per_second:.2f} jobs/s)"
+    )
+    return stats.fetched, stats.failed_urls
+
+def download_links_in_tabs(
+    links: List[str],
+    driver: WebDriver,
+    name: str,
+    tabs: int,
+    rate_limiter: AdaptiveRateLimiter,
+    compress: bool = False
+) -> int:
+    """
+    Render uncached links in several tabs of one browser at once.
+    
+    A new page is started whenever a tab is free and the host's rate limiter
+    allows it, and pages are saved in whatever order they finish loading.
+    
+    Args:
+        links: Absolute job URLs to download
+        driver: Selenium WebDriver instance
+        name: Site name used for cache filenames
+        tabs: Number of pages to keep loading at once
+        rate_limiter: Per-host pacing for page requests
+        compress: Store pages in the compressed object store
+        
+    Returns:
+        Number of pages saved
+    """
+    pending = deque(link for link in links if not manage_cache_file(create_cache_filename(name, link)))
+    total = len(pending)
+    if not total:
+        return 0
+    saved = 0
+    
+    with TabPool(driver, min(tabs, total)) as pool:
+        while pending or pool.loading:
+            while pending and pool.has_idle_tab:
+                link = pending.popleft()
+                rate_limiter.wait(get_site_name(link))
+                pool.submit(link)
+                
+            task = pool.next_ready()
+            content = get_page_html(driver)
+            rate_limiter.record(get_site_name(task.url), time.monotonic() - task.started, is_usable_page(content))
+            pool.release(task)
+            
+            saved += 1
+            print(f"{saved}/{total} - Got {task.url}")
+            save_to_cache(name, task.url, content, compress)
+            
+    return saved
 
 def download_all_links(
     links: List[str],
     driver: WebDriver,
     name: str,
-    sleep_time: float = 0
+    sleep_time: float = 0,
+    session: Optional[requests.Session] = None,
+    async_per_host_limit: int = 0,
+    compress: bool = False,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    tabs: int = 1
 ) -> None:
-    """Download content from all provided links with randomization."""
+    """
+    Download content from all provided links with randomization.
+    
+    When an HTTP session is given, pages are fetched over HTTP first and only
+    rendered in the browser if the response is too short or looks JS-gated.
+    The mode that worked is remembered per site so later runs skip the probe;
+    the browser is only remembered after several failed HTTP samples, and
+    a remembered mode expires so the site is probed again.
+    With async_per_host_limit set, the HTTP pass runs concurrently and only
+    the rejected pages go through the browser one by one. A rate limiter
+    replaces the fixed sleep_time with the host's learned delay. With tabs
+    above 1, pages rendered in the browser load side by side in that many
+    tabs, paced by the rate limiter.
+    """
     sanitized_name = name.strip()
     randomized_links = list(links)
     secrets.SystemRandom().shuffle(randomized_links)
+    fetch_mode = get_fetch_mode(get_fetch_modes_path(), sanitized_name) if session else None
+    
+    if session and async_per_host_limit > 0 and fetch_mode != FETCH_MODE_BROWSER:
+        absolute_links = [normalize_url(driver.current_url, link) for link in randomized_links]
+        fetched, fallback_links = download_links_async(
+            absolute_links,
+            sanitized_name,
+            async_per_host_limit,
+            0 if rate_limiter else sleep_time,
+            session.headers.get('User-Agent'),
+            compress,
+            rate_limiter
+        )
+        if fetch_mode is None and (fetched or fallback_links):
+            fetch_mode = record_fetch_mode(
+                get_fetch_modes_path(),
+                sanitized_name,
+                FETCH_MODE_HTTP if fetched else FETCH_MODE_BROWSER,
+                fetched or len(fallback_links)
+            )
+        randomized_links = fallback_links
+        links = fallback_links
+        session = None
+        
+    if tabs > 1 and randomized_links and (session is None or fetch_mode == FETCH_MODE_BROWSER):
+        absolute_links = [normalize_url(driver.current_url, link) for link in randomized_links]
+        # Overlapping tabs still need a per-host budget; without a rate
+        # limiter they keep the fixed sleep_time between requests
+        tab_limiter = rate_limiter or create_fixed_rate_limiter(sleep_time)
+        download_links_in_tabs(absolute_links, driver, sanitized_name, tabs, tab_limiter, compress)
+        return
     
     for index, link in enumerate(randomized_links, start=1):
         normalized_link = normalize_url(driver.current_url, link)
@@ -176,19 +1153,228 @@ def download_all_links(
             print("\t\tAlready downloaded")
             continue
         
-        navigate_and_wait(driver, normalized_link)
-        content = get_page_html(driver)
-        save_to_cache(sanitized_name, normalized_link, content)
+        cached = get_cache_entry(sanitized_name, normalized_link)
+        # Job pages may live on another host than the listing, such as an ATS
+        host = get_site_name(normalized_link)
+        if rate_limiter is not None:
+            rate_limiter.wait(host)
+        started = time.monotonic()
+        result, mode_used = fetch_detail_page_revalidated(normalized_link, driver, session, fetch_mode, cached)
+        if rate_limiter is not None:
+            rate_limiter.record(
+                host,
+                time.monotonic() - started,
+                result.not_modified or is_usable_page(result.content),
+                result.status
+            )
+        if result.not_modified:
+            print("\t\tNot modified")
+        else:
+            save_to_cache(sanitized_name, normalized_link, result.content, compress, result.etag, result.last_modified)
+        
+        if session and fetch_mode is None:
+            fetch_mode = record_fetch_mode(get_fetch_modes_path(), sanitized_name, mode_used)
         
-        if sleep_time > 0:
+        if sleep_time > 0 and rate_limiter is None:
             time.sleep(sleep_time)
 
+def count_new_jobs(jobs: List[str]) -> int:
+    """Count the jobs that have never been downloaded before."""
+    return len(set(jobs) - find_known_jobs(jobs))
+
+def download_streamed_links(
+    pages: Iterator[List[str]],
+    driver: WebDriver,
+    name: str,
+    sleep_time: float = 0,
+    session: Optional[requests.Session] = None,
+    async_per_host_limit: int = 0,
+    compress: bool = False,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    tabs: int = 1,
+    interleave: bool = True
+) -> int:
+    """
+    Download job links while pagination is still finding them.
+    
+    With an HTTP session, a consumer thread fetches each listing page's jobs
+    over HTTP as soon as they are found while the browser carries on
+    paginating; jobs that need the browser are rendered once pagination is
+    done. Without one (or for sites known to need the browser), each listing
+    page's jobs are rendered before the next listing page is loaded.
+    
+    Args:
+        pages: Generator of each listing page's new jobs, such as
+            iter_paged_jobs_by_xpath
+        driver: Selenium WebDriver instance
+        name: Site name used for cache filenames
+        sleep_time: Time to wait between requests in seconds
+        session: HTTP session, or None to download in the browser
+        async_per_host_limit: Maximum HTTP requests in flight to the host
+        compress: Store pages in the compressed object store
+        rate_limiter: Per-host pacing for page requests
+        tabs: Number of job pages to render at once in the browser
+        interleave: Whether the browser may be used between listing pages;
+            if not, browser downloads wait until pagination ends
+        
+    Returns:
+        Number of jobs found that had never been downloaded before
+    """
+    sanitized_name = name.strip()
+    fetch_mode = get_fetch_mode(get_fetch_modes_path(), sanitized_name) if session else None
+    new_jobs = 0
+    
+    if session is None or fetch_mode == FETCH_MODE_BROWSER:
+        deferred_links: List[str] = []
+        for jobs in pages:
+            new_jobs += count_new_jobs(jobs)
+            if interleave:
+                download_all_links(jobs, driver, sanitized_name, sleep_time, None, 0, compress, rate_limiter, tabs)
+            else:
+                deferred_links.extend(jobs)
+        if deferred_links:
+            download_all_links(deferred_links, driver, sanitized_name, sleep_time, None, 0, compress, rate_limiter, tabs)
+        return new_jobs
+        
+    link_queue: "Queue[Optional[List[str]]]" = Queue()
+    fallback_links: List[str] = []
+    fetched = 0
+    delay = 0 if rate_limiter else sleep_time
+    user_agent = session.headers.get('User-Agent')
+    
+    def consume() -> None:
+        nonlocal fetched
+        while True:
+            jobs = link_queue.get()
+            if jobs is None:
+                return
+            try:
+                saved, failed = download_links_async(
+                    jobs,
+                    sanitized_name,
+                    max(async_per_host_limit, 1),
+                    delay,
+                    user_agent,
+                    compress,
+                    rate_limiter
+                )
+            except Exception as e:
+                print(f"Error downloading {len(jobs)} pages over HTTP: {e}")
+                saved, failed = 0, jobs
+            fetched += saved
+            fallback_links.extend(failed)
+            
+    consumer = threading.Thread(target=consume, name=f"download-{sanitized_name}")
+    consumer.start()
+    try:
+        for jobs in pages:
+            new_jobs += count_new_jobs(jobs)
+            link_queue.put(jobs)
+    finally:
+        link_queue.put(None)
+        consumer.join()
+        
+    if fetch_mode is None and (fetched or fallback_links):
+        record_fetch_mode(
+            get_fetch_modes_path(),
+            sanitized_name,
+            FETCH_MODE_HTTP if fetched else FETCH_MODE_BROWSER,
+            fetched or len(fallback_links)
+        )
+    if fallback_links:
+        download_all_links(fallback_links, driver, sanitized_name, sleep_time, None, 0, compress, rate_limiter, tabs)
+    return new_jobs
+
+def download_links_interleaved(
+    site_links: Dict[str, List[str]],
+    driver: WebDriver,
+    rate_limiter: AdaptiveRateLimiter,
+    session: Optional[requests.Session] = None,
+    compress: bool = False,
+    allowlists: Optional[Dict[str, List[str]]] = None
+) -> int:
+    """
+    Download the job pages of many sites in one pass, interleaving hosts.
+    
+    Hosts sit in a heap ordered by the time their rate limiter next allows
+    a request, and the next page always comes from the host that is free
+    soonest. The browser only waits when every host is resting, so the
+    politeness delays of different hosts overlap instead of adding up.
+    
+    Args:
+        site_links: Absolute job URLs to download for each site name
+        driver: Selenium WebDriver instance
+        rate_limiter: Per-host pacing for page requests
+        session: HTTP session to try before the browser, if any
+        compress: Store pages in the compressed object store
+        allowlists: Scrape-lite allowlist of each site, re-applied to the
+            browser whenever the next page belongs to a different site
+        
+    Returns:
+        Number of pages saved or revalidated
+    """
+    pending: Dict[str, Deque[Tuple[str, str]]] = {}
+    for name, links in site_links.items():
+        for link in links:
+            if not manage_cache_file(create_cache_filename(name, link)):
+                pending.setdefault(get_site_name(link), deque()).append((name, link))
+    total = sum(len(links) for links in pending.values())
+    heap = [(rate_limiter.get_host_rate(host).next_allowed, host) for host in pending]
+    heapq.heapify(heap)
+    fetch_modes: Dict[str, Optional[str]] = {}
+    current_site = None
+    done = 0
+    saved = 0
+    
+    while heap:
+        _, host = heapq.heappop(heap)
+        name, url = pending[host].popleft()
+        rate_limiter.wait(host)
+        if pending[host]:
+            heapq.heappush(heap, (rate_limiter.get_host_rate(host).next_allowed, host))
+            
+        if allowlists is not None and name != current_site:
+            apply_resource_blocking(driver, allowlists.get(name))
+        current_site = name
+        if session and name not in fetch_modes:
+            fetch_modes[name] = get_fetch_mode(get_fetch_modes_path(), name)
+        mode = fetch_modes.get(name)
+        
+        done += 1
+        print(f"{done}/{total} - Getting {url}")
+        cached = get_cache_entry(name, url)
+        started = time.monotonic()
+        try:
+            result, mode_used = fetch_detail_page_revalidated(url, driver, session, mode, cached)
+        except Exception as e:
+            print(f"\t\tError getting {url}: {e}")
+            rate_limiter.record(host, time.monotonic() - started, False)
+            continue
+        rate_limiter.record(
+            host,
+            time.monotonic() - started,
+            result.not_modified or is_usable_page(result.content),
+            result.status
+        )
+        if result.not_modified:
+            print("\t\tNot modified")
+        else:
+            save_to_cache(name, url, result.content, compress, result.etag, result.last_modified)
+        saved += 1
+        
+        if session and mode is None:
+            fetch_modes[name] = record_fetch_mode(get_fetch_modes_path(), name, mode_used)
+            
+    return saved
+
 def parse_scraper_config(row: List[str]) -> Dict[str, Any]:
     """
     Parse a CSV row into a scraper configuration dictionary.
     
     Args:
-        row: List containing [xpath, url, increment] values
+        row: List containing [xpath, url, increment] values, optionally
+            followed by a space-separated scrape-lite allowlist and a
+            total-count XPath
         
     Returns:
         Dictionary containing scraper configuration
@@ -196,7 +1382,9 @@ def parse_scraper_config(row: List[str]) -> Dict[str, Any]:
     return {
         'xpath': row[2].strip(),  # Generic Job XPath
         'url': row[3].strip(),    # Paged Link URL
-        'increment': int(row[4].strip())  # Page Increment Value
+        'increment': int(row[4].strip()),  # Page Increment Value
+        'allowlist': row[5].split() if len(row) > 5 else [],  # Lite Allowlist
+        'total_count_xpath': row[6].strip() if len(row) > 6 else ''  # Total Count XPath
     }
 
 def load_scraper_configs(csv_path: str) -> List[Dict[str, Any]]:
@@ -231,6 +1419,28 @@ def randomize_configs(configs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     secrets.SystemRandom().shuffle(shuffled)
     return shuffled
 
+def group_configs_by_host(configs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Group scraper configurations by host, preserving their order.
+    
+    Each group is handed to a single worker, so no two workers ever
+    scrape the same listing host at the same time. Job pages are not
+    covered: their hosts are only known once a listing is paginated, so
+    sites whose jobs live on a shared host, such as an applicant tracking
+    system, may have that host fetched by several workers at once. The
+    task queue paces job pages by their own host instead.
+    
+    Args:
+        configs: List of configuration dictionaries
+        
+    Returns:
+        List of configuration groups, one per host
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for config in configs:
+        groups.setdefault(get_site_name(config['url']), []).append(config)
+    return list(groups.values())
+
 def get_site_name(url: str) -> str:
     """
     Extract site name from URL.
@@ -255,11 +1465,32 @@ def determine_start_page(increment: int) -> int:
     """
     return 1 if increment == 1 else 0
 
+def finish_site(
+    config: Dict[str, Any],
+    incremental: Optional[IncrementalPagination] = None,
+    checkpoint: Optional[CheckpointJournal] = None
+) -> None:
+    """Record a site as finished once its job pages are downloaded."""
+    # Only remember the first page once its jobs are safely downloaded
+    if incremental is not None and incremental.fingerprint and not incremental.unchanged:
+        record_listing_fingerprint(
+            get_manifest(CACHE_DIR),
+            config['url'],
+            incremental.fingerprint,
+            datetime.now().timestamp()
+        )
+    if checkpoint is not None:
+        checkpoint.mark_site_done(config['url'])
+    print(f"Finished scraping {config['url']}\n\n")
+
 def scrape_single_site(
     config: Dict[str, Any],
     driver: WebDriver,
-    sleep_time: int = 2
-) -> None:
+    sleep_time: int = 2,
+    options: Optional[ScrapeOptions] = None,
+    checkpoint: Optional[CheckpointJournal] = None,
+    deferred: Optional[List[DeferredSite]] = None
+) -> Optional[int]:
     """
     Scrape job listings from a single site.
     
@@ -267,24 +1498,368 @@ def scrape_single_site(
         config: Dictionary containing scraping configuration
         driver: Selenium WebDriver instance
         sleep_time: Time to wait between requests in seconds
+        options: Runtime scraping options
+        checkpoint: Journal of the current run; finished sites are skipped
+            and an interrupted listing resumes where it stopped
+        deferred: If given, the site is only paginated and appended here,
+            for download_deferred_sites to download and finish
+        
+    Returns:
+        Number of jobs found that had never been downloaded before, or None
+        if scraping the site failed
     """
+    options = options or ScrapeOptions()
+    session = None
+    rate_limiter = None
+    new_jobs = 0
+    if checkpoint is not None and checkpoint.is_site_done(config['url']):
+        print(f"Skipping {config['url']}, already scraped in this run")
+        return 0
     try:
         site_name = get_site_name(config['url'])
         print(f"Scraping {config['url']}")
         
+        if options.lite:
+            apply_resource_blocking(driver, config.get('allowlist'))
+            
+        if options.adaptive_rate:
+            rate_limiter = AdaptiveRateLimiter(get_host_rates_path(), options.min_delay, options.max_delay)
+        
+        incremental = None
+        if options.incremental_pages > 0:
+            incremental = IncrementalPagination(
+                max_known_pages=options.incremental_pages,
+                previous_fingerprint=get_listing_fingerprint(get_manifest(CACHE_DIR), config['url'])
+            )
+        
+        if options.http_first or options.async_per_host_limit > 0:
+            session = create_http_session(get_user_agent(driver))
+            
+        # Deferred sites are downloaded later, so there is nothing to stream into
+        streaming = options.stream_downloads and deferred is None
         start_page = determine_start_page(config['increment'])
-        links = generic_paged_scraper_by_xpath(
-            config['url'],
-            driver,
-            config['xpath'],
-            True,
-            start_page,
-            config['increment']
-        )
+        # Speculative pages and streamed downloads still need a per-host
+        # budget; without --adaptive-rate it keeps the fixed listing and job
+        # page delays, otherwise pagination and downloads share the learned one
+        page_limiter = rate_limiter
+        detail_limiter = rate_limiter
+        if rate_limiter is None and (options.parallel_pages > 1 or streaming):
+            page_limiter = create_fixed_rate_limiter(DEFAULT_SLEEP_TIME)
+            detail_limiter = create_fixed_rate_limiter(sleep_time)
+        if options.parallel_pages > 1:
+            scrape_pages = iter_speculative_jobs_by_xpath if streaming else speculative_paged_scraper_by_xpath
+            links = scrape_pages(
+                config['url'],
+                driver,
+                config['xpath'],
+                options.parallel_pages,
+                page_limiter,
+                True,
+                start_page,
+                config['increment'],
+                options.offline_xpath,
+                incremental,
+                config.get('total_count_xpath', ''),
+                checkpoint
+            )
+        else:
+            scrape_pages = iter_paged_jobs_by_xpath if streaming else generic_paged_scraper_by_xpath
+            links = scrape_pages(
+                config['url'],
+                driver,
+                config['xpath'],
+                True,
+                start_page,
+                config['increment'],
+                options.offline_xpath,
+                incremental,
+                page_limiter,
+                total_count_xpath=config.get('total_count_xpath', ''),
+                checkpoint=checkpoint
+            )
         
-        download_all_links(links, driver, site_name, sleep_time)
-        print(f"Finished scraping {config['url']}\n\n")
+        if streaming:
+            # Listing tabs stay open during speculative pagination, so
+            # browser downloads must wait for it to finish
+            new_jobs = download_streamed_links(
+                links,
+                driver,
+                site_name,
+                sleep_time,
+                session,
+                options.async_per_host_limit,
+                options.compress_cache,
+                detail_limiter,
+                options.detail_tabs,
+                interleave=options.parallel_pages == 1
+            )
+        else:
+            absolute_links = [normalize_url(driver.current_url, link) for link in links]
+            new_jobs = count_new_jobs(absolute_links)
+            if deferred is not None:
+                deferred.append(DeferredSite(config, site_name, absolute_links, incremental))
+                print(f"Found {len(absolute_links)} jobs at {config['url']}, downloading later\n\n")
+                return new_jobs
+            download_all_links(
+                links,
+                driver,
+                site_name,
+                sleep_time,
+                session,
+                options.async_per_host_limit,
+                options.compress_cache,
+                rate_limiter,
+                options.detail_tabs
+            )
+        
+        finish_site(config, incremental, checkpoint)
         
     except Exception as e:
         print(f"Error scraping {config['url']}: {e}")
-        print(f"Maybe check the xpath \n\t{config['xpath']}\n\n")
\ No newline at end of file
+        print(f"Maybe check the xpath \n\t{config['xpath']}\n\n")
+        new_jobs = None
+        
+    finally:
+        if session:
+            session.close()
+        if rate_limiter:
+            rate_limiter.save()
+            
+    return new_jobs
+
+def build_site_task(config: Dict[str, Any]) -> Task:
+    """Build the queue task that starts scraping a site from its config."""
+    # Seeding a site makes no request, so it has no host to be polite to
+    return Task(f"site:{config['url']}", TASK_SITE, '', {'config': config})
+
+def build_listing_task(config: Dict[str, Any], page: int, single_job_pages: int = 0) -> Task:
+    """
+    Build the queue task that crawls one listing page.
+    
+    Args:
+        config: Site configuration dictionary
+        page: Page number to append to the listing URL
+        single_job_pages: Consecutive single-job pages before this one
+    """
+    return Task(
+        f"listing:{config['url']}{page}",
+        TASK_LISTING_PAGE,
+        get_site_name(config['url']),
+        {'config': config, 'page': page, 'single_job_pages': single_job_pages}
+    )
+
+def build_detail_task(config: Dict[str, Any], url: str) -> Task:
+    """Build the queue task that downloads one job page found on a listing."""
+    return Task(
+        f"detail:{url}",
+        TASK_DETAIL_PAGE,
+        get_site_name(url),
+        {'name': get_site_name(config['url']), 'url': url, 'allowlist': config.get('allowlist', [])}
+    )
+
+def run_site_task(task: Task, queue: QueueBackend) -> None:
+    """Queue the first listing page of a site."""
+    config = task.payload['config']
+    queue.put([build_listing_task(config, determine_start_page(config['increment']))])
+
+def run_listing_task(task: Task, queue: QueueBackend, driver: WebDriver, options: ScrapeOptions) -> int:
+    """
+    Crawl one listing page, queueing its job pages and the following page.
+    
+    Jobs already queued by an earlier page count as old, so pagination ends
+    on a page with no new jobs or after five single-job pages in a row, as
+    in generic_paged_scraper_by_xpath. A retried task already queued its jobs
+    on the failed attempt, so it continues from the page's own job count.
+    
+    Returns:
+        Number of job pages newly queued
+    """
+    config = task.payload['config']
+    page = task.payload['page']
+    print(f"Scraping {config['url']} page {page}")
+    navigate_and_wait(driver, f"{config['url']}{page}")
+    jobs = process_jobs_page(driver, config['xpath'], config['url'], set(), options.offline_xpath)
+    
+    unique_jobs = list(dict.fromkeys(jobs))
+    new_jobs = queue.put([build_detail_task(config, job) for job in unique_jobs])
+    page_jobs = len(unique_jobs) if task.attempts > 1 else new_jobs
+    single_job_pages = task.payload.get('single_job_pages', 0) + 1 if page_jobs == 1 else 0
+    if page_jobs and not should_stop_scraping(single_job_pages):
+        queue.put([build_listing_task(config, page + config['increment'], single_job_pages)])
+    return new_jobs
+
+def run_detail_task(
+    task: Task,
+    driver: WebDriver,
+    session: Optional[requests.Session],
+    options: ScrapeOptions
+) -> None:
+    """
+    Download one job page into the cache unless a fresh copy is already there.
+    
+    Raises:
+        RuntimeError: If the fetched page is unusable, so the task is retried
+    """
+    name = task.payload['name']
+    url = task.payload['url']
+    if manage_cache_file(create_cache_filename(name, url)):
+        return
+        
+    cached = get_cache_entry(name, url)
+    mode = get_fetch_mode(get_fetch_modes_path(), name) if session else None
+    result, mode_used = fetch_detail_page_revalidated(url, driver, session, mode, cached)
+    if result.not_modified:
+        return
+    if not is_usable_page(result.content):
+        raise RuntimeError(f"Unusable page from {url}")
+    save_to_cache(name, url, result.content, options.compress_cache, result.etag, result.last_modified)
+    if session and mode is None:
+        record_fetch_mode(get_fetch_modes_path(), name, mode_used)
+    print(f"Got {url}")
+
+def run_queue_task(
+    task: Task,
+    queue: QueueBackend,
+    driver: WebDriver,
+    session: Optional[requests.Session] = None,
+    options: Optional[ScrapeOptions] = None
+) -> None:
+    """Run a leased queue task of any kind."""
+    options = options or ScrapeOptions()
+    if options.lite and task.kind != TASK_SITE:
+        config = task.payload.get('config', {})
+        apply_resource_blocking(driver, config.get('allowlist', task.payload.get('allowlist')))
+        
+    if task.kind == TASK_SITE:
+        run_site_task(task, queue)
+    elif task.kind == TASK_LISTING_PAGE:
+        run_listing_task(task, queue, driver, options)
+    elif task.kind == TASK_DETAIL_PAGE:
+        run_detail_task(task, driver, session, options)
+    else:
+        raise ValueError(f"Unknown task kind {task.kind!r}")
+
+def create_worker_id() -> str:
+    """Identify this worker across every machine sharing a queue."""
+    return f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+
+def run_queue_worker(
+    queue: QueueBackend,
+    driver: WebDriver,
+    options: Optional[ScrapeOptions] = None,
+    worker_id: Optional[str] = None,
+    politeness_delay: float = DEFAULT_POLITENESS_DELAY,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    stop_event: Optional[threading.Event] = None
+) -> int:
+    """
+    Lease and run tasks from a shared queue until it is drained.
+    
+    Failed tasks go back on the queue for a later retry, and tasks leased
+    by a worker that died become available again once the lease expires.
+    The queue spaces leases for each host by politeness_delay across every
+    worker sharing it.
+    
+    Args:
+        queue: Shared task queue
+        driver: Selenium WebDriver instance
+        options: Runtime scraping options
+        worker_id: Lease owner name, unique among the queue's workers
+        politeness_delay: Minimum seconds between tasks for one host
+        retry_delay: Seconds before a failed task's first retry, doubling after each
+        stop_event: Event that ends the loop when set
+        
+    Returns:
+        Number of tasks completed
+    """
+    options = options or ScrapeOptions()
+    worker_id = worker_id or create_worker_id()
+    stop_event = stop_event or threading.Event()
+    session = create_http_session(get_user_agent(driver)) if options.http_first else None
+    completed = 0
+    try:
+        while not stop_event.is_set():
+            task = queue.lease(worker_id, DEFAULT_LEASE_SECONDS, politeness_delay)
+            if task is None:
+                next_lease = queue.next_lease_time()
+                if next_lease is None:
+                    break
+                # Wake when the earliest host slot opens, but poll at least
+                # once per politeness delay for tasks other workers add
+                stop_event.wait(min(max(next_lease - time.time(), 0), politeness_delay))
+                continue
+                
+            try:
+                run_queue_task(task, queue, driver, session, options)
+            except Exception as e:
+                print(f"Error running {task.task_key} (attempt {task.attempts}): {e}")
+                queue.fail(task.task_id, worker_id, str(e), retry_delay=retry_delay)
+                continue
+            if queue.complete(task.task_id, worker_id):
+                completed += 1
+                
+    finally:
+        if session:
+            session.close()
+            
+    return completed
+
+def download_deferred_sites(
+    sites: List[DeferredSite],
+    driver: WebDriver,
+    sleep_time: float = 2,
+    options: Optional[ScrapeOptions] = None,
+    checkpoint: Optional[CheckpointJournal] = None
+) -> int:
+    """
+    Download the job pages of paginated sites in one interleaved pass.
+    
+    Sites are only marked finished once every download has been tried, so
+    an interrupted pass is picked up again on resume.
+    
+    Args:
+        sites: Sites collected by scrape_single_site
+        driver: Selenium WebDriver instance
+        sleep_time: Fixed delay between requests to one host, used
+            without --adaptive-rate
+        options: Runtime scraping options
+        checkpoint: Journal of the current run
+        
+    Returns:
+        Number of pages saved or revalidated
+    """
+    options = options or ScrapeOptions()
+    if not sites:
+        return 0
+    session = None
+    if options.adaptive_rate:
+        rate_limiter = AdaptiveRateLimiter(get_host_rates_path(), options.min_delay, options.max_delay)
+    else:
+        rate_limiter = create_fixed_rate_limiter(sleep_time)
+    try:
+        if options.http_first or options.async_per_host_limit > 0:
+            session = create_http_session(get_user_agent(driver))
+        site_links: Dict[str, List[str]] = {}
+        for site in sites:
+            site_links.setdefault(site.name, []).extend(site.links)
+        allowlists = {site.name: site.config.get('allowlist') for site in sites} if options.lite else None
+        
+        started = time.monotonic()
+        saved = download_links_interleaved(
+            site_links,
+            driver,
+            rate_limiter,
+            session,
+            options.compress_cache,
+            allowlists
+        )
+        print(f"Downloaded {saved} pages from {len(site_links)} sites in {time.monotonic() - started:.2f}s")
+        
+        for site in sites:
+            finish_site(site.config, site.incremental, checkpoint)
+        return saved
+        
+    finally:
+        if session:
+            session.close()
+        rate_limiter.save()
\ No newline at end of file
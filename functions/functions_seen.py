@@ -0,0 +1,209 @@
+"""
+Functions for the persistent seen-URL store.
+Remembers every job URL downloaded across runs. A memory-mapped Bloom filter
+answers most "never seen" checks without touching disk, and an exact SQLite
+index behind it confirms the rest, so millions of URLs cost only a few MB.
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+import hashlib
+import math
+import mmap
+import struct
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from .functions_manifest import connect_database, SQLITE_MAX_VARIABLES
+
+# Constants
+SEEN_DATABASE_FILENAME = 'seen.sqlite3'
+SEEN_BLOOM_FILENAME = 'seen.bloom'
+SEEN_BLOOM_CAPACITY = 4_000_000  # URLs before the false positive rate climbs
+SEEN_BLOOM_ERROR_RATE = 0.01
+BLOOM_MAGIC = b'BLM1'
+BLOOM_HEADER = struct.Struct('<4sIQ')  # magic, hash count, bit count
+SEEN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_urls (
+    url_hash TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    url TEXT NOT NULL,
+    first_seen REAL NOT NULL
+);
+"""
+
+_stores: Dict[Path, "SeenStore"] = {}
+_stores_lock = threading.Lock()
+
+def hash_url(url: str) -> str:
+    """Generate SHA256 hash of URL, matching the cache's URL hashes."""
+    return hashlib.sha256(url.encode()).hexdigest()
+
+def get_bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """
+    Size a Bloom filter for an expected number of items.
+
+    Args:
+        capacity: Expected number of items
+        error_rate: Target false positive rate at capacity
+
+    Returns:
+        Tuple of (bit_count, hash_count)
+    """
+    bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hash_count = max(1, round(bit_count / capacity * math.log(2)))
+    return bit_count, hash_count
+
+class BloomFilter:
+    """Bloom filter over URL hashes, stored in a memory-mapped file."""
+
+    def __init__(
+        self,
+        path: Path,
+        capacity: int = SEEN_BLOOM_CAPACITY,
+        error_rate: float = SEEN_BLOOM_ERROR_RATE
+    ):
+        """
+        Open a Bloom filter file, creating it if needed.
+
+        An existing file keeps the size it was created with.
+
+        Args:
+            path: Filter file path
+            capacity: Expected number of URLs, used when creating the file
+            error_rate: Target false positive rate, used when creating the file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            bit_count, hash_count = get_bloom_parameters(capacity, error_rate)
+            with open(path, 'wb') as file:
+                file.write(BLOOM_HEADER.pack(BLOOM_MAGIC, hash_count, bit_count))
+                file.truncate(BLOOM_HEADER.size + (bit_count + 7) // 8)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.hash_count, self.bit_count = BLOOM_HEADER.unpack_from(self._map)
+        if magic != BLOOM_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+        self._lock = threading.Lock()
+
+    def _bit_positions(self, url_hash: str) -> Iterable[int]:
+        """Derive the filter bits of a URL hash by double hashing."""
+        first = int(url_hash[:16], 16)
+        second = int(url_hash[16:32], 16) | 1
+        return ((first + index * second) % self.bit_count for index in range(self.hash_count))
+
+    def add(self, url_hash: str) -> None:
+        """Set the bits of a URL hash."""
+        with self._lock:
+            for position in self._bit_positions(url_hash):
+                offset = BLOOM_HEADER.size + position // 8
+                self._map[offset] |= 1 << (position % 8)
+
+    def might_contain(self, url_hash: str) -> bool:
+        """Check a URL hash; False means definitely never added."""
+        return all(
+            self._map[BLOOM_HEADER.size + position // 8] & (1 << (position % 8))
+            for position in self._bit_positions(url_hash)
+        )
+
+    def close(self) -> None:
+        """Flush the filter to disk and release the mapping."""
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
+
+class SeenStore:
+    """Persistent record of downloaded job URLs with a Bloom filter in front."""
+
+    def __init__(self, directory: Path):
+        """
+        Open the seen-URL store in a directory.
+
+        Args:
+            directory: Directory holding the filter and index files
+        """
+        self.connection = connect_database(directory / SEEN_DATABASE_FILENAME, SEEN_SCHEMA)
+        self.bloom = BloomFilter(directory / SEEN_BLOOM_FILENAME)
+        self._lock = threading.Lock()
+
+    def find_seen(self, urls: List[str]) -> Set[str]:
+        """
+        Return the subset of URLs that have been seen before.
+
+        URLs the Bloom filter rules out are never looked up on disk; the
+        remaining candidates are confirmed in bulk against the exact index.
+        """
+        candidates = {}
+        for url in urls:
+            url_hash = hash_url(url)
+            if self.bloom.might_contain(url_hash):
+                candidates[url_hash] = url
+        if not candidates:
+            return set()
+
+        hashes = list(candidates)
+        seen = set()
+        with self._lock:
+            for start in range(0, len(hashes), SQLITE_MAX_VARIABLES):
+                chunk = hashes[start:start + SQLITE_MAX_VARIABLES]
+                placeholders = ", ".join("?" * len(chunk))
+                seen.update(candidates[row[0]] for row in self.connection.execute(
+                    f"SELECT url_hash FROM seen_urls WHERE url_hash IN ({placeholders})",
+                    chunk
+                ))
+        return seen
+
+    def filter_unseen(self, urls: List[str]) -> List[str]:
+        """Return the URLs never seen before, preserving their order."""
+        seen = self.find_seen(urls)
+        return [url for url in urls if url not in seen]
+
+    def add_many(self, urls: Iterable[str], site: str = '') -> None:
+        """Record URLs as seen."""
+        now = datetime.now().timestamp()
+        rows = [(hash_url(url), site, url, now) for url in urls]
+        # Set filter bits first so a crash can only ever cause false positives
+        for url_hash, _, _, _ in rows:
+            self.bloom.add(url_hash)
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO seen_urls (url_hash, site, url, first_seen) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def add(self, url: str, site: str = '') -> None:
+        """Record a single URL as seen."""
+        self.add_many([url], site)
+
+    def is_empty(self) -> bool:
+        """Check whether no URL has been recorded yet."""
+        with self._lock:
+            return self.connection.execute("SELECT 1 FROM seen_urls LIMIT 1").fetchone() is None
+
+    def close(self) -> None:
+        """Close the index and the filter."""
+        self.connection.close()
+        self.bloom.close()
+
+def get_seen_store(directory: Path) -> SeenStore:
+    """Get the seen-URL store for a directory, opening it on first use."""
+    path = directory.resolve()
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SeenStore(path)
+        return _stores[path]
+
+def close_seen_stores() -> None:
+    """Close every open seen-URL store."""
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
\ No newline at end of file
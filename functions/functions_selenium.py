@@ -2,21 +2,35 @@
 Utility functions for Selenium browser automation and web interaction.
 Module provides browser setup, navigation, and page interaction functions.
 """
-from typing import Tuple, List, Optional
+from typing import Any, Callable, Deque, Dict, Tuple, List, Optional
+import json
+import os
+import queue
 import random
+import threading
 import time
-from dataclasses import dataclass
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
 from contextlib import contextmanager
+from functools import lru_cache
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from urllib3.exceptions import MaxRetryError
 from selenium_stealth import stealth
 from fake_useragent import UserAgent
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # Type aliases
 Driver = webdriver.Chrome
 LogEntry = dict
@@ -32,7 +46,141 @@ SCREEN_SIZES: List[str] = [
     "3840x2160"
 ]
 DEFAULT_TIMEOUT: float = 10.0
-DEFAULT_SLEEP: float = 0.25
+DEFAULT_SLEEP: float = 0.05  # Readiness polling interval
+DEFAULT_QUIET_WINDOW: float = 0.3  # Network and DOM must be quiet this long
+LONG_REQUEST_GRACE: float = 2.0  # Sub-resource requests older than this are treated as long-polls
+STALE_DOCUMENT_GRACE: float = 1.0  # After this, an unreplaced document is a same-document navigation
+DRIVER_LAUNCH_TIMEOUT: float = 60.0  # Longest wait for a warming browser before launching one directly
+CHROMEDRIVER_PATH_ENV = 'CHROMEDRIVER_PATH'
+DEFAULT_MAX_NAVIGATIONS: int = 500  # Navigations before a browser is replaced
+RSS_CHECK_INTERVAL: int = 10  # Navigations between browser memory checks
+# WebDriver errors meaning the browser or its session is gone
+BROWSER_CRASH_MESSAGES: List[str] = [
+    "chrome not reachable",
+    "disconnected",
+    "invalid session id",
+    "no such session",
+    "session deleted",
+    "tab crashed"
+]
+# Browser session setup that is replayed on a replacement browser
+REPLAYED_CDP_COMMANDS = {'Network.enable', 'Network.setBlockedURLs'}
+
+# Resource blocking for the scrape-lite profile: file extensions by category,
+# matched at the end of the URL path so hosts like careers.movado.com pass
+BLOCKED_RESOURCE_EXTENSIONS: Dict[str, List[str]] = {
+    'images': ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"],
+    'fonts': ["woff", "woff2", "ttf", "otf", "eot"],
+    'media': ["mp4", "webm", "ogg", "mp3", "m4a", "mov", "m3u8"],
+}
+# Analytics hosts blocked as the 'trackers' category, with their subdomains
+BLOCKED_TRACKER_HOSTS: List[str] = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "segment.io",
+    "cdn.segment.com",
+    "mixpanel.com",
+    "fullstory.com",
+    "nr-data.net",
+    "js-agent.newrelic.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "snap.licdn.com",
+]
+
+# Installed on every new document to record the time of the last DOM mutation
+# and, for tabs, which share one performance log, the page's own fetch/XHR traffic
+MUTATION_TRACKER_SCRIPT = """
+(function () {
+    if (window.__scrythe_tracking) {
+        return;
+    }
+    window.__scrythe_tracking = true;
+    window.__scrythe_last_mutation = performance.now();
+    window.__scrythe_last_request = performance.now();
+    window.__scrythe_pending = 0;
+    new MutationObserver(function () {
+        window.__scrythe_last_mutation = performance.now();
+    }).observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    function started() {
+        window.__scrythe_pending++;
+        window.__scrythe_last_request = performance.now();
+    }
+    function finished() {
+        window.__scrythe_pending = Math.max(0, window.__scrythe_pending - 1);
+        window.__scrythe_last_request = performance.now();
+    }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return fetch.apply(this, arguments).finally(finished);
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        started();
+        this.addEventListener('loadend', finished);
+        return send.apply(this, arguments);
+    };
+})();
+"""
+DOCUMENT_STATE_SCRIPT = """
+var last = window.__scrythe_last_mutation;
+return [
+    document.readyState,
+    window.__scrythe_stale === true,
+    typeof last === 'number' ? (performance.now() - last) / 1000 : null
+];
+"""
+TAB_STATE_SCRIPT = """
+var last = window.__scrythe_last_mutation;
+var lastRequest = window.__scrythe_last_request;
+return [
+    document.readyState,
+    window.__scrythe_stale === true,
+    typeof last === 'number' ? (performance.now() - last) / 1000 : null,
+    window.__scrythe_pending || 0,
+    typeof lastRequest === 'number' ? (performance.now() - lastRequest) / 1000 : null
+];
+"""
+
+# Evaluates an XPath in the page and returns every resolved href in one round trip
+EXTRACT_HREFS_SCRIPT = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var hrefs = [];
+for (var i = 0; i < result.snapshotLength; i++) {
+    var node = result.snapshotItem(i);
+    var href = null;
+    if (node.nodeType === Node.ATTRIBUTE_NODE) {
+        href = node.value ? new URL(node.value, document.baseURI).href : null;
+    } else if (typeof node.href === 'string') {
+        href = node.href;
+    } else if (node.getAttribute) {
+        href = node.getAttribute('href');
+    }
+    if (href) {
+        hrefs.push(href);
+    }
+}
+return hrefs;
+"""
+
+# URL patterns blocked on each driver's first tab, replayed on tabs opened later
+_blocked_url_patterns: "weakref.WeakKeyDictionary[Any, List[str]]" = weakref.WeakKeyDictionary()
+
+@dataclass
+class NetworkState:
+    """In-flight request tracking built from CDP Network events."""
+    inflight: Dict[str, Tuple[float, bool]] = field(default_factory=dict)
+    started: float = field(default_factory=time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
 
 @dataclass
 class BrowserConfig:
@@ -40,14 +188,40 @@ class BrowserConfig:
     user_agent: str
     screen_size: str
     debug: bool = False
+    lite: bool = False
+
+_chromedriver_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def get_user_agent_source() -> UserAgent:
+    """Load the user agent list once per process."""
+    return UserAgent()
 
-def create_browser_config(debug: bool = False) -> BrowserConfig:
+def get_chromedriver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process.
+    
+    A binary named by the CHROMEDRIVER_PATH environment variable is used
+    as is; otherwise ChromeDriverManager's network and version checks run
+    on the first call only and later browsers reuse the path it returned.
+    """
+    with _chromedriver_lock:
+        return _resolve_chromedriver_path()
+
+@lru_cache(maxsize=1)
+def _resolve_chromedriver_path() -> str:
+    configured_path = os.environ.get(CHROMEDRIVER_PATH_ENV)
+    if configured_path and os.path.isfile(configured_path):
+        return configured_path
+    return ChromeDriverManager().install()
+
+def create_browser_config(debug: bool = False, lite: bool = False) -> BrowserConfig:
     """Create browser configuration with random user agent and screen size."""
-    ua = UserAgent()
     return BrowserConfig(
-        user_agent=ua.random,
+        user_agent=get_user_agent_source().random,
         screen_size=random.choice(SCREEN_SIZES),
-        debug=debug
+        debug=debug,
+        lite=lite
     )
 
 def setup_chrome_options(config: BrowserConfig) -> Options:
@@ -57,10 +231,15 @@ def setup_chrome_options(config: BrowserConfig) -> Options:
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument(f"--window-size={config.screen_size}")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
     options.page_load_strategy = 'none'
     
     if not config.debug:
         options.add_argument("--headless")
+        
+    if config.lite:
+        options.add_argument("--mute-audio")
+        options.add_argument("--autoplay-policy=user-gesture-required")
     
     return options
 
@@ -82,55 +261,528 @@ def configure_stealth_settings(driver: Driver) -> None:
         fix_hairline=True
     )
 
-def init_selenium(debug: bool = False) -> Driver:
-    """Initialize and configure Selenium WebDriver with stealth settings."""
-    config = create_browser_config(debug)
+def get_blocked_url_patterns(allowlist: Optional[List[str]] = None) -> List[str]:
+    """
+    Build the list of URL patterns blocked by the scrape-lite profile.
+    
+    Args:
+        allowlist: Entries to exempt from blocking. An entry is either a category
+            name ('images', 'fonts', 'media', 'trackers'), a tracker host such
+            as 'googletagmanager.com' or an extension such as '.svg', and must
+            match exactly
+            
+    Returns:
+        URL patterns suitable for Network.setBlockedURLs
+    """
+    allowed = {entry.strip().lower().lstrip('*.') for entry in allowlist or [] if entry.strip()}
+    patterns = []
+    for category, extensions in BLOCKED_RESOURCE_EXTENSIONS.items():
+        if category in allowed:
+            continue
+        for extension in extensions:
+            if extension not in allowed:
+                patterns.extend([f"*://*/*.{extension}", f"*://*/*.{extension}?*"])
+    if 'trackers' not in allowed:
+        for host in BLOCKED_TRACKER_HOSTS:
+            if host not in allowed:
+                patterns.extend([f"*://{host}/*", f"*://*.{host}/*"])
+    return patterns
+
+def set_blocked_urls(driver: Driver, patterns: List[str]) -> None:
+    """Block URL patterns in the current tab."""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+def apply_resource_blocking(driver: Driver, allowlist: Optional[List[str]] = None) -> None:
+    """
+    Block images, fonts, media and trackers in the browser, honouring an allowlist.
+    
+    The patterns are remembered so tabs opened later with open_tabs get the
+    same blocking.
+    """
+    patterns = get_blocked_url_patterns(allowlist)
+    try:
+        set_blocked_urls(driver, patterns)
+        _blocked_url_patterns[driver] = patterns
+    except Exception as e:
+        print(f"Could not apply resource blocking: {str(e)}")
+
+def get_applied_blocking(driver: Driver) -> Optional[List[str]]:
+    """Get the URL patterns last blocked with apply_resource_blocking, if any."""
+    return _blocked_url_patterns.get(driver)
+
+def reset_browser_state(driver: Driver) -> None:
+    """Close every tab but the first and lift resource blocking, as after launch."""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    if get_applied_blocking(driver) is not None:
+        set_blocked_urls(driver, [])
+        del _blocked_url_patterns[driver]
+
+def init_selenium(debug: bool = False, lite: bool = False) -> Driver:
+    """
+    Initialize and configure Selenium WebDriver with stealth settings.
+    
+    With lite enabled the browser uses the scrape-lite profile, which blocks
+    images, fonts, media and known analytics hosts.
+    """
+    config = create_browser_config(debug, lite)
     options = setup_chrome_options(config)
     capabilities = setup_chrome_capabilities()
     
     options.set_capability('goog:loggingPrefs', capabilities['goog:loggingPrefs'])
     
     driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
+        service=Service(get_chromedriver_path()),
         options=options
     )
     
     configure_stealth_settings(driver)
+    install_mutation_tracker(driver)
+    if lite:
+        apply_resource_blocking(driver)
     return driver
 
-def analyze_network_activity(
-    driver: Driver,
-    previous_log_length: Optional[int]
-) -> Tuple[bool, int]:
-    """Analyze network activity to determine if page loading is complete."""
-    logs = driver.get_log('performance')
-    current_log_length = len(logs)
+class DriverPool:
+    """
+    Browsers launched ahead of time for workers to check out and return.
+    
+    Launches run in background threads, so browser startup overlaps with
+    other work and a worker taking a warm driver can start scraping at once.
+    """
     
-    if previous_log_length is None:
-        return False, current_log_length
+    def __init__(self, factory: Callable[[], Driver], size: int):
+        """
+        Create an empty pool.
+        
+        Args:
+            factory: Callable launching a new, fully configured driver
+            size: Number of drivers to keep warm
+        """
+        self.factory = factory
+        self.size = size
+        self._ready: "queue.Queue[Optional[Driver]]" = queue.Queue()
+        self._drivers: List[Driver] = []
+        self._launching = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        
+    def __enter__(self) -> "DriverPool":
+        self.warm()
+        return self
+        
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        
+    def _launch(self) -> None:
+        """Launch one driver and make it available."""
+        try:
+            driver = self.factory()
+        except Exception as e:
+            print(f"Could not launch browser: {str(e)}")
+            driver = None
+            
+        with self._lock:
+            self._launching -= 1
+            if driver is not None and self._closed:
+                driver.quit()
+                return
+            if driver is not None:
+                self._drivers.append(driver)
+        # A failed launch still wakes a waiting worker, which then launches directly
+        self._ready.put(driver)
+        
+    def warm(self) -> None:
+        """Start launching drivers in the background until the pool is full."""
+        with self._lock:
+            missing = self.size - len(self._drivers) - self._launching
+            self._launching += max(missing, 0)
+        for _ in range(missing):
+            threading.Thread(target=self._launch, name='driver-launch', daemon=True).start()
+            
+    def acquire(self, timeout: float = DRIVER_LAUNCH_TIMEOUT) -> Driver:
+        """
+        Check out a driver, waiting for one that is warming if necessary.
+        
+        Args:
+            timeout: Longest wait for a warming driver
+            
+        Returns:
+            A ready driver; launched directly if none became available
+        """
+        with self._lock:
+            expecting = self._launching > 0 or not self._ready.empty()
+        if expecting:
+            try:
+                driver = self._ready.get(timeout=timeout)
+                if driver is not None:
+                    return driver
+            except queue.Empty:
+                pass
+                
+        driver = self.factory()
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+        
+    def release(self, driver: Driver) -> None:
+        """
+        Return a checked-out driver to the pool.
+        
+        The driver is reset first so the next worker does not inherit the
+        last site's tabs or resource blocking; one that cannot be reset is
+        discarded instead.
+        """
+        with self._lock:
+            closed = self._closed
+        if closed:
+            self.discard(driver)
+            return
+        try:
+            reset_browser_state(driver)
+        except Exception as e:
+            print(f"Could not reset browser, replacing it: {str(e)}")
+            self.discard(driver)
+            return
+        self._ready.put(driver)
+            
+    def discard(self, driver: Driver) -> None:
+        """Quit a driver that should not be reused and warm a replacement."""
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            closed = self._closed
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error quitting browser: {str(e)}")
+        if not closed:
+            self.warm()
+            
+    def close(self) -> None:
+        """Quit every driver the pool launched."""
+        with self._lock:
+            self._closed = True
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Error quitting browser: {str(e)}")
+
+def is_browser_crash(error: Exception) -> bool:
+    """Check whether an error means the browser has died, rather than a page-level failure."""
+    if isinstance(error, (InvalidSessionIdException, MaxRetryError, ConnectionError)):
+        return True
+    message = str(error).lower()
+    return isinstance(error, WebDriverException) and any(text in message for text in BROWSER_CRASH_MESSAGES)
+
+def get_process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Resident memory of a process and all its descendants, in bytes.
+    
+    Uses psutil when installed and falls back to /proc on Linux.
+    
+    Returns:
+        Total RSS in bytes, or None if it cannot be measured
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            return sum(process.memory_info().rss for process in [root] + root.children(recursive=True))
+        except psutil.Error:
+            return None
+            
+    if not os.path.isdir('/proc'):
+        return None
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as file:
+                # The command name may contain spaces, so split after its closing parenthesis
+                parent = int(file.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+        
+    total = 0
+    pending = [pid]
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/statm') as file:
+                total += int(file.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            if current == pid:
+                return None
+        pending.extend(children.get(current, []))
+    return total
+
+def get_browser_rss(driver: Driver) -> Optional[int]:
+    """Resident memory of a driver's chromedriver and browser processes, in bytes."""
+    try:
+        return get_process_tree_rss(driver.service.process.pid)
+    except AttributeError:
+        return None
+
+class CurrentDriverSwitchTo:
+    """driver.switch_to of a ManagedDriver, always reaching its current browser."""
+    
+    def __init__(self, managed: "ManagedDriver"):
+        self.managed = managed
+        
+    def __getattr__(self, name: str) -> Any:
+        value = self.managed._call(lambda: getattr(self.managed.driver.switch_to, name))
+        if not callable(value):
+            return value
+            
+        def call_current_driver(*args, **kwargs):
+            return self.managed._call(lambda: getattr(self.managed.driver.switch_to, name)(*args, **kwargs))
+        return call_current_driver
+
+class ManagedDriver:
+    """
+    WebDriver proxy that replaces its browser when it ages, bloats or dies.
+    
+    The browser is recycled before a navigation once it has made
+    max_navigations navigations or its processes use more than max_rss_mb.
+    Pages started in extra tabs with start_navigation count as navigations
+    too. If the browser crashes mid-call it is relaunched, the last page is
+    reloaded and the call is retried once, so the site in progress carries
+    on. Every other attribute is passed through to the current driver.
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], Driver],
+        max_navigations: int = DEFAULT_MAX_NAVIGATIONS,
+        max_rss_mb: Optional[float] = None
+    ):
+        """
+        Launch the first browser.
+        
+        Args:
+            factory: Callable launching a new, fully configured driver
+            max_navigations: Navigations before recycling, or 0 for no limit
+            max_rss_mb: Browser memory in MB before recycling, or None for no limit
+        """
+        self.factory = factory
+        self.max_navigations = max_navigations
+        self.max_rss_mb = max_rss_mb
+        self.navigations = 0
+        self.recycles = 0
+        self.last_url: Optional[str] = None
+        self._cdp_state: Dict[str, Dict] = {}
+        self.driver = factory()
+        
+    def __getattr__(self, name: str) -> Any:
+        if name == 'driver':
+            # Not launched yet; avoid recursing through __getattr__
+            raise AttributeError(name)
+        value = self._call(lambda: getattr(self.driver, name))
+        if not callable(value):
+            return value
+            
+        def call_current_driver(*args, **kwargs):
+            return self._call(lambda: getattr(self.driver, name)(*args, **kwargs))
+        return call_current_driver
+        
+    @property
+    def switch_to(self) -> CurrentDriverSwitchTo:
+        """Switch windows or frames in whichever browser is current when called."""
+        return CurrentDriverSwitchTo(self)
+        
+    def _call(self, operation: Callable[[], Any], resume: bool = True) -> Any:
+        """Run a driver operation, relaunching the browser and retrying once if it crashed."""
+        try:
+            return operation()
+        except Exception as e:
+            if not is_browser_crash(e):
+                raise
+            print(f"Browser crashed, restarting: {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+            self.restart(resume)
+            return operation()
+            
+    def restart(self, resume: bool = False) -> None:
+        """
+        Replace the browser with a freshly launched one.
+        
+        Args:
+            resume: Reload the last visited page in the new browser
+        """
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = self.factory()
+        for command, command_args in self._cdp_state.items():
+            self.driver.execute_cdp_cmd(command, command_args)
+        self.navigations = 0
+        self.recycles += 1
+        if resume and self.last_url:
+            navigate_and_wait(self.driver, self.last_url)
+            
+    def needs_recycle(self) -> bool:
+        """Check the navigation count and, periodically, browser memory against the limits."""
+        if self.max_navigations and self.navigations >= self.max_navigations:
+            return True
+        if self.max_rss_mb and self.navigations and self.navigations % RSS_CHECK_INTERVAL == 0:
+            rss = get_browser_rss(self.driver)
+            return rss is not None and rss > self.max_rss_mb * 1e6
+        return False
+        
+    def get(self, url: str) -> None:
+        """Navigate to a URL, recycling the browser first if it is due."""
+        if self.needs_recycle():
+            print(f"Recycling browser after {self.navigations} navigations")
+            self.restart()
+        self._call(lambda: self.driver.get(url), resume=False)
+        self.record_navigation(url)
         
-    activity_threshold = previous_log_length * 1.1
-    is_loaded = not current_log_length > activity_threshold
+    def record_navigation(self, url: str) -> None:
+        """Count a navigation made without get(), such as one started in a tab."""
+        self.last_url = url
+        self.navigations += 1
+        
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Dict) -> Any:
+        """Run a CDP command, remembering session setup to replay after a restart."""
+        result = self._call(lambda: self.driver.execute_cdp_cmd(cmd, cmd_args))
+        if cmd in REPLAYED_CDP_COMMANDS:
+            self._cdp_state[cmd] = cmd_args
+        return result
+        
+    def quit(self) -> None:
+        """Quit the current browser."""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error quitting browser: {str(e)}")
+
+def install_mutation_tracker(driver: Driver) -> None:
+    """Install the DOM mutation tracker on every document the browser loads."""
+    try:
+        driver.execute_cdp_cmd(
+            'Page.addScriptToEvaluateOnNewDocument',
+            {'source': MUTATION_TRACKER_SCRIPT}
+        )
+    except Exception as e:
+        print(f"Could not install mutation tracker: {str(e)}")
+
+def update_network_state(state: NetworkState, entries: List[LogEntry]) -> NetworkState:
+    """Apply CDP Network events from performance log entries to the network state."""
+    now = time.monotonic()
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+            
+        method = message.get('method', '')
+        params = message.get('params', {})
+        request_id = params.get('requestId')
+        if not method.startswith('Network.') or request_id is None:
+            continue
+            
+        if method == 'Network.requestWillBeSent':
+            state.inflight[request_id] = (now, params.get('type') == 'Document')
+        elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+            state.inflight.pop(request_id, None)
+        state.last_activity = now
+        
+    return state
+
+def count_active_requests(
+    state: NetworkState,
+    now: float,
+    long_request_grace: float = LONG_REQUEST_GRACE
+) -> int:
+    """Count in-flight requests, ignoring long-running sub-resource requests."""
+    return sum(
+        1 for started, is_document in state.inflight.values()
+        if is_document or now - started < long_request_grace
+    )
+
+def get_document_state(driver: Driver) -> Tuple[str, bool, Optional[float]]:
+    """
+    Read the document readiness state from the page.
     
-    return is_loaded, current_log_length
+    Returns:
+        Tuple of (ready_state, is_stale_document, seconds_since_last_mutation)
+    """
+    try:
+        state = driver.execute_script(DOCUMENT_STATE_SCRIPT)
+        if isinstance(state, list) and len(state) == 3:
+            return state[0], bool(state[1]), state[2]
+    except Exception:
+        pass
+    return 'complete', False, None
+
+def is_page_idle(
+    network: NetworkState,
+    document: Tuple[str, bool, Optional[float]],
+    quiet_window: float = DEFAULT_QUIET_WINDOW
+) -> bool:
+    """Combine network, readyState and DOM mutation signals into a readiness verdict."""
+    now = time.monotonic()
+    ready_state, is_stale, mutation_quiet = document
+    
+    if ready_state != 'complete':
+        return False
+    if is_stale and now - network.started < STALE_DOCUMENT_GRACE:
+        return False
+    if count_active_requests(network, now) > 0:
+        return False
+    if now - network.last_activity < quiet_window:
+        return False
+    return mutation_quiet is None or mutation_quiet >= quiet_window
+
+def mark_document_stale(driver: Driver) -> None:
+    """Flag the current document so readiness checks ignore it after navigation starts."""
+    try:
+        driver.execute_script("window.__scrythe_stale = true;")
+    except Exception:
+        pass
+
+def drain_performance_log(driver: Driver) -> List[LogEntry]:
+    """Read and discard pending performance log entries."""
+    try:
+        entries = driver.get_log('performance')
+        return entries if isinstance(entries, list) else []
+    except Exception:
+        return []
 
 @contextmanager
-def wait_for_page_load(driver: Driver, timeout: float = DEFAULT_TIMEOUT, sleep: float = DEFAULT_SLEEP):
-    """Context manager to wait for page load completion."""
-    previous_log_length = None
+def wait_for_page_load(
+    driver: Driver,
+    timeout: float = DEFAULT_TIMEOUT,
+    sleep: float = DEFAULT_SLEEP,
+    quiet_window: float = DEFAULT_QUIET_WINDOW
+):
+    """
+    Context manager to wait for page load completion.
+    
+    Counts in-flight requests from CDP Network events and returns as soon as
+    the network is idle, the document is complete and the DOM has stopped
+    changing for the quiet window.
+    """
+    drain_performance_log(driver)
+    mark_document_stale(driver)
+    network = NetworkState()
     end_time = time.time() + timeout
     
     yield
     
     while time.time() < end_time:
-        is_loaded, log_length = analyze_network_activity(driver, previous_log_length)
-        if is_loaded:
+        update_network_state(network, drain_performance_log(driver))
+        if is_page_idle(network, get_document_state(driver), quiet_window):
             break
-        previous_log_length = log_length
         time.sleep(sleep)
-    
-    # Additional buffer time for final rendering
-    time.sleep(sleep * 1.5)
 
 def navigate_and_wait(
     driver: Driver,
@@ -143,20 +795,232 @@ def navigate_and_wait(
         driver.get(url)
     return driver
 
+def open_tabs(driver: Driver, count: int) -> List[str]:
+    """
+    Open extra browser tabs.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        count: Number of tabs to open
+        
+    Returns:
+        Window handles of the new tabs
+    """
+    handles = []
+    for _ in range(count):
+        driver.switch_to.new_window('tab')
+        handles.append(driver.current_window_handle)
+        prepare_tab(driver)
+    return handles
+
+def prepare_tab(driver: Driver) -> None:
+    """
+    Give the current tab the session setup the first tab got at launch.
+    
+    CDP commands act on the current tab only, so the readiness tracker and
+    scrape-lite blocking set up on the browser's first tab do not reach
+    tabs opened later.
+    """
+    install_mutation_tracker(driver)
+    patterns = get_applied_blocking(driver)
+    if patterns is not None:
+        try:
+            set_blocked_urls(driver, patterns)
+        except Exception as e:
+            print(f"Could not apply resource blocking to tab: {str(e)}")
+
+def start_navigation(driver: Driver, handle: str, url: str) -> None:
+    """Switch to a tab and start loading a URL in it without waiting for the load."""
+    driver.switch_to.window(handle)
+    driver.execute_script("window.__scrythe_stale = true; window.location.href = arguments[0];", url)
+    if isinstance(driver, ManagedDriver):
+        driver.record_navigation(url)
+
+def is_tab_ready(driver: Driver, quiet_window: float = DEFAULT_QUIET_WINDOW) -> bool:
+    """
+    Check whether the current tab's new document has loaded and settled.
+    
+    Network events in the performance log are shared by every tab of a
+    driver, so tabs are judged by the page's own tracker instead: the
+    document must be complete, with no DOM mutations and no fetch/XHR
+    activity for the quiet window. A document without the tracker is
+    never ready; the tracker is injected and judged on a later check.
+    """
+    try:
+        ready_state, is_stale, mutation_quiet, pending, network_quiet = driver.execute_script(TAB_STATE_SCRIPT)
+    except Exception:
+        # The document is being replaced mid-navigation
+        return False
+    if ready_state != 'complete' or is_stale:
+        return False
+    if mutation_quiet is None or network_quiet is None:
+        try:
+            driver.execute_script(MUTATION_TRACKER_SCRIPT)
+        except Exception:
+            pass
+        return False
+    # Requests open longer than the grace period are treated as long-polls
+    network_idle = not pending or network_quiet >= LONG_REQUEST_GRACE
+    return network_idle and mutation_quiet >= quiet_window and network_quiet >= quiet_window
+
+def wait_for_tab_ready(
+    driver: Driver,
+    handle: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    sleep: float = DEFAULT_SLEEP,
+    quiet_window: float = DEFAULT_QUIET_WINDOW
+) -> None:
+    """Switch to a tab and wait until its new document has loaded and settled."""
+    driver.switch_to.window(handle)
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        if is_tab_ready(driver, quiet_window):
+            return
+        time.sleep(sleep)
+
+def close_tabs(driver: Driver, handles: List[str], return_handle: str) -> None:
+    """Close tabs opened with open_tabs and switch back to the original window."""
+    for handle in handles:
+        try:
+            driver.switch_to.window(handle)
+            driver.close()
+        except Exception as e:
+            print(f"Error closing tab: {str(e)}")
+    driver.switch_to.window(return_handle)
+
+@dataclass
+class TabTask:
+    """A page loading in one tab of a TabPool."""
+    url: str
+    handle: str
+    started: float = field(default_factory=time.monotonic)
+
+class TabPool:
+    """
+    Several tabs of one browser loading pages side by side.
+    
+    Navigations are started in every idle tab and harvested as they finish,
+    so one Chrome process serves several concurrent page loads instead of
+    one browser per worker. After a task is returned by wait_for or
+    next_ready the driver is switched to its tab; read the page, then
+    release the task to make the tab available again.
+    """
+    
+    def __init__(
+        self,
+        driver: Driver,
+        size: int,
+        timeout: float = DEFAULT_TIMEOUT,
+        sleep: float = DEFAULT_SLEEP,
+        quiet_window: float = DEFAULT_QUIET_WINDOW
+    ):
+        """
+        Open the pool's tabs.
+        
+        Args:
+            driver: Selenium WebDriver instance
+            size: Number of tabs to open
+            timeout: Seconds after which a loading page is harvested as it is
+            sleep: Readiness polling interval
+            quiet_window: DOM must be quiet this long
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.sleep = sleep
+        self.quiet_window = quiet_window
+        self.return_handle = driver.current_window_handle
+        self.handles = open_tabs(driver, size)
+        self.idle: Deque[str] = deque(self.handles)
+        self.loading: List[TabTask] = []
+        
+    def __enter__(self) -> "TabPool":
+        return self
+        
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        
+    @property
+    def has_idle_tab(self) -> bool:
+        """Whether a navigation can be started right now."""
+        return bool(self.idle)
+        
+    def submit(self, url: str) -> TabTask:
+        """Start loading a URL in an idle tab without waiting for it."""
+        if not self.idle:
+            raise RuntimeError("No idle tab to load the page in")
+        task = TabTask(url, self.idle.popleft())
+        start_navigation(self.driver, task.handle, url)
+        self.loading.append(task)
+        return task
+        
+    def wait_for(self, task: TabTask) -> TabTask:
+        """Wait for a specific page to finish loading and switch to its tab."""
+        remaining = self.timeout - (time.monotonic() - task.started)
+        wait_for_tab_ready(self.driver, task.handle, max(remaining, 0), self.sleep, self.quiet_window)
+        self.loading.remove(task)
+        return task
+        
+    def next_ready(self) -> Optional[TabTask]:
+        """
+        Wait for whichever loading page finishes first and switch to its tab.
+        
+        Returns:
+            The finished task, or None if nothing is loading
+        """
+        while self.loading:
+            for task in list(self.loading):
+                self.driver.switch_to.window(task.handle)
+                timed_out = time.monotonic() - task.started >= self.timeout
+                if timed_out or is_tab_ready(self.driver, self.quiet_window):
+                    self.loading.remove(task)
+                    return task
+            time.sleep(self.sleep)
+        return None
+        
+    def release(self, task: TabTask) -> None:
+        """Return a harvested task's tab to the pool."""
+        self.idle.append(task.handle)
+        
+    def close(self) -> None:
+        """Close the pool's tabs and switch back to the original window."""
+        close_tabs(self.driver, self.handles, self.return_handle)
+        self.handles = []
+        self.idle.clear()
+        self.loading = []
+
 def get_page_html(driver: Driver) -> str:
     """Retrieve HTML content of current page with error handling."""
     try:
-        time.sleep(DEFAULT_SLEEP)
         return driver.page_source or ""
     except Exception as e:
         print(f"Error retrieving page HTML: {str(e)}")
         return ""
 
+def get_user_agent(driver: Driver) -> Optional[str]:
+    """Get the user agent string the browser is presenting, if available."""
+    try:
+        user_agent = driver.execute_script("return navigator.userAgent;")
+        return user_agent if isinstance(user_agent, str) else None
+    except Exception:
+        return None
+
 def extract_links_by_xpath(driver: Driver, xpath: str) -> List[str]:
-    """Extract href attributes from elements matching XPath pattern."""
-    elements = driver.find_elements(By.XPATH, xpath)
-    return [
-        element.get_attribute('href')
-        for element in elements
-        if element.get_attribute('href')
-    ]
\ No newline at end of file
+    """
+    Extract href attributes from elements matching XPath pattern.
+    
+    The XPath is evaluated inside the page so all hrefs come back in a single
+    WebDriver round trip. Falls back to per-element lookups if the script fails.
+    """
+    try:
+        hrefs = driver.execute_script(EXTRACT_HREFS_SCRIPT, xpath)
+        if isinstance(hrefs, list):
+            return [href for href in hrefs if isinstance(href, str) and href]
+    except Exception as e:
+        print(f"Bulk link extraction failed, falling back to element lookups: {str(e)}")
+        
+    links = []
+    for element in driver.find_elements(By.XPATH, xpath):
+        href = element.get_attribute('href')
+        if href:
+            links.append(href)
+    return links
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Maintenance commands for the scraper cache.
+Provides command line entry points for rebuilding the cache manifest,
+migrating the cache to the sharded directory layout, reporting usage and
+garbage collecting expired or oversized caches.
+"""
+from typing import List, Optional
+import argparse
+import sys
+import time
+from datetime import timedelta
+
+from functions import functions_scraper
+from functions.functions_gc import collect_garbage, format_gc_report
+from functions.functions_manifest import rebuild_manifest, get_manifest, summarize_manifest
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list to parse (defaults to no arguments)
+
+    Returns:
+        Parsed arguments namespace
+    """
+    parser = argparse.ArgumentParser(description="Maintain the scraper cache.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('rebuild', help='Rebuild the cache manifest by rescanning the cache directory')
+    subparsers.add_parser('migrate', help='Move flat cache files into the sharded layout (resumable)')
+    subparsers.add_parser('stats', help='Report cache entries and disk usage')
+    gc_parser = subparsers.add_parser('gc', help='Remove expired entries and enforce a size cap')
+    gc_parser.add_argument(
+        '--max-age-days',
+        type=float,
+        default=functions_scraper.DEFAULT_CACHE_MAX_AGE.days,
+        help='Remove entries fetched more than this many days ago (default: %(default)s)'
+    )
+    gc_parser.add_argument(
+        '--max-size-mb',
+        '--cache-size-cap',
+        dest='max_size_mb',
+        type=float,
+        default=None,
+        help='Evict the oldest pages of the largest sites until the cache fits this size'
+    )
+    return parser.parse_args(argv if argv is not None else [])
+
+def run_rebuild() -> None:
+    """Rebuild the cache manifest and report how many pages were indexed."""
+    start_time = time.time()
+    indexed = rebuild_manifest(functions_scraper.CACHE_DIR)
+    print(f"Indexed {indexed} cached pages in {time.time() - start_time:.2f} seconds")
+
+def run_migrate() -> None:
+    """Migrate flat cache files into the sharded layout and report progress."""
+    start_time = time.time()
+    migrated = functions_scraper.migrate_cache_layout()
+    print(f"Migrated {migrated} cache files in {time.time() - start_time:.2f} seconds")
+
+def measure_disk_usage(pattern: str) -> int:
+    """Total size in bytes of cache files matching a glob pattern."""
+    return sum(path.stat().st_size for path in functions_scraper.CACHE_DIR.rglob(pattern))
+
+def run_stats() -> None:
+    """Report manifest contents and the disk space used by plain and compressed pages."""
+    summary = summarize_manifest(get_manifest(functions_scraper.CACHE_DIR))
+    plain_bytes = measure_disk_usage('*.html')
+    object_bytes = measure_disk_usage('*.html.gz')
+    disk_bytes = plain_bytes + object_bytes
+    
+    print(f"Entries: {summary['entries']} ({summary['compressed_entries']} compressed)")
+    print(f"Distinct compressed objects: {summary['objects']}")
+    print(f"Logical size: {summary['logical_bytes'] / 1e6:.2f} MB")
+    print(f"Disk usage: {disk_bytes / 1e6:.2f} MB (plain {plain_bytes / 1e6:.2f} MB, compressed {object_bytes / 1e6:.2f} MB)")
+    if disk_bytes:
+        print(f"Storage ratio: {summary['logical_bytes'] / disk_bytes:.1f}x")
+
+def run_gc(max_age_days: float, max_size_mb: Optional[float]) -> None:
+    """Run one garbage collection pass and report bytes reclaimed."""
+    start_time = time.time()
+    max_bytes = int(max_size_mb * 1e6) if max_size_mb is not None else None
+    # An explicit maximum age is honoured exactly, without the revalidation grace period
+    report = collect_garbage(timedelta(days=max_age_days), max_bytes, timedelta(0))
+    print(f"{format_gc_report(report)} in {time.time() - start_time:.2f} seconds")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Main entry point for cache maintenance.
+
+    Args:
+        argv: Command line arguments, excluding the program name
+    """
+    args = parse_arguments(argv)
+    try:
+        if args.command == 'rebuild':
+            run_rebuild()
+        elif args.command == 'migrate':
+            run_migrate()
+        elif args.command == 'stats':
+            run_stats()
+        elif args.command == 'gc':
+            run_gc(args.max_age_days, args.max_size_mb)
+
+    except Exception as e:
+        print(f"Error during cache maintenance: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Commands for the shared scrape task queue.
+Provides command line entry points for serving a SQLite queue to workers on
+other machines, seeding it with the configured sites, reporting progress
+and resetting it for a fresh run.
+"""
+from typing import List, Optional
+import argparse
+import sys
+
+from functions.functions_queue import open_queue, serve_queue, SQLiteQueueBackend, QueueBackend
+from functions.functions_scraper import load_scraper_configs, build_site_task
+
+# Constants
+DEFAULT_QUEUE_PATH = 'queue.sqlite3'
+DEFAULT_CONFIG_PATH = 'sites_to_scrape.csv'
+DEFAULT_SERVE_HOST = '127.0.0.1'
+DEFAULT_SERVE_PORT = 8765
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list to parse (defaults to no arguments)
+
+    Returns:
+        Parsed arguments namespace
+    """
+    parser = argparse.ArgumentParser(description="Manage the shared scrape task queue.")
+    parser.add_argument(
+        '--queue',
+        default=DEFAULT_QUEUE_PATH,
+        metavar='TARGET',
+        help='SQLite queue path or queue server URL (default: %(default)s)'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help='Serve the SQLite queue to workers on other machines over HTTP, guarded by the QUEUE_TOKEN environment variable')
+    serve_parser.add_argument('--host', default=DEFAULT_SERVE_HOST, help='Interface to listen on (default: %(default)s)')
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_SERVE_PORT, help='Port to listen on (default: %(default)s)')
+    seed_parser = subparsers.add_parser('seed', help='Queue a site task for every configured site')
+    seed_parser.add_argument('--config', default=DEFAULT_CONFIG_PATH, help='Site configuration CSV (default: %(default)s)')
+    subparsers.add_parser('stats', help='Report the number of tasks in each state')
+    subparsers.add_parser('reset', help='Remove every task, ready for a fresh run')
+    return parser.parse_args(argv if argv is not None else [])
+
+def run_serve(target: str, host: str, port: int) -> None:
+    """Serve a SQLite queue over HTTP until interrupted."""
+    if target.startswith(('http://', 'https://')):
+        raise ValueError("serve needs a SQLite queue path, not a server URL")
+    server = serve_queue(open_queue(target), host, port)
+    print(f"Serving {target} on http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping queue server")
+    finally:
+        server.server_close()
+
+def run_seed(task_queue: QueueBackend, config_path: str) -> None:
+    """Queue every configured site and report how many were new."""
+    configs = load_scraper_configs(config_path)
+    added = task_queue.put([build_site_task(config) for config in configs])
+    print(f"Queued {added} of {len(configs)} sites ({len(configs) - added} already queued)")
+
+def run_stats(task_queue: QueueBackend) -> None:
+    """Report the number of tasks in each state."""
+    stats = task_queue.stats()
+    for state in ('pending', 'leased', 'done', 'failed'):
+        print(f"{state.capitalize()}: {stats.get(state, 0)}")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Main entry point for queue management.
+
+    Args:
+        argv: Command line arguments, excluding the program name
+    """
+    args = parse_arguments(argv)
+    task_queue = None
+    try:
+        if args.command == 'serve':
+            run_serve(args.queue, args.host, args.port)
+            return
+        task_queue = open_queue(args.queue)
+        if args.command == 'seed':
+            run_seed(task_queue, args.config)
+        elif args.command == 'stats':
+            run_stats(task_queue)
+        elif args.command == 'reset':
+            task_queue.reset()
+            print("Queue reset")
+
+    except Exception as e:
+        print(f"Error managing queue: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    finally:
+        if isinstance(task_queue, SQLiteQueueBackend):
+            task_queue.close()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
\ No newline at end of file
@@ -3,19 +3,264 @@ Module for running web scrapers using configured settings from CSV file.
 This module focuses on orchestrating the scraping process, while delegating
 the implementation details to functions in functions_scraper.py.
 """
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+import argparse
+import functools
+import queue
 import sys
 import secrets
+import threading
+import time
 from selenium.webdriver.remote.webdriver import WebDriver
 
-from functions.functions_selenium import init_selenium
+from functions.functions_selenium import init_selenium, DriverPool, ManagedDriver, DEFAULT_MAX_NAVIGATIONS
 from functions.functions_scraper import (
     load_scraper_configs,
     randomize_configs,
-    scrape_single_site
+    group_configs_by_host,
+    scrape_single_site,
+    download_deferred_sites,
+    DeferredSite,
+    run_queue_worker,
+    ScrapeOptions,
+    DEFAULT_CACHE_MAX_AGE
 )
+from functions import functions_scraper
+from functions.functions_schedule import CrawlScheduler, SCHEDULE_FILENAME
+from functions.functions_checkpoint import CheckpointJournal, CHECKPOINT_FILENAME
+from functions.functions_queue import QueueBackend, open_queue, DEFAULT_POLITENESS_DELAY
+from functions.functions_ratelimit import DEFAULT_MIN_DELAY, DEFAULT_MAX_DELAY
+from functions.functions_gc import start_background_gc, collect_garbage, format_gc_report
 
-def run_scrapers(configs: List[Dict], driver: WebDriver) -> None:
+# Constants
+CONFIG_PATH = 'sites_to_scrape.csv'
+DAEMON_MAX_IDLE: float = 300.0  # Longest sleep between schedule checks, so new configs are picked up
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list to parse (defaults to no arguments)
+        
+    Returns:
+        Parsed arguments namespace
+    """
+    parser = argparse.ArgumentParser(description="Scrape job listings from configured sites.")
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='Number of browser workers to run in parallel (default: 1)'
+    )
+    parser.add_argument(
+        '--http-first',
+        action='store_true',
+        help='Fetch job pages over plain HTTP first, falling back to the browser'
+    )
+    parser.add_argument(
+        '--async-download',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Download job pages concurrently over HTTP with up to N requests per host'
+    )
+    parser.add_argument(
+        '--lite',
+        action='store_true',
+        help='Block images, fonts, media and trackers in the browser'
+    )
+    parser.add_argument(
+        '--offline-xpath',
+        action='store_true',
+        help='Evaluate listing XPaths locally with lxml instead of in the browser'
+    )
+    parser.add_argument(
+        '--compress-cache',
+        action='store_true',
+        help='Store job pages gzip-compressed and deduplicated by content hash'
+    )
+    parser.add_argument(
+        '--gc-interval',
+        type=float,
+        default=0,
+        metavar='MINUTES',
+        help='Garbage collect the cache in the background every MINUTES minutes'
+    )
+    parser.add_argument(
+        '--cache-size-cap',
+        type=float,
+        default=None,
+        metavar='MB',
+        help='Cache size cap in megabytes, enforced by background garbage collection or once at startup'
+    )
+    parser.add_argument(
+        '--incremental',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Stop paginating after N consecutive pages of already-downloaded jobs '
+             'and skip listings whose first page is unchanged since the last run'
+    )
+    parser.add_argument(
+        '--parallel-pages',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Load up to N listing pages at once in separate browser tabs (default: 1)'
+    )
+    parser.add_argument(
+        '--detail-tabs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Render up to N job pages at once in separate browser tabs (default: 1)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Download job pages as pagination finds them instead of after the last listing page'
+    )
+    parser.add_argument(
+        '--interleave',
+        action='store_true',
+        help='Paginate every site first, then download all job pages in one pass that interleaves hosts'
+    )
+    parser.add_argument(
+        '--adaptive-rate',
+        action='store_true',
+        help='Pace requests per host with a learned, self-adjusting delay instead of fixed sleeps'
+    )
+    parser.add_argument(
+        '--min-delay',
+        type=float,
+        default=DEFAULT_MIN_DELAY,
+        metavar='SECONDS',
+        help='Shortest delay between requests to one host with --adaptive-rate (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--max-delay',
+        type=float,
+        default=DEFAULT_MAX_DELAY,
+        metavar='SECONDS',
+        help='Longest delay between requests to one host with --adaptive-rate (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--recycle-after',
+        type=int,
+        default=DEFAULT_MAX_NAVIGATIONS,
+        metavar='N',
+        help='Replace each browser after N navigations, or 0 never to (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--max-browser-mb',
+        type=float,
+        default=None,
+        metavar='MB',
+        help='Replace a browser once its processes use more than MB megabytes of memory'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running, re-crawling each site when its posting rate says it is due'
+    )
+    parser.add_argument(
+        '--no-resume',
+        action='store_true',
+        help='Start from the top instead of resuming an interrupted run'
+    )
+    parser.add_argument(
+        '--queue',
+        default=None,
+        metavar='TARGET',
+        help='Work tasks from a shared queue (SQLite path or queue server URL) until it is drained'
+    )
+    parser.add_argument(
+        '--queue-delay',
+        type=float,
+        default=DEFAULT_POLITENESS_DELAY,
+        metavar='SECONDS',
+        help='Minimum delay between queue tasks for one host, across all workers (default: %(default)s)'
+    )
+    args = parser.parse_args(argv if argv is not None else [])
+    
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.async_download < 0:
+        parser.error("--async-download cannot be negative")
+    if args.parallel_pages < 1:
+        parser.error("--parallel-pages must be at least 1")
+    if args.detail_tabs < 1:
+        parser.error("--detail-tabs must be at least 1")
+    if args.incremental < 0:
+        parser.error("--incremental cannot be negative")
+    if not 0 < args.min_delay <= args.max_delay:
+        parser.error("--min-delay must be positive and no greater than --max-delay")
+    if args.recycle_after < 0:
+        parser.error("--recycle-after cannot be negative")
+    if args.queue_delay < 0:
+        parser.error("--queue-delay cannot be negative")
+    if args.queue and args.daemon:
+        parser.error("--queue cannot be combined with --daemon")
+    if args.interleave and args.stream:
+        parser.error("--interleave cannot be combined with --stream")
+    if args.cache_size_cap is not None and args.cache_size_cap < 0:
+        parser.error("--cache-size-cap cannot be negative")
+        
+    return args
+
+def build_scrape_options(args: argparse.Namespace) -> ScrapeOptions:
+    """
+    Build runtime scraping options from parsed command line arguments.
+    
+    Args:
+        args: Parsed arguments namespace
+        
+    Returns:
+        ScrapeOptions instance
+    """
+    return ScrapeOptions(
+        http_first=args.http_first,
+        async_per_host_limit=args.async_download,
+        lite=args.lite,
+        offline_xpath=args.offline_xpath,
+        compress_cache=args.compress_cache,
+        incremental_pages=args.incremental,
+        adaptive_rate=args.adaptive_rate,
+        min_delay=args.min_delay,
+        max_delay=args.max_delay,
+        parallel_pages=args.parallel_pages,
+        detail_tabs=args.detail_tabs,
+        stream_downloads=args.stream,
+        interleave_downloads=args.interleave
+    )
+
+def build_driver_factory(args: argparse.Namespace, options: ScrapeOptions) -> Callable[[], WebDriver]:
+    """
+    Build a factory for browsers that recycle themselves and restart after crashes.
+    
+    Args:
+        args: Parsed arguments namespace
+        options: Runtime scraping options
+        
+    Returns:
+        Callable returning a new managed driver
+    """
+    return functools.partial(
+        ManagedDriver,
+        functools.partial(init_selenium, lite=options.lite),
+        args.recycle_after,
+        args.max_browser_mb
+    )
+
+def run_scrapers(
+    configs: List[Dict],
+    driver: WebDriver,
+    options: Optional[ScrapeOptions] = None,
+    on_scraped: Optional[Callable[[Dict, Optional[int]], None]] = None,
+    checkpoint: Optional[CheckpointJournal] = None,
+    deferred: Optional[List[DeferredSite]] = None
+) -> None:
     """
     Execute scraping process for all configured sites.
     
@@ -24,44 +269,327 @@ def run_scrapers(configs: List[Dict], driver: WebDriver) -> None:
     2. Iterates through each config
     3. Executes the scraping process for each site
     
+    With interleaved downloads, sites are only paginated here and their
+    job pages are downloaded together after the last site.
+    
     Args:
         configs: List of dictionaries containing scraper configurations
         driver: Initialized Selenium WebDriver instance
+        options: Runtime scraping options
+        on_scraped: Callable given each config and its number of new jobs,
+            or None if scraping it failed
+        checkpoint: Journal of the current run, for resuming after a crash
+        deferred: List collecting paginated sites for the caller to
+            download; by default they are downloaded before returning
     """
+    interleave = options is not None and options.interleave_downloads
+    sites = deferred if deferred is not None else []
     for config in configs:
-        scrape_single_site(config, driver)
+        new_jobs = scrape_single_site(
+            config,
+            driver,
+            options=options,
+            checkpoint=checkpoint,
+            deferred=sites if interleave else None
+        )
+        if on_scraped:
+            on_scraped(config, new_jobs)
+            
+    if interleave and deferred is None:
+        download_deferred_sites(sites, driver, options=options, checkpoint=checkpoint)
+
+def scraper_worker(
+    host_queue: "queue.Queue[List[Dict]]",
+    driver_factory: Callable[[], WebDriver],
+    options: Optional[ScrapeOptions] = None,
+    release_driver: Optional[Callable[[WebDriver], None]] = None,
+    on_scraped: Optional[Callable[[Dict, Optional[int]], None]] = None,
+    checkpoint: Optional[CheckpointJournal] = None
+) -> None:
+    """
+    Worker loop that owns one browser and scrapes host groups from a queue.
+    
+    Args:
+        host_queue: Queue of configuration groups, one group per host
+        driver_factory: Callable returning a WebDriver instance
+        options: Runtime scraping options
+        release_driver: Callable handing the driver back when done
+            (defaults to quitting it)
+        on_scraped: Callable given each config and its number of new jobs,
+            or None if scraping it failed
+        checkpoint: Journal of the current run, for resuming after a crash
+    """
+    driver = None
+    # Each worker interleaves the downloads of every host group it paginated
+    deferred: List[DeferredSite] = []
+    try:
+        driver = driver_factory()
+        while True:
+            try:
+                host_configs = host_queue.get_nowait()
+            except queue.Empty:
+                break
+            run_scrapers(host_configs, driver, options, on_scraped, checkpoint, deferred)
+        download_deferred_sites(deferred, driver, options=options, checkpoint=checkpoint)
+            
+    except Exception as e:
+        print(f"Worker {threading.current_thread().name} stopped: {str(e)}", file=sys.stderr)
+        
+    finally:
+        if driver and release_driver:
+            release_driver(driver)
+        elif driver:
+            driver.quit()
+
+def run_scrapers_parallel(
+    configs: List[Dict],
+    workers: int,
+    driver_factory: Callable[[], WebDriver] = init_selenium,
+    options: Optional[ScrapeOptions] = None,
+    release_driver: Optional[Callable[[WebDriver], None]] = None,
+    on_scraped: Optional[Callable[[Dict, Optional[int]], None]] = None,
+    checkpoint: Optional[CheckpointJournal] = None
+) -> None:
+    """
+    Execute scraping process for all sites using a pool of browser workers.
+    
+    Configurations are grouped by host and placed on a shared queue. Each
+    worker owns its own WebDriver and takes whole host groups from the queue,
+    so a host is only ever scraped by one worker at a time.
+    
+    Args:
+        configs: List of dictionaries containing scraper configurations
+        workers: Number of worker threads (and browsers) to run
+        driver_factory: Callable returning a WebDriver instance
+        options: Runtime scraping options
+        release_driver: Callable handing a worker's driver back when done
+        on_scraped: Callable given each config and its number of new jobs,
+            or None if scraping it failed
+        checkpoint: Journal of the current run, for resuming after a crash
+    """
+    host_groups = group_configs_by_host(configs)
+    host_queue: "queue.Queue[List[Dict]]" = queue.Queue()
+    for host_configs in host_groups:
+        host_queue.put(host_configs)
+        
+    threads = [
+        threading.Thread(
+            target=scraper_worker,
+            args=(host_queue, driver_factory, options, release_driver, on_scraped, checkpoint),
+            name=f"scraper-{index + 1}"
+        )
+        for index in range(min(workers, len(host_groups)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def run_queue_workers(
+    task_queue: QueueBackend,
+    workers: int,
+    driver_factory: Callable[[], WebDriver] = init_selenium,
+    options: Optional[ScrapeOptions] = None,
+    release_driver: Optional[Callable[[WebDriver], None]] = None,
+    politeness_delay: float = DEFAULT_POLITENESS_DELAY
+) -> None:
+    """
+    Work tasks from a shared queue with a pool of browser workers.
+    
+    Unlike run_scrapers_parallel, workers are not tied to hosts: any worker
+    takes any task, and the queue keeps hosts polite across every worker
+    and machine sharing it.
+    
+    Args:
+        task_queue: Shared task queue
+        workers: Number of worker threads (and browsers) to run
+        driver_factory: Callable returning a WebDriver instance
+        options: Runtime scraping options
+        release_driver: Callable handing a worker's driver back when done
+        politeness_delay: Minimum seconds between tasks for one host
+    """
+    def work() -> None:
+        driver = None
+        try:
+            driver = driver_factory()
+            completed = run_queue_worker(task_queue, driver, options, politeness_delay=politeness_delay)
+            print(f"Worker {threading.current_thread().name} completed {completed} tasks")
+            
+        except Exception as e:
+            print(f"Worker {threading.current_thread().name} stopped: {str(e)}", file=sys.stderr)
+            
+        finally:
+            if driver and release_driver:
+                release_driver(driver)
+            elif driver:
+                driver.quit()
+                
+    threads = [threading.Thread(target=work, name=f"queue-{index + 1}") for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
 
-def main() -> None:
+def run_daemon(
+    driver_pool: DriverPool,
+    workers: int,
+    options: Optional[ScrapeOptions] = None,
+    stop_event: Optional[threading.Event] = None
+) -> None:
+    """
+    Scrape sites continuously as they come due on the crawl schedule.
+    
+    Configurations are reloaded before every round so sites added to the
+    CSV are picked up without a restart. Browsers stay checked into the
+    warm pool between rounds.
+    
+    Args:
+        driver_pool: Warm pool the workers check browsers out of
+        workers: Number of worker threads (and browsers) to run
+        options: Runtime scraping options
+        stop_event: Event that ends the loop when set
+    """
+    stop_event = stop_event or threading.Event()
+    scheduler = CrawlScheduler(functions_scraper.CACHE_DIR / SCHEDULE_FILENAME)
+    
+    recorded = []
+    
+    def record(config: Dict, new_jobs: Optional[int]) -> None:
+        recorded.append(config['url'])
+        # A failed crawl found nothing, which must not count as a quiet board
+        if new_jobs is None:
+            entry = scheduler.record_failure(config['url'])
+            scheduler.save()
+            minutes = (entry.next_due - time.time()) / 60
+            print(f"Crawl of {config['url']} failed, retrying in {minutes:.0f} minutes")
+            return
+        entry = scheduler.record_crawl(config['url'], new_jobs)
+        scheduler.save()
+        hours = (entry.next_due - time.time()) / 3600
+        print(f"{new_jobs} new jobs at {config['url']}, next crawl in {hours:.1f} hours")
+        
+    while not stop_event.is_set():
+        configs = load_scraper_configs(CONFIG_PATH)
+        due_configs = scheduler.get_due_configs(configs)
+        if due_configs:
+            print(f"{len(due_configs)} of {len(configs)} sites due")
+            recorded.clear()
+            run_scrapers_parallel(
+                due_configs,
+                workers,
+                driver_pool.acquire,
+                options,
+                driver_pool.release,
+                record
+            )
+            # Without a single finished site (e.g. no browser could start), back off before retrying
+            if recorded:
+                continue
+            stop_event.wait(DAEMON_MAX_IDLE)
+            continue
+            
+        stop_event.wait(min(scheduler.get_seconds_until_due(configs), DAEMON_MAX_IDLE))
+
+def main(argv: Optional[List[str]] = None) -> None:
     """
     Main entry point for the scraping process.
     
     Process flow:
     1. Load scraper configurations from CSV
     2. Randomize the order of sites to scrape
-    3. Initialize the browser
-    4. Execute the scraping process
+    3. Initialize the browser (or a warm pool of browsers with --workers)
+    4. Execute the scraping process, skipping sites an interrupted run finished
     5. Clean up browser resources
     
-    Handles errors gracefully and ensures browser cleanup.
+    Handles errors gracefully and ensures browser cleanup. Progress is
+    journaled as the run goes and the journal is cleared once the run has
+    been through every site. With --queue, work comes from the shared task
+    queue instead, seeded with manage_queue.py, and the run ends once the
+    queue is drained.
+    
+    Args:
+        argv: Command line arguments, excluding the program name
     """
+    args = parse_arguments(argv)
+    options = build_scrape_options(args)
+    driver_factory = build_driver_factory(args, options)
     driver = None
+    driver_pool = None
+    gc_stop_event = None
+    checkpoint = None
     try:
-        driver = init_selenium()
-        
+        if args.workers > 1 or args.daemon:
+            # Browsers launch in the background while configs load
+            driver_pool = DriverPool(driver_factory, args.workers)
+            driver_pool.warm()
+            
+        max_bytes = int(args.cache_size_cap * 1e6) if args.cache_size_cap is not None else None
+        if args.gc_interval > 0:
+            gc_stop_event = start_background_gc(args.gc_interval * 60, DEFAULT_CACHE_MAX_AGE, max_bytes)
+        elif max_bytes is not None:
+            # Without background passes the cap is enforced once, before scraping
+            print(f"Cache GC: {format_gc_report(collect_garbage(DEFAULT_CACHE_MAX_AGE, max_bytes))}")
+            
+        if args.daemon:
+            run_daemon(driver_pool, args.workers, options)
+            return
+            
+        if args.queue:
+            run_queue_workers(
+                open_queue(args.queue),
+                args.workers,
+                driver_pool.acquire if driver_pool else driver_factory,
+                options,
+                driver_pool.release if driver_pool else None,
+                args.queue_delay
+            )
+            return
+            
+        checkpoint = CheckpointJournal(functions_scraper.CACHE_DIR / CHECKPOINT_FILENAME)
+        if args.no_resume:
+            checkpoint.clear()
+        elif checkpoint.clear_if_older_than(DEFAULT_CACHE_MAX_AGE):
+            print(f"Discarded the checkpoint of a run started over {DEFAULT_CACHE_MAX_AGE.days} days ago")
+        elif checkpoint.count_finished_sites():
+            print(f"Resuming interrupted run: {checkpoint.count_finished_sites()} sites already finished")
+            
         # Load and randomize configurations
-        configs = load_scraper_configs('sites_to_scrape.csv')
+        configs = load_scraper_configs(CONFIG_PATH)
         randomized_configs = randomize_configs(configs)
         
         # Run scrapers
-        run_scrapers(randomized_configs, driver)
+        if driver_pool:
+            run_scrapers_parallel(
+                randomized_configs,
+                args.workers,
+                driver_pool.acquire,
+                options,
+                driver_pool.release,
+                checkpoint=checkpoint
+            )
+        else:
+            driver = driver_factory()
+            run_scrapers(randomized_configs, driver, options, checkpoint=checkpoint)
+            
+        # The run got through every site; only an interrupted run is resumed
+        checkpoint.clear()
+        
+    except KeyboardInterrupt:
+        print("Stopping scraper")
         
     except Exception as e:
         print(f"Error during scraping process: {str(e)}", file=sys.stderr)
         sys.exit(1)
         
     finally:
+        if gc_stop_event:
+            gc_stop_event.set()
+        if driver_pool:
+            driver_pool.close()
+        if checkpoint:
+            checkpoint.close()
         if driver:
             driver.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
\ No newline at end of file
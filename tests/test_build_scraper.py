@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import patch, Mock, mock_open
+import csv
 import sys
 import os
 from pathlib import Path
@@ -166,6 +167,22 @@ def test_write_config_to_csv(tmp_path):
         assert "Generic Job XPath" in content
         assert "Paged Link URL" in content
         assert "Page Increment Value" in content
+        assert "Total Count XPath" in content
+        
+    # Append a row with a learned total-count locator
+    write_config_to_csv(
+        timestamp_human,
+        timestamp_unix,
+        xpath,
+        url,
+        increment,
+        file_path=csv_path,
+        total_count_xpath="//span[@id='count']"
+    )
+    with open(csv_path, 'r', newline='') as f:
+        rows = list(csv.reader(f))
+    assert len(rows) == 3
+    assert rows[2][6] == "//span[@id='count']"
 
 @patch('build_scraper.init_selenium')
 @patch('functions.functions_builder.process_jobs_page_with_gpt')
@@ -20,7 +20,8 @@ from functions.functions_builder import (
     filter_xpath_patterns,
     sift_next_page_link,
     create_job_page_schema,
-    process_gpt_response
+    process_gpt_response,
+    find_total_count_xpath
 )
 
 # Add new test for extract_job_urls function
@@ -122,6 +123,22 @@ def test_generate_single_xpath():
     assert 'p' in xpath
     assert isinstance(xpath, str)
 
+def test_find_total_count_xpath():
+    """Test locating the element that states a listing's total job count."""
+    html = (
+        '<html><body><div class="header"><span class="count">Showing 1-20 of 437 jobs</span></div>'
+        '<ul><li><a href="/job/1">Engineer</a></li></ul>'
+        '<script>var total = "of 999";</script></body></html>'
+    )
+    assert find_total_count_xpath(html) == "//span[@class='count']"
+    
+    # Falls back to the element's position when its class is not unique
+    html = '<html><body><p class="x">Page 1</p><p class="x">42 results</p></body></html>'
+    assert find_total_count_xpath(html) == "/html/body/p[2]"
+    
+    assert find_total_count_xpath('<html><body><p>No jobs here</p></body></html>') is None
+    assert find_total_count_xpath('<html><body><span>Page 1 of 22</span></body></html>') is None
+
 def test_generate_xpaths_for_all_elements():
     """Test XPath generation for all elements."""
     html = '<div><p>Test1</p><p>Test2</p></div>'
@@ -0,0 +1,68 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from functions.functions_checkpoint import CheckpointJournal, ListingProgress
+
+LISTING = "https://example.com/jobs?page="
+
+@pytest.fixture
+def journal(tmp_path):
+    """Create a checkpoint journal in a temporary directory."""
+    journal = CheckpointJournal(tmp_path / "checkpoint.sqlite3")
+    yield journal
+    journal.close()
+
+def test_record_page(journal):
+    """Test journaling crawled pages and the links they added."""
+    assert journal.get_listing_progress(LISTING) is None
+    
+    journal.record_page(LISTING, ["https://example.com/a", "https://example.com/b"], 2)
+    journal.record_page(LISTING, ["https://example.com/b", "https://example.com/c"], 3, last_page=4)
+    
+    assert journal.get_listing_progress(LISTING) == ListingProgress(next_page=3, last_page=4)
+    assert sorted(journal.get_links(LISTING)) == [
+        "https://example.com/a", "https://example.com/b", "https://example.com/c"
+    ]
+    
+    journal.mark_listing_finished(LISTING)
+    assert journal.get_listing_progress(LISTING).finished
+
+def test_finished_sites(tmp_path, journal):
+    """Test that finished sites survive a restart until the journal is cleared."""
+    journal.record_page(LISTING, ["https://example.com/a"], 2)
+    journal.mark_site_done(LISTING)
+    
+    reopened = CheckpointJournal(tmp_path / "checkpoint.sqlite3")
+    assert reopened.is_site_done(LISTING)
+    assert not reopened.is_site_done("https://other.com/jobs?page=")
+    assert reopened.count_finished_sites() == 1
+    
+    reopened.clear()
+    assert not journal.is_site_done(LISTING)
+    assert journal.get_listing_progress(LISTING) is None
+    assert journal.get_links(LISTING) == []
+    reopened.close()
+
+def test_clear_if_older_than(tmp_path):
+    """Test that the journal of a long abandoned run is discarded."""
+    started = datetime(2025, 1, 1)
+    with patch('functions.functions_checkpoint.datetime') as mock_datetime:
+        mock_datetime.now.return_value = started
+        mock_datetime.fromtimestamp = datetime.fromtimestamp
+        first_run = CheckpointJournal(tmp_path / "checkpoint.sqlite3")
+        first_run.mark_site_done(LISTING)
+        first_run.close()
+        
+        # Reopening keeps the original start
+        mock_datetime.now.return_value = started + timedelta(days=10)
+        journal = CheckpointJournal(tmp_path / "checkpoint.sqlite3")
+        assert journal.get_run_started() == started
+        assert not journal.clear_if_older_than(timedelta(days=28))
+        assert journal.is_site_done(LISTING)
+        
+        mock_datetime.now.return_value = started + timedelta(days=30)
+        assert journal.clear_if_older_than(timedelta(days=28))
+        assert not journal.is_site_done(LISTING)
+        assert journal.get_run_started() == started + timedelta(days=30)
+    journal.close()
\ No newline at end of file
@@ -0,0 +1,141 @@
+import os
+import time
+import pytest
+from dataclasses import replace
+from datetime import timedelta
+from functions import functions_scraper
+from functions.functions_scraper import (
+    save_to_cache,
+    create_cache_filename,
+    find_cache_file,
+    get_object_path
+)
+from functions.functions_manifest import get_manifest, get_entry, record_entry, count_entries
+from functions.functions_gc import (
+    GCReport,
+    format_gc_report,
+    collect_garbage,
+    start_background_gc
+)
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the scraper cache at a temporary directory."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    return cache_dir
+
+def save_aged(site, url, content, age_days, compress=False):
+    """Save a page to the cache and backdate its manifest entry and file."""
+    save_to_cache(site, url, content, compress=compress)
+    fetched_at = time.time() - age_days * 86400
+    manifest = get_manifest(functions_scraper.CACHE_DIR)
+    url_hash = create_cache_filename(site, url)[len(site) + 1:-len(".html")]
+    entry = get_entry(manifest, url_hash)
+    record_entry(manifest, replace(entry, fetched_at=fetched_at))
+    stored = get_object_path(entry.content_hash) if compress else find_cache_file(create_cache_filename(site, url))
+    os.utime(stored, (fetched_at, fetched_at))
+    return stored
+
+def test_collect_garbage_removes_expired_entries(cache_dir):
+    """Test that expired pages are removed and fresh pages kept."""
+    old_file = save_aged("example.com", "https://example.com/old", "<html>old</html>" * 10, 10)
+    new_file = save_aged("example.com", "https://example.com/new", "<html>new</html>" * 10, 1)
+    
+    report = collect_garbage(max_age=timedelta(days=7), grace_period=timedelta(days=1))
+    
+    assert report.expired == 1
+    assert report.bytes_reclaimed > 0
+    assert not old_file.exists()
+    assert new_file.exists()
+    assert count_entries(get_manifest(cache_dir)) == 1
+
+def test_collect_garbage_keeps_stale_entries_for_revalidation(cache_dir):
+    """Test that pages past the maximum age survive the revalidation grace period."""
+    stale_file = save_aged("example.com", "https://example.com/stale", "<html>stale</html>" * 10, 10)
+    
+    report = collect_garbage(max_age=timedelta(days=7))
+    
+    assert report.expired == 0
+    assert stale_file.exists()
+    assert count_entries(get_manifest(cache_dir)) == 1
+
+def test_collect_garbage_counts_only_removed_pages(cache_dir):
+    """Test that entries whose page was already gone are dropped without being counted."""
+    missing_file = save_aged("example.com", "https://example.com/missing", "<html>old</html>" * 10, 10)
+    missing_file.unlink()
+    old_file = save_aged("example.com", "https://example.com/old", "<html>old</html>" * 10, 10)
+    
+    report = collect_garbage(max_age=timedelta(days=7), grace_period=timedelta(days=1))
+    
+    assert report.expired == 1
+    assert not old_file.exists()
+    assert count_entries(get_manifest(cache_dir)) == 0
+
+def test_collect_garbage_skips_rewritten_files(cache_dir):
+    """Test that a page rewritten after its manifest entry was read is left alone."""
+    cache_file = save_aged("example.com", "https://example.com/job", "<html>job</html>" * 10, 10)
+    os.utime(cache_file, None)
+    
+    report = collect_garbage(max_age=timedelta(days=7), grace_period=timedelta(days=1))
+    
+    assert report.expired == 0
+    assert report.bytes_reclaimed == 0
+    assert cache_file.exists()
+
+def test_collect_garbage_keeps_shared_objects(cache_dir):
+    """Test that a compressed object survives while another URL still uses it."""
+    body = "<html>" + "Shared description. " * 50 + "</html>"
+    object_path = save_aged("example.com", "https://example.com/old", body, 10, compress=True)
+    save_to_cache("example.com", "https://example.com/new", body, compress=True)
+    
+    report = collect_garbage(max_age=timedelta(days=7), grace_period=timedelta(days=1))
+    
+    assert report.expired == 1
+    assert object_path.exists()
+    assert count_entries(get_manifest(cache_dir)) == 1
+
+def test_collect_garbage_enforces_size_cap(cache_dir):
+    """Test that the size cap evicts the largest site's oldest pages first."""
+    big_files = [
+        save_aged("big.com", f"https://big.com/{index}", "x" * 1000, 5 - index)
+        for index in range(4)
+    ]
+    small_file = save_aged("small.com", "https://small.com/1", "y" * 1000, 6)
+    
+    report = collect_garbage(max_age=timedelta(days=30), max_bytes=3500)
+    
+    assert report.evicted == 2
+    assert not big_files[0].exists()
+    assert not big_files[1].exists()
+    assert big_files[2].exists()
+    assert small_file.exists()
+
+def test_collect_garbage_removes_orphan_objects(cache_dir):
+    """Test that old unreferenced objects are removed and recent ones kept."""
+    old_object = get_object_path("a" * 64)
+    recent_object = get_object_path("b" * 64)
+    for object_path in (old_object, recent_object):
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        object_path.write_bytes(b"orphan")
+    os.utime(old_object, (time.time() - 7200, time.time() - 7200))
+    
+    report = collect_garbage()
+    
+    assert report.orphans == 1
+    assert not old_object.exists()
+    assert recent_object.exists()
+
+def test_format_gc_report():
+    """Test formatting of garbage collection reports."""
+    report = GCReport(expired=2, evicted=1, orphans=3, bytes_reclaimed=2_500_000)
+    assert format_gc_report(report) == (
+        "Removed 2 expired and 1 evicted entries and 3 orphaned objects, reclaimed 2.50 MB"
+    )
+
+def test_start_background_gc(cache_dir):
+    """Test that the background thread stops when its event is set."""
+    stop_event = start_background_gc(interval=60)
+    assert not stop_event.is_set()
+    stop_event.set()
\ No newline at end of file
@@ -0,0 +1,178 @@
+import pytest
+from unittest.mock import Mock, patch
+from functions.functions_http import (
+    DownloadStats,
+    FetchResult,
+    create_http_session,
+    build_conditional_headers,
+    fetch_page,
+    fetch_html,
+    download_all_async,
+    get_visible_text,
+    looks_js_gated,
+    get_fetch_mode,
+    record_fetch_mode,
+    FETCH_MODE_BROWSER_SAMPLES
+)
+
+RENDERED_PAGE = "<html><body><h1>Senior Engineer</h1><p>" + "Job description text. " * 20 + "</p></body></html>"
+APP_SHELL = "<html><body><div id='root'></div><script>window.app = {};</script></body></html>"
+
+def test_create_http_session():
+    """Test pooled HTTP session creation."""
+    session = create_http_session("TestAgent/1.0", pool_size=4)
+    
+    assert session.headers["User-Agent"] == "TestAgent/1.0"
+    assert "text/html" in session.headers["Accept"]
+    assert session.get_adapter("https://example.com")._pool_maxsize == 4
+
+def test_fetch_html():
+    """Test HTTP page retrieval."""
+    session = Mock()
+    session.get.return_value = Mock(status_code=200, headers={"Content-Type": "text/html"}, text=RENDERED_PAGE)
+    assert fetch_html(session, "https://example.com/job1") == RENDERED_PAGE
+    
+    # Non-200 responses and non-HTML bodies are treated as failures
+    session.get.return_value = Mock(status_code=403, headers={}, text="Forbidden")
+    assert fetch_html(session, "https://example.com/job1") == ""
+    session.get.return_value = Mock(status_code=200, headers={"Content-Type": "application/pdf"}, text="%PDF")
+    assert fetch_html(session, "https://example.com/job1") == ""
+    
+    # Test error handling
+    session.get.side_effect = Exception("Connection reset")
+    assert fetch_html(session, "https://example.com/job1") == ""
+
+def test_build_conditional_headers():
+    """Test conditional request headers from stored validators."""
+    assert build_conditional_headers() == {}
+    assert build_conditional_headers('"v1"', "Wed, 01 Jan 2025 00:00:00 GMT") == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"
+    }
+
+def test_fetch_page():
+    """Test that validators are captured and 304 responses recognised."""
+    session = Mock()
+    session.get.return_value = Mock(
+        status_code=200,
+        headers={"Content-Type": "text/html", "ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        text=RENDERED_PAGE
+    )
+    result = fetch_page(session, "https://example.com/job1")
+    assert result == FetchResult(RENDERED_PAGE, 200, '"v1"', "Wed, 01 Jan 2025 00:00:00 GMT")
+    assert not result.not_modified
+    
+    session.get.return_value = Mock(status_code=304, headers={"ETag": '"v1"'}, text="")
+    result = fetch_page(session, "https://example.com/job1", {"If-None-Match": '"v1"'})
+    assert result.not_modified
+    assert result.content == ""
+    assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+def test_download_stats():
+    """Test throughput calculation."""
+    assert DownloadStats(fetched=10, elapsed=2.0).jobs_per_second == 5.0
+    assert DownloadStats(fetched=10, elapsed=0).jobs_per_second == 0.0
+
+def test_download_all_async():
+    """Test concurrent downloading with per-host limits."""
+    urls = [f"https://{host}/job{index}" for host in ("a.com", "b.com") for index in range(5)]
+    in_flight = {"a.com": 0, "b.com": 0}
+    peak = {"a.com": 0, "b.com": 0}
+    accepted = []
+    
+    async def fake_fetch(session, url, headers=None, timeout=None):
+        import asyncio
+        host = url.split("/")[2]
+        in_flight[host] += 1
+        peak[host] = max(peak[host], in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        if url.endswith("job3"):
+            assert headers == {"If-None-Match": '"v1"'}
+            return FetchResult(status=304)
+        return FetchResult() if url.endswith("job4") else FetchResult(f"<html>{url}</html>", 200)
+    
+    def on_page(url, result):
+        accepted.append(url)
+        return True
+    
+    request_headers = {url: {"If-None-Match": '"v1"'} for url in urls if url.endswith("job3")}
+    with patch('functions.functions_http.fetch_page_async', side_effect=fake_fetch):
+        stats = download_all_async(urls, on_page, per_host_limit=2, request_headers=request_headers)
+    
+    assert stats.fetched == 8
+    assert stats.not_modified == 2
+    assert sorted(stats.failed_urls) == ["https://a.com/job4", "https://b.com/job4"]
+    assert len(accepted) == 8
+    assert peak == {"a.com": 2, "b.com": 2}
+    assert stats.elapsed > 0
+
+def test_download_all_async_rate_limiter():
+    """Test that every request waits for its host's slot and reports its outcome."""
+    from functions.functions_ratelimit import AdaptiveRateLimiter
+    urls = ["https://a.com/job1", "https://a.com/job2", "https://b.com/job1"]
+    limiter = AdaptiveRateLimiter(min_delay=0.01, initial_delay=0.01)
+    
+    async def fake_fetch(session, url, headers=None, timeout=None):
+        return FetchResult(status=429) if url == "https://b.com/job1" else FetchResult(f"<html>{url}</html>", 200)
+        
+    with patch('functions.functions_http.fetch_page_async', side_effect=fake_fetch), \
+         patch.object(limiter, 'reserve', wraps=limiter.reserve) as mock_reserve, \
+         patch.object(limiter, 'record', wraps=limiter.record) as mock_record:
+        download_all_async(urls, lambda url, result: True, rate_limiter=limiter)
+        
+    assert sorted(call.args[0] for call in mock_reserve.call_args_list) == ["a.com", "a.com", "b.com"]
+    outcomes = sorted((call.args[0], call.args[2], call.args[3]) for call in mock_record.call_args_list)
+    assert outcomes == [("a.com", True, 200), ("a.com", True, 200), ("b.com", False, 429)]
+
+def test_get_visible_text():
+    """Test visible text extraction."""
+    html = "<html><head><style>p {}</style></head><body><p>Hello   <b>world</b></p><script>var x;</script></body></html>"
+    assert get_visible_text(html) == "Hello world"
+
+def test_looks_js_gated():
+    """Test detection of pages that need JavaScript."""
+    assert not looks_js_gated(RENDERED_PAGE)
+    assert looks_js_gated(APP_SHELL)
+    
+    gated = "<html><body><p>" + "x " * 150 + "Please enable JavaScript to continue.</p></body></html>"
+    assert looks_js_gated(gated)
+
+def test_record_fetch_mode(tmp_path):
+    """Test persistence of per-site fetch modes."""
+    modes_path = tmp_path / "cache" / "fetch_modes.json"
+    
+    assert get_fetch_mode(modes_path, "example.com") is None
+    
+    assert record_fetch_mode(modes_path, "example.com", "http") == "http"
+    record_fetch_mode(modes_path, "other.com", "selenium", samples=3)
+    
+    assert get_fetch_mode(modes_path, "example.com") == "http"
+    assert get_fetch_mode(modes_path, "other.com") == "selenium"
+
+def test_record_fetch_mode_needs_several_browser_samples(tmp_path):
+    """Test that a site only switches to the browser after repeated HTTP failures."""
+    modes_path = tmp_path / "cache" / "fetch_modes.json"
+    
+    assert record_fetch_mode(modes_path, "example.com", "selenium") is None
+    assert record_fetch_mode(modes_path, "example.com", "selenium") is None
+    assert get_fetch_mode(modes_path, "example.com") is None
+    
+    # A usable HTTP page resets the count of failed samples
+    record_fetch_mode(modes_path, "example.com", "http")
+    for _ in range(FETCH_MODE_BROWSER_SAMPLES - 1):
+        assert record_fetch_mode(modes_path, "example.com", "selenium") is None
+    assert record_fetch_mode(modes_path, "example.com", "selenium") == "selenium"
+    assert get_fetch_mode(modes_path, "example.com") == "selenium"
+
+def test_get_fetch_mode_expires(tmp_path):
+    """Test that a remembered mode expires so the site is probed again."""
+    modes_path = tmp_path / "cache" / "fetch_modes.json"
+    record_fetch_mode(modes_path, "example.com", "http")
+    
+    assert get_fetch_mode(modes_path, "example.com") == "http"
+    assert get_fetch_mode(modes_path, "example.com", max_age=-1) is None
+    
+    # Modes stored by older versions carry no timestamp and are probed again
+    modes_path.write_text('{"legacy.com": "selenium"}')
+    assert get_fetch_mode(modes_path, "legacy.com") is None
\ No newline at end of file
@@ -0,0 +1,188 @@
+import pytest
+from functions.functions_manifest import (
+    ManifestEntry,
+    get_manifest,
+    record_entry,
+    get_entry,
+    touch_entry,
+    delete_entry,
+    find_known_hashes,
+    get_listing_fingerprint,
+    record_listing_fingerprint,
+    count_entries,
+    count_content_references,
+    count_all_content_references,
+    summarize_manifest,
+    hash_content,
+    parse_cache_filename,
+    read_cache_file_entry,
+    rebuild_manifest
+)
+
+def make_entry(url_hash="abc123", site="example.com", fetched_at=1000.0):
+    """Build a manifest entry for testing."""
+    return ManifestEntry(
+        url_hash=url_hash,
+        site=site,
+        url=f"https://{site}/{url_hash}",
+        fetched_at=fetched_at,
+        size=500,
+        content_hash=hash_content("<html></html>")
+    )
+
+def test_get_manifest(tmp_path):
+    """Test that manifest connections are reused per cache directory."""
+    assert get_manifest(tmp_path) is get_manifest(tmp_path)
+    assert (tmp_path / "manifest.sqlite3").exists()
+
+def test_record_and_get_entry(tmp_path):
+    """Test storing, replacing and deleting entries."""
+    manifest = get_manifest(tmp_path)
+    
+    assert get_entry(manifest, "abc123") is None
+    
+    record_entry(manifest, make_entry())
+    assert get_entry(manifest, "abc123") == make_entry()
+    
+    record_entry(manifest, make_entry(fetched_at=2000.0))
+    assert get_entry(manifest, "abc123").fetched_at == 2000.0
+    assert count_entries(manifest) == 1
+    
+    delete_entry(manifest, "abc123")
+    assert get_entry(manifest, "abc123") is None
+
+def test_touch_entry(tmp_path):
+    """Test bumping freshness and validators of an unchanged entry."""
+    manifest = get_manifest(tmp_path)
+    record_entry(manifest, make_entry())
+    
+    touch_entry(manifest, "abc123", 3000.0, '"v2"', "Wed, 01 Jan 2025 00:00:00 GMT")
+    
+    entry = get_entry(manifest, "abc123")
+    assert entry.fetched_at == 3000.0
+    assert entry.etag == '"v2"'
+    assert entry.last_modified == "Wed, 01 Jan 2025 00:00:00 GMT"
+    assert entry.content_hash == make_entry().content_hash
+
+def test_find_known_hashes(tmp_path):
+    """Test batched lookup of cached URL hashes."""
+    manifest = get_manifest(tmp_path)
+    for index in range(1000):
+        record_entry(manifest, make_entry(url_hash=f"hash{index}"))
+        
+    hashes = [f"hash{index}" for index in range(0, 2000, 2)]
+    assert find_known_hashes(manifest, hashes) == {f"hash{index}" for index in range(0, 1000, 2)}
+    assert find_known_hashes(manifest, []) == set()
+
+def test_listing_fingerprints(tmp_path):
+    """Test storing first-page fingerprints per listing."""
+    manifest = get_manifest(tmp_path)
+    assert get_listing_fingerprint(manifest, "https://example.com/jobs?page=") is None
+    
+    record_listing_fingerprint(manifest, "https://example.com/jobs?page=", "abc", 1000.0)
+    record_listing_fingerprint(manifest, "https://example.com/jobs?page=", "def", 2000.0)
+    
+    assert get_listing_fingerprint(manifest, "https://example.com/jobs?page=") == "def"
+
+def test_get_manifest_upgrades_old_schema(tmp_path):
+    """Test that manifests created before new columns are upgraded in place."""
+    import sqlite3
+    connection = sqlite3.connect(str(tmp_path / "manifest.sqlite3"))
+    connection.execute(
+        "CREATE TABLE cache_entries (url_hash TEXT PRIMARY KEY, site TEXT NOT NULL, url TEXT NOT NULL, "
+        "fetched_at REAL NOT NULL, size INTEGER NOT NULL, content_hash TEXT NOT NULL)"
+    )
+    connection.execute("INSERT INTO cache_entries VALUES ('old', 'example.com', 'https://example.com', 1.0, 500, 'abc')")
+    connection.commit()
+    connection.close()
+    
+    entry = get_entry(get_manifest(tmp_path), "old")
+    
+    assert entry.site == "example.com"
+    assert entry.compressed is False
+    assert entry.etag == ""
+
+def test_summarize_manifest(tmp_path):
+    """Test manifest summary counts."""
+    manifest = get_manifest(tmp_path)
+    record_entry(manifest, make_entry(url_hash="a"))
+    shared = make_entry(url_hash="b")
+    shared.compressed = True
+    record_entry(manifest, shared)
+    shared.url_hash = "c"
+    record_entry(manifest, shared)
+    
+    assert summarize_manifest(manifest) == {
+        'entries': 3,
+        'logical_bytes': 1500,
+        'compressed_entries': 2,
+        'objects': 1
+    }
+
+def test_count_content_references(tmp_path):
+    """Test counting references to compressed objects, one by one and all at once."""
+    manifest = get_manifest(tmp_path)
+    record_entry(manifest, make_entry(url_hash="a"))
+    shared = make_entry(url_hash="b")
+    shared.compressed = True
+    record_entry(manifest, shared)
+    shared.url_hash = "c"
+    record_entry(manifest, shared)
+    
+    assert count_content_references(manifest, shared.content_hash) == 2
+    assert count_all_content_references(manifest) == {shared.content_hash: 2}
+    
+    # Reference counts use an index instead of scanning every entry
+    plan = manifest.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM cache_entries WHERE compressed = 1 AND content_hash = ?",
+        (shared.content_hash,)
+    ).fetchall()
+    assert "idx_cache_entries_content" in str(plan)
+
+def test_parse_cache_filename():
+    """Test splitting cache filenames into site and URL hash."""
+    assert parse_cache_filename("example.com_abc123.html") == ("example.com", "abc123")
+    assert parse_cache_filename("my_site.org_abc123.html") == ("my_site.org", "abc123")
+    assert parse_cache_filename("abc123.html") == ("", "abc123")
+
+def test_read_cache_file_entry(tmp_path):
+    """Test indexing a cache file from disk."""
+    cache_file = tmp_path / "example.com_abc123.html"
+    cache_file.write_text("<!-- https://example.com/job1 -->\n<html>Job</html>", encoding='utf-8')
+    
+    entry = read_cache_file_entry(cache_file)
+    
+    assert entry.site == "example.com"
+    assert entry.url_hash == "abc123"
+    assert entry.url == "https://example.com/job1"
+    assert entry.size == len(cache_file.read_text(encoding='utf-8'))
+    assert entry.content_hash == hash_content("<html>Job</html>")
+    
+    assert read_cache_file_entry(tmp_path / "missing.html") is None
+
+def test_rebuild_manifest(tmp_path):
+    """Test rebuilding the manifest from the cache directory."""
+    manifest = get_manifest(tmp_path)
+    record_entry(manifest, make_entry(url_hash="stale"))
+    
+    (tmp_path / "example.com_one.html").write_text("<!-- https://example.com/1 -->\n<html>1</html>")
+    (tmp_path / "example.com_two.html").write_text("<!-- https://example.com/2 -->\n<html>2</html>")
+    (tmp_path / "notes.txt").write_text("not a cache file")
+    
+    assert rebuild_manifest(tmp_path) == 2
+    assert count_entries(manifest) == 2
+    assert get_entry(manifest, "stale") is None
+    assert get_entry(manifest, "one").url == "https://example.com/1"
+    
+    # Compressed entries have no plain file and survive a rebuild
+    compressed = make_entry(url_hash="packed")
+    compressed.compressed = True
+    record_entry(manifest, compressed)
+    assert rebuild_manifest(tmp_path) == 2
+    assert get_entry(manifest, "packed") == compressed
+    
+    # Validators survive a rebuild while the page content is unchanged
+    one = get_entry(manifest, "one")
+    touch_entry(manifest, "one", one.fetched_at, '"v1"', "")
+    assert rebuild_manifest(tmp_path) == 2
+    assert get_entry(manifest, "one").etag == '"v1"'
\ No newline at end of file
@@ -0,0 +1,196 @@
+import json
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import patch
+
+from functions.functions_queue import (
+    Task,
+    QueueBackend,
+    SQLiteQueueBackend,
+    RemoteQueueBackend,
+    handle_queue_request,
+    create_http_transport,
+    serve_queue,
+    open_queue,
+    TASK_SITE,
+    TASK_LISTING_PAGE,
+    TASK_DETAIL_PAGE
+)
+
+@pytest.fixture
+def backend(tmp_path):
+    """Create a SQLite queue in a temporary directory."""
+    backend = SQLiteQueueBackend(tmp_path / "queue.sqlite3")
+    yield backend
+    backend.close()
+
+def test_put_ignores_queued_keys(backend):
+    """Test that a task key is only ever queued once."""
+    tasks = [Task("detail:a", TASK_DETAIL_PAGE, "example.com"), Task("detail:b", TASK_DETAIL_PAGE, "example.com")]
+    
+    assert backend.put(tasks) == 2
+    assert backend.put(tasks + [Task("detail:c", TASK_DETAIL_PAGE, "example.com")]) == 1
+    assert backend.count_open() == 3
+
+def test_lease_order_and_politeness(backend):
+    """Test that listing pages go first and each host waits out its delay."""
+    backend.put([
+        Task("site:x", TASK_SITE),
+        Task("detail:a", TASK_DETAIL_PAGE, "a.com", {'url': "https://a.com/1"}),
+        Task("detail:a2", TASK_DETAIL_PAGE, "a.com"),
+        Task("listing:a", TASK_LISTING_PAGE, "a.com"),
+        Task("detail:b", TASK_DETAIL_PAGE, "b.com")
+    ])
+    
+    first = backend.lease("w1", politeness_delay=60)
+    assert (first.task_key, first.attempts) == ("listing:a", 1)
+    # a.com is now resting, so other workers get b.com and the hostless site task
+    assert backend.lease("w2", politeness_delay=60).task_key == "detail:b"
+    assert backend.lease("w2", politeness_delay=60).task_key == "site:x"
+    assert backend.lease("w2", politeness_delay=60) is None
+    
+    with patch('functions.functions_queue.time.time', return_value=time.time() + 61):
+        task = backend.lease("w2", politeness_delay=60)
+    assert task.payload == {'url': "https://a.com/1"}
+
+def test_complete_and_fail(backend):
+    """Test completing tasks, retries with backoff and giving up."""
+    backend.put([Task("detail:a", TASK_DETAIL_PAGE, "a.com"), Task("detail:b", TASK_DETAIL_PAGE, "b.com")])
+    task = backend.lease("w1", politeness_delay=0)
+    
+    assert not backend.complete(task.task_id, "w2")  # Not the lease owner
+    assert backend.complete(task.task_id, "w1")
+    
+    task = backend.lease("w1", politeness_delay=0)
+    assert backend.fail(task.task_id, "w1", "timeout", max_attempts=2, retry_delay=0)
+    task = backend.lease("w1", politeness_delay=0)
+    assert task.attempts == 2
+    assert backend.fail(task.task_id, "w1", "timeout", max_attempts=2, retry_delay=0)
+    
+    assert backend.lease("w1", politeness_delay=0) is None
+    assert backend.count_open() == 0
+    assert backend.stats() == {'done': 1, 'failed': 1}
+
+def test_retry_waits_for_backoff(backend):
+    """Test that a failed task is not leased again before its retry delay."""
+    backend.put([Task("detail:a", TASK_DETAIL_PAGE, "a.com")])
+    task = backend.lease("w1", politeness_delay=0)
+    backend.fail(task.task_id, "w1", "timeout", retry_delay=60)
+    
+    assert backend.lease("w1", politeness_delay=0) is None
+    assert backend.count_open() == 1
+
+def test_expired_lease_is_released(backend):
+    """Test that tasks of a vanished worker become available again."""
+    backend.put([Task("detail:a", TASK_DETAIL_PAGE, "a.com")])
+    task = backend.lease("w1", lease_seconds=0, politeness_delay=0)
+    
+    with patch('functions.functions_queue.time.time', return_value=time.time() + 1):
+        retaken = backend.lease("w2", politeness_delay=0)
+    assert (retaken.task_key, retaken.attempts) == ("detail:a", 2)
+    assert not backend.complete(task.task_id, "w1")
+    assert backend.complete(task.task_id, "w2")
+
+def test_expired_lease_gives_up_after_max_attempts(backend):
+    """Test that a task whose workers keep vanishing is eventually marked failed."""
+    backend.put([Task("detail:a", TASK_DETAIL_PAGE, "a.com")])
+    now = time.time()
+    for attempt in range(2):
+        with patch('functions.functions_queue.time.time', return_value=now + attempt):
+            assert backend.lease("w1", lease_seconds=0, politeness_delay=0, max_attempts=2) is not None
+            
+    with patch('functions.functions_queue.time.time', return_value=now + 2):
+        assert backend.lease("w1", lease_seconds=0, politeness_delay=0, max_attempts=2) is None
+    assert backend.stats() == {'failed': 1}
+
+def test_next_lease_time(backend):
+    """Test that idle workers learn when the earliest host slot opens."""
+    assert backend.next_lease_time() is None
+    
+    backend.put([Task("detail:a", TASK_DETAIL_PAGE, "a.com"), Task("detail:a2", TASK_DETAIL_PAGE, "a.com")])
+    assert backend.next_lease_time() <= time.time()
+    
+    before = time.time()
+    backend.lease("w1", politeness_delay=60)
+    assert before + 60 <= backend.next_lease_time() <= time.time() + 60
+
+def test_queue_backend_is_abstract():
+    """Test that a backend missing an operation cannot be created."""
+    class PartialBackend(QueueBackend):
+        def put(self, tasks):
+            return 0
+    
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+def test_reset(backend):
+    """Test that reset forgets tasks and host slots."""
+    backend.put([Task("detail:a", TASK_DETAIL_PAGE, "a.com")])
+    backend.lease("w1", politeness_delay=60)
+    backend.reset()
+    
+    assert backend.stats() == {}
+    assert backend.put([Task("detail:a", TASK_DETAIL_PAGE, "a.com")]) == 1
+    assert backend.lease("w1") is not None
+
+def test_remote_backend(backend):
+    """Test the remote backend through a local stand-in for the network."""
+    def local_transport(request):
+        # Round trip through JSON as a real transport would
+        return json.loads(json.dumps(handle_queue_request(backend, json.loads(json.dumps(request)))))
+    remote = RemoteQueueBackend(local_transport)
+    
+    assert remote.put([Task("detail:a", TASK_DETAIL_PAGE, "a.com", {'url': "https://a.com/1"})]) == 1
+    task = remote.lease("w1", politeness_delay=0)
+    assert task == Task("detail:a", TASK_DETAIL_PAGE, "a.com", {'url': "https://a.com/1"}, task.task_id, 1)
+    assert remote.stats() == {'leased': 1}
+    assert remote.fail(task.task_id, "w1", "boom", retry_delay=0)
+    assert remote.complete(remote.lease("w1", politeness_delay=0).task_id, "w1")
+    assert remote.count_open() == 0
+    assert remote.next_lease_time() is None
+    
+    with pytest.raises(RuntimeError, match="Unknown operation"):
+        remote._request('drop')
+
+def test_serve_queue(backend):
+    """Test remote workers reaching a queue over HTTP."""
+    server = serve_queue(backend, '127.0.0.1', 0, "secret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        remote = RemoteQueueBackend(create_http_transport(url, "secret"))
+        
+        assert remote.put([Task("site:x", TASK_SITE)]) == 1
+        assert remote.lease("w1").task_key == "site:x"
+        assert backend.stats() == {'leased': 1}
+        assert isinstance(open_queue(url, "secret"), RemoteQueueBackend)
+        
+        # Requests without the shared token never reach the queue
+        intruder = RemoteQueueBackend(create_http_transport(url, "guess"))
+        with pytest.raises(requests.HTTPError, match="401"):
+            intruder.reset()
+        assert requests.post(url, json={'op': 'reset'}, timeout=5).status_code == 401
+        assert backend.stats() == {'leased': 1}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_queue_token_required(backend, monkeypatch):
+    """Test that the queue server and its clients refuse to run without a token."""
+    monkeypatch.delenv("QUEUE_TOKEN", raising=False)
+    with pytest.raises(ValueError, match="QUEUE_TOKEN"):
+        serve_queue(backend, '127.0.0.1', 0)
+    with pytest.raises(ValueError, match="QUEUE_TOKEN"):
+        open_queue("http://127.0.0.1:8765/")
+        
+    monkeypatch.setenv("QUEUE_TOKEN", "secret")
+    assert isinstance(open_queue("http://127.0.0.1:8765/"), RemoteQueueBackend)
+
+def test_open_queue(tmp_path):
+    """Test that paths open a SQLite queue."""
+    queue = open_queue(str(tmp_path / "queue.sqlite3"))
+    assert isinstance(queue, SQLiteQueueBackend)
+    queue.close()
\ No newline at end of file
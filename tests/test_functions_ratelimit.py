@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import patch
+from functions.functions_ratelimit import (
+    AdaptiveRateLimiter,
+    load_host_rates,
+    save_host_rates
+)
+
+def test_record_increases_rate_when_healthy():
+    """Test additive rate increase on healthy responses."""
+    limiter = AdaptiveRateLimiter(min_delay=0.5, max_delay=30, initial_delay=2.0)
+    
+    delays = [limiter.record("example.com", 0.5, True) for _ in range(10)]
+    
+    assert delays == sorted(delays, reverse=True)
+    assert delays[-1] == pytest.approx(1 / (0.5 + 10 * 0.05))
+    
+    # The configured ceiling on request rate is never exceeded
+    for _ in range(500):
+        limiter.record("example.com", 0.5, True)
+    assert limiter.get_delay("example.com") == 0.5
+
+def test_record_backs_off():
+    """Test multiplicative back-off on throttling, failures and slowdowns."""
+    limiter = AdaptiveRateLimiter(min_delay=0.5, max_delay=20, initial_delay=2.0)
+    limiter.record("example.com", 1.0, True)
+    baseline = limiter.get_delay("example.com")
+    
+    assert limiter.record("example.com", 1.0, True, status=429) == pytest.approx(baseline * 2)
+    assert limiter.record("example.com", 1.0, False) == pytest.approx(baseline * 4)
+    assert limiter.record("example.com", 5.0, True) == pytest.approx(baseline * 6)
+    assert limiter.record("example.com", 1.0, False) == 20
+    
+    # Other hosts are unaffected
+    assert limiter.get_delay("other.com") == 2.0
+
+def test_wait_paces_requests():
+    """Test that consecutive requests to a host are spaced by its delay."""
+    limiter = AdaptiveRateLimiter(min_delay=0.5, max_delay=30, initial_delay=3.0)
+    
+    with patch('functions.functions_ratelimit.time.monotonic', return_value=100.0), \
+         patch('functions.functions_ratelimit.time.sleep') as mock_sleep:
+        assert limiter.wait("example.com") == 0
+        assert limiter.wait("example.com") == 3.0
+        assert limiter.wait("other.com") == 0
+        mock_sleep.assert_called_once_with(3.0)
+        
+        # Reserving claims the next slot without sleeping
+        assert limiter.reserve("example.com") == 6.0
+        mock_sleep.assert_called_once()
+
+def test_rates_persist(tmp_path):
+    """Test that learned delays are saved and reloaded."""
+    path = tmp_path / "host_rates.json"
+    save_host_rates(path, {"other.com": 4.0})
+    
+    limiter = AdaptiveRateLimiter(path, min_delay=0.5, max_delay=30)
+    limiter.record("example.com", 1.0, False)
+    limiter.save()
+    
+    assert load_host_rates(path) == {"example.com": 4.0, "other.com": 4.0}
+    assert AdaptiveRateLimiter(path).get_delay("example.com") == 4.0
+    
+    # Saved delays are clamped to the current floor and ceiling
+    assert AdaptiveRateLimiter(path, min_delay=0.5, max_delay=3).get_delay("example.com") == 3
+    
+    (tmp_path / "broken.json").write_text("{")
+    assert load_host_rates(tmp_path / "broken.json") == {}
\ No newline at end of file
@@ -0,0 +1,77 @@
+import pytest
+
+from functions.functions_schedule import (
+    CrawlScheduler,
+    SiteSchedule,
+    load_schedule,
+    save_schedule,
+    plan_crawl_interval,
+    MIN_CRAWL_INTERVAL,
+    MAX_CRAWL_INTERVAL,
+    DEFAULT_CRAWL_INTERVAL,
+    FAILED_CRAWL_RETRY
+)
+
+HOUR = 3600.0
+
+def test_plan_crawl_interval():
+    """Test that busy listings are crawled often and quiet ones rarely."""
+    assert plan_crawl_interval(None) == DEFAULT_CRAWL_INTERVAL
+    assert plan_crawl_interval(0) == MAX_CRAWL_INTERVAL
+    assert plan_crawl_interval(1000) == MIN_CRAWL_INTERVAL
+    assert plan_crawl_interval(1) == 5 * HOUR
+    assert plan_crawl_interval(2) < plan_crawl_interval(1)
+
+def test_schedule_round_trip(tmp_path):
+    """Test saving and loading schedule state."""
+    path = tmp_path / "schedule.json"
+    schedule = {"https://example.com/jobs?page=": SiteSchedule(100.0, 200.0, 1.5)}
+    save_schedule(path, schedule)
+    
+    assert load_schedule(path) == schedule
+    assert load_schedule(tmp_path / "missing.json") == {}
+
+def test_crawl_scheduler(tmp_path):
+    """Test choosing due listings and planning crawls from observed posting rates."""
+    configs = [{'url': "https://hot.com/jobs?page="}, {'url': "https://dead.com/jobs?page="}]
+    scheduler = CrawlScheduler(tmp_path / "schedule.json")
+    start = 1_000_000.0
+    
+    # Never crawled listings are due straight away
+    assert scheduler.get_due_configs(configs, now=start) == configs
+    
+    scheduler.record_crawl("https://hot.com/jobs?page=", 300, now=start)
+    scheduler.record_crawl("https://dead.com/jobs?page=", 300, now=start)
+    assert scheduler.get_due_configs(configs, now=start + HOUR) == []
+    assert scheduler.get_seconds_until_due(configs, now=start + HOUR) == DEFAULT_CRAWL_INTERVAL - HOUR
+    
+    now = start + DEFAULT_CRAWL_INTERVAL
+    hot = scheduler.record_crawl("https://hot.com/jobs?page=", 48, now=now)
+    dead = scheduler.record_crawl("https://dead.com/jobs?page=", 0, now=now)
+    assert hot.new_jobs_per_hour == pytest.approx(2.0)
+    assert hot.next_due - now == pytest.approx(2.5 * HOUR)
+    assert dead.next_due - now == MAX_CRAWL_INTERVAL
+    assert scheduler.get_due_configs(configs, now=now + 3 * HOUR) == [configs[0]]
+    
+    scheduler.save()
+    assert CrawlScheduler(tmp_path / "schedule.json").sites == scheduler.sites
+
+def test_crawl_scheduler_records_failure():
+    """Test that a failed crawl is retried soon without touching the posting rate."""
+    scheduler = CrawlScheduler()
+    url = "https://a.com/"
+    scheduler.record_crawl(url, 10, now=1000.0)
+    before = scheduler.sites[url].new_jobs_per_hour
+    
+    entry = scheduler.record_failure(url, now=5000.0)
+    assert entry.next_due == 5000.0 + FAILED_CRAWL_RETRY
+    assert (entry.last_crawl, entry.new_jobs_per_hour) == (1000.0, before)
+
+def test_crawl_scheduler_orders_overdue_first():
+    """Test that the most overdue listing is crawled first."""
+    scheduler = CrawlScheduler()
+    configs = [{'url': "https://a.com/"}, {'url': "https://b.com/"}]
+    scheduler.sites["https://a.com/"] = SiteSchedule(last_crawl=1.0, next_due=50.0)
+    scheduler.sites["https://b.com/"] = SiteSchedule(last_crawl=1.0, next_due=10.0)
+    
+    assert scheduler.get_due_configs(configs, now=100.0) == [configs[1], configs[0]]
\ No newline at end of file
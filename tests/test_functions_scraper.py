@@ -8,6 +8,10 @@ from functions.functions_scraper import (
     ensure_cache_dir_exists,
     generate_url_hash,
     create_cache_filename,
+    create_cache_path,
+    get_cache_path,
+    find_cache_file,
+    migrate_cache_layout,
     get_file_length,
     should_update_cache,
     manage_cache_file,
@@ -15,13 +19,21 @@ from functions.functions_scraper import (
     is_new_job,
     should_stop_scraping,
     process_jobs_page,
+    compile_job_xpath,
+    extract_links_from_html,
     parse_scraper_config,
     load_scraper_configs,
     randomize_configs,
+    group_configs_by_host,
     get_site_name,
     determine_start_page,
-    scrape_single_site
+    scrape_single_site,
+    fetch_detail_page,
+    download_links_async,
+    download_all_links
 )
+from functions.functions_http import FetchResult
+from functions.functions_manifest import ManifestEntry
 
 @pytest.fixture
 def temp_cache_dir(tmp_path):
@@ -67,6 +79,49 @@ def test_create_cache_filename():
     assert filename.endswith(".html")
     assert generate_url_hash(url) in filename
 
+def test_get_cache_path(tmp_path, monkeypatch):
+    """Test sharded cache path generation."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    url = "https://example.com/jobs"
+    url_hash = generate_url_hash(url)
+    
+    path = create_cache_path("test_site", url)
+    
+    assert path == cache_dir / url_hash[:2] / url_hash[2:4] / create_cache_filename("test_site", url)
+    assert get_cache_path(create_cache_filename("test_site", url)) == path
+
+def test_find_cache_file(tmp_path, monkeypatch):
+    """Test transparent reads from the old flat layout."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    filename = create_cache_filename("test_site", "https://example.com/jobs")
+    
+    # Uncached files resolve to the sharded location
+    assert find_cache_file(filename) == get_cache_path(filename)
+    
+    # Files still in the flat layout are found there
+    (cache_dir / filename).write_text("legacy")
+    assert find_cache_file(filename) == cache_dir / filename
+
+def test_migrate_cache_layout(tmp_path, monkeypatch):
+    """Test resumable migration into the sharded layout."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    filenames = [create_cache_filename("test_site", f"https://example.com/job{i}") for i in range(3)]
+    for filename in filenames:
+        (cache_dir / filename).write_text(f"content of {filename}")
+        
+    assert migrate_cache_layout() == 3
+    assert not list(cache_dir.glob("*.html"))
+    for filename in filenames:
+        assert get_cache_path(filename).read_text() == f"content of {filename}"
+        
+    # Running again is a no-op
+    assert migrate_cache_layout() == 0
+
 def test_get_file_length(tmp_path):
     """Test file length calculation."""
     test_file = tmp_path / "test.txt"
@@ -120,6 +175,140 @@ def test_manage_cache_file(tmp_path, monkeypatch):
         min_length=5
     )
 
+def test_manage_cache_file_uses_manifest(tmp_path, monkeypatch):
+    """Test that indexed pages are checked without reading the HTML."""
+    from functions.functions_scraper import save_to_cache
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    url = "https://example.com/job1"
+    filename = create_cache_filename("example.com", url)
+    
+    save_to_cache("example.com", url, "<html>" + "x" * 200 + "</html>")
+    
+    with patch('functions.functions_scraper.should_update_cache') as mock_should_update, \
+         patch('functions.functions_scraper.get_file_length') as mock_length, \
+         patch('functions.functions_scraper.find_cache_file') as mock_find:
+        assert manage_cache_file(filename)
+        assert not manage_cache_file(filename, max_age=timedelta(seconds=0))
+        mock_should_update.assert_not_called()
+        mock_length.assert_not_called()
+        mock_find.assert_not_called()
+        
+    # Entries shorter than the minimum length are discarded
+    save_to_cache("example.com", url, "short")
+    assert not manage_cache_file(filename)
+    assert not create_cache_path("example.com", url).exists()
+
+def test_save_to_cache_compressed(tmp_path, monkeypatch):
+    """Test compressed, content-deduplicated cache storage."""
+    from functions.functions_scraper import save_to_cache, load_from_cache, get_object_path
+    from functions.functions_manifest import hash_content
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    body = "<html>" + "Same job description. " * 50 + "</html>"
+    urls = ["https://example.com/job1", "https://example.com/job1?ref=feed"]
+    
+    for url in urls:
+        save_to_cache("example.com", url, body, compress=True)
+        
+    # Both URLs share a single compressed object and no plain files are written
+    objects = list((cache_dir / "objects").rglob("*.html.gz"))
+    assert objects == [get_object_path(hash_content(body))]
+    assert objects[0].stat().st_size < len(body)
+    assert not list(cache_dir.rglob("*.html"))
+    
+    # Reads decompress transparently and freshness still comes from the manifest
+    for url in urls:
+        assert load_from_cache("example.com", url) == f"<!-- {url} -->\n{body}"
+        assert manage_cache_file(create_cache_filename("example.com", url))
+        
+    # Plain entries read back the same way
+    save_to_cache("example.com", "https://example.com/job2", body)
+    assert load_from_cache("example.com", "https://example.com/job2") == f"<!-- https://example.com/job2 -->\n{body}"
+    assert load_from_cache("example.com", "https://example.com/missing") is None
+
+def test_save_to_cache_skips_unchanged_content(tmp_path, monkeypatch):
+    """Test that refreshing an unchanged page only bumps its freshness metadata."""
+    from functions.functions_scraper import save_to_cache, get_cache_entry
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    url = "https://example.com/job1"
+    body = "<html>" + "x" * 200 + "</html>"
+    
+    save_to_cache("example.com", url, body, etag='"v1"')
+    first = get_cache_entry("example.com", url)
+    
+    with patch('functions.functions_scraper.write_bytes_atomic') as mock_write:
+        save_to_cache("example.com", url, body)
+        mock_write.assert_not_called()
+    refreshed = get_cache_entry("example.com", url)
+    assert refreshed.fetched_at >= first.fetched_at
+    assert refreshed.etag == '"v1"'
+    
+    # Changed content is rewritten
+    save_to_cache("example.com", url, body.replace("x", "y"), etag='"v2"')
+    assert "y" * 200 in create_cache_path("example.com", url).read_text()
+    assert get_cache_entry("example.com", url).etag == '"v2"'
+
+def test_download_all_links_revalidates_stale_pages(tmp_path, monkeypatch, mock_driver):
+    """Test that a 304 response refreshes the cached page without saving it again."""
+    from functions.functions_scraper import save_to_cache, get_cache_entry
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    url = "https://example.com/job1"
+    save_to_cache("example.com", url, "<html>" + "x" * 200 + "</html>", etag='"v1"')
+    
+    with patch('functions.functions_scraper.manage_cache_file', return_value=False), \
+         patch('functions.functions_scraper.fetch_detail_page', return_value=(FetchResult(status=304), "http")) as mock_fetch, \
+         patch('functions.functions_scraper.save_to_cache') as mock_save:
+        download_all_links([url], mock_driver, "example.com", session=Mock())
+        
+    assert mock_fetch.call_args.args[4].etag == '"v1"'
+    mock_save.assert_not_called()
+    assert get_cache_entry("example.com", url).etag == '"v1"'
+
+def test_download_all_links_refetches_missing_not_modified_page(tmp_path, monkeypatch, mock_driver):
+    """Test that a 304 for a cached page that has vanished triggers an unconditional refetch."""
+    from functions.functions_scraper import save_to_cache
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    url = "https://example.com/job1"
+    save_to_cache("example.com", url, "<html>" + "x" * 200 + "</html>", etag='"v1"')
+    create_cache_path("example.com", url).unlink()
+    
+    body = "<html>" + "y" * 200 + "</html>"
+    with patch('functions.functions_scraper.manage_cache_file', return_value=False), \
+         patch('functions.functions_scraper.fetch_detail_page', side_effect=[
+             (FetchResult(status=304), "http"),
+             (FetchResult(body, 200), "http")
+         ]) as mock_fetch:
+        download_all_links([url], mock_driver, "example.com", session=Mock())
+        
+    assert mock_fetch.call_args_list[0].args[4].etag == '"v1"'
+    assert len(mock_fetch.call_args_list[1].args) == 4
+    assert create_cache_path("example.com", url).read_text().endswith(body)
+
+def test_run_detail_task_refetches_missing_not_modified_page(tmp_path, monkeypatch, mock_driver):
+    """Test that a queued detail task recovers from a 304 for a vanished cached page."""
+    from functions.functions_scraper import save_to_cache, build_detail_task, run_detail_task, ScrapeOptions
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    url = "https://example.com/job1"
+    save_to_cache("example.com", url, "<html>" + "x" * 200 + "</html>", etag='"v1"')
+    create_cache_path("example.com", url).unlink()
+    
+    body = "<html>" + "y" * 200 + "</html>"
+    task = build_detail_task({'name': 'example.com', 'url': 'https://example.com/jobs'}, url)
+    with patch('functions.functions_scraper.manage_cache_file', return_value=False), \
+         patch('functions.functions_scraper.get_fetch_mode', return_value="http"), \
+         patch('functions.functions_scraper.fetch_detail_page', side_effect=[
+             (FetchResult(status=304), "http"),
+             (FetchResult(body, 200), "http")
+         ]):
+        run_detail_task(task, mock_driver, Mock(), ScrapeOptions())
+        
+    assert create_cache_path("example.com", url).read_text().endswith(body)
+
 def test_normalize_url():
     """Test URL normalization."""
     base_url = "https://example.com"
@@ -172,6 +361,117 @@ def test_process_jobs_page(mock_driver):
     assert len(jobs) == 2
     assert all(job.startswith('https://example.com/') for job in jobs)
 
+def test_fetch_detail_page(mock_driver):
+    """Test HTTP-first fetching with browser fallback."""
+    rendered = "<html><body><p>" + "Job description text. " * 20 + "</p></body></html>"
+    session = Mock()
+    
+    # Usable HTTP response is returned without touching the browser
+    with patch('functions.functions_scraper.fetch_page', return_value=FetchResult(rendered, 200)), \
+         patch('functions.functions_scraper.navigate_and_wait') as mock_navigate:
+        result, mode = fetch_detail_page("https://example.com/job1", mock_driver, session)
+        assert result.content == rendered
+        assert mode == "http"
+        mock_navigate.assert_not_called()
+    
+    # Short or JS-gated responses fall back to the browser
+    with patch('functions.functions_scraper.fetch_page', return_value=FetchResult("<div id='root'></div>", 200)), \
+         patch('functions.functions_scraper.navigate_and_wait') as mock_navigate, \
+         patch('functions.functions_scraper.get_page_html', return_value="<html>rendered</html>"):
+        result, mode = fetch_detail_page("https://example.com/job1", mock_driver, session)
+        assert result.content == "<html>rendered</html>"
+        assert mode == "selenium"
+        mock_navigate.assert_called_once()
+    
+    # A remembered browser mode skips the HTTP probe
+    with patch('functions.functions_scraper.fetch_page') as mock_fetch, \
+         patch('functions.functions_scraper.navigate_and_wait'), \
+         patch('functions.functions_scraper.get_page_html', return_value="<html>rendered</html>"):
+        fetch_detail_page("https://example.com/job1", mock_driver, session, "selenium")
+        mock_fetch.assert_not_called()
+    
+    # Stale entries with validators are revalidated with a conditional request
+    cached = ManifestEntry("abc", "example.com", "https://example.com/job1", 0.0, 500, "hash", etag='"v1"')
+    with patch('functions.functions_scraper.fetch_page', return_value=FetchResult(status=304)) as mock_fetch, \
+         patch('functions.functions_scraper.navigate_and_wait') as mock_navigate:
+        result, mode = fetch_detail_page("https://example.com/job1", mock_driver, session, None, cached)
+        assert result.not_modified
+        assert mock_fetch.call_args.args[2] == {"If-None-Match": '"v1"'}
+        mock_navigate.assert_not_called()
+
+def test_download_all_links_remembers_fetch_mode(tmp_path, monkeypatch, mock_driver):
+    """Test that the working fetch mode is stored per site."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    links = ["https://example.com/job1", "https://example.com/job2"]
+    
+    with patch('functions.functions_scraper.fetch_detail_page', return_value=(FetchResult("<html>" + "x" * 200 + "</html>", 200), "http")) as mock_fetch:
+        download_all_links(links, mock_driver, "example.com", session=Mock())
+        
+    assert mock_fetch.call_count == 2
+    # The first page probes, the second reuses the learned mode
+    assert mock_fetch.call_args_list[0].args[3] is None
+    assert mock_fetch.call_args_list[1].args[3] == "http"
+    assert "example.com" in (cache_dir / "fetch_modes.json").read_text()
+
+def test_download_links_async(tmp_path, monkeypatch):
+    """Test concurrent HTTP downloading writes through the cache."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    rendered = "<html><body><p>" + "Job description text. " * 20 + "</p></body></html>"
+    links = ["https://example.com/job1", "https://example.com/job2"]
+    
+    def fake_download(urls, on_page, user_agent, per_host_limit, delay, request_headers=None, rate_limiter=None):
+        from functions.functions_http import DownloadStats
+        stats = DownloadStats(elapsed=1.0)
+        for url in urls:
+            if on_page(url, FetchResult(rendered if url.endswith("job1") else "<div id='root'></div>", 200)):
+                stats.fetched += 1
+            else:
+                stats.failed_urls.append(url)
+        return stats
+    
+    with patch('functions.functions_scraper.download_all_async', side_effect=fake_download):
+        fetched, fallback = download_links_async(links, "example.com", 4)
+        
+    assert fetched == 1
+    assert fallback == ["https://example.com/job2"]
+    assert create_cache_path("example.com", links[0]).exists()
+    assert not create_cache_path("example.com", links[1]).exists()
+
+def test_compile_job_xpath():
+    """Test that compiled XPaths are cached for the run."""
+    assert compile_job_xpath("//a[@class='job']") is compile_job_xpath("//a[@class='job']")
+
+def test_extract_links_from_html():
+    """Test offline XPath evaluation of rendered HTML."""
+    page_html = """<html><body><ul>
+        <li><a class="job" href="/jobs/1">Job 1</a></li>
+        <li><a class="job" href="https://other.com/jobs/2">Job 2</a></li>
+        <li><a class="job">No link</a></li>
+        <li><a class="nav" href="/page/2">Next</a></li>
+    </ul></body></html>"""
+    
+    links = extract_links_from_html(page_html, "//a[@class='job']", "https://example.com/careers/")
+    assert links == ["https://example.com/jobs/1", "https://other.com/jobs/2"]
+    
+    # Attribute-selecting XPaths and <base href> are honoured
+    based = page_html.replace("<html>", "<html><head><base href='https://cdn.example.com/'></head>")
+    links = extract_links_from_html(based, "//a[@class='job']/@href", "https://example.com/careers/")
+    assert links == ["https://cdn.example.com/jobs/1", "https://other.com/jobs/2"]
+    
+    assert extract_links_from_html("", "//a", "https://example.com") == []
+
+def test_process_jobs_page_offline(mock_driver):
+    """Test job page processing without querying the live DOM."""
+    mock_driver.page_source = '<html><body><a class="job" href="/job1">1</a><a class="job" href="/job2">2</a></body></html>'
+    mock_driver.current_url = "https://example.com/jobs?page=1"
+    
+    jobs = process_jobs_page(mock_driver, "//a[@class='job']", "https://example.com", {"https://example.com/job2"}, offline=True)
+    
+    assert jobs == ["https://example.com/job1"]
+    mock_driver.find_elements.assert_not_called()
+
 def test_parse_scraper_config():
     """Test parsing of CSV row into config dict."""
     row = ['timestamp', 'unix_time', '//div[@class="job"]', 'https://example.com/jobs?page=', '1']
@@ -180,6 +480,16 @@ def test_parse_scraper_config():
     assert config['xpath'] == '//div[@class="job"]'
     assert config['url'] == 'https://example.com/jobs?page='
     assert config['increment'] == 1
+    assert config['allowlist'] == []
+    
+    # Optional scrape-lite allowlist column
+    row_with_allowlist = row + ['fonts cdn.example.com']
+    assert parse_scraper_config(row_with_allowlist)['allowlist'] == ['fonts', 'cdn.example.com']
+    assert parse_scraper_config(row_with_allowlist)['total_count_xpath'] == ''
+    
+    # Optional total-count XPath column
+    row_with_total = row_with_allowlist + ['//span[@id="count"]']
+    assert parse_scraper_config(row_with_total)['total_count_xpath'] == '//span[@id="count"]'
 
 def test_load_scraper_configs(tmp_path):
     """Test loading configurations from CSV file."""
@@ -212,6 +522,23 @@ def test_randomize_configs():
     # Check that original configs weren't modified
     assert configs[0]['url'] == 'url1'
 
+def test_group_configs_by_host():
+    """Test grouping of configurations by host."""
+    configs = [
+        {'url': 'https://a.com/jobs?page=', 'xpath': 'x', 'increment': 1},
+        {'url': 'https://b.com/jobs?page=', 'xpath': 'x', 'increment': 1},
+        {'url': 'https://a.com/careers/', 'xpath': 'y', 'increment': 10}
+    ]
+    
+    groups = group_configs_by_host(configs)
+    
+    assert len(groups) == 2
+    assert [config['url'] for config in groups[0]] == [
+        'https://a.com/jobs?page=',
+        'https://a.com/careers/'
+    ]
+    assert groups[1][0]['url'] == 'https://b.com/jobs?page='
+
 def test_get_site_name():
     """Test site name extraction from URL."""
     assert get_site_name("https://example.com/jobs") == "example.com"
@@ -224,8 +551,329 @@ def test_determine_start_page():
     assert determine_start_page(10) == 0
     assert determine_start_page(20) == 0
 
-def test_scrape_single_site(mock_driver):
+def test_generic_paged_scraper_incremental(tmp_path, monkeypatch, mock_driver):
+    """Test early stop on known jobs and skipping unchanged listings."""
+    from functions.functions_scraper import (
+        save_to_cache,
+        generic_paged_scraper_by_xpath,
+        IncrementalPagination,
+        fingerprint_jobs
+    )
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    pages = {
+        1: ["https://example.com/a", "https://example.com/b"],
+        2: ["https://example.com/c", "https://example.com/d"],
+        3: ["https://example.com/e"],
+        4: ["https://example.com/f"]
+    }
+    for page in (2, 3, 4):
+        for job in pages[page]:
+            save_to_cache("example.com", job, "<html>" + "x" * 200 + "</html>")
+    current_page = {}
+    
+    def fake_navigate(driver, url):
+        current_page['page'] = int(url.rsplit("=", 1)[1])
+    
+    def fake_process(driver, xpath, base_url, existing_jobs, offline):
+        return [job for job in pages.get(current_page['page'], []) if job not in existing_jobs]
+    
+    with patch('functions.functions_scraper.navigate_and_wait', side_effect=fake_navigate), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process), \
+         patch('functions.functions_scraper.time.sleep'):
+        incremental = IncrementalPagination(max_known_pages=2)
+        links = generic_paged_scraper_by_xpath("https://example.com/jobs?page=", mock_driver, "//a", incremental=incremental)
+        assert sorted(links) == pages[1] + pages[2] + pages[3]
+        assert incremental.fingerprint == fingerprint_jobs(pages[1])
+        assert not incremental.unchanged
+        
+        # An identical first page skips the listing after one page load
+        incremental = IncrementalPagination(max_known_pages=2, previous_fingerprint=fingerprint_jobs(pages[1]))
+        links = generic_paged_scraper_by_xpath("https://example.com/jobs?page=", mock_driver, "//a", incremental=incremental)
+        assert links == []
+        assert incremental.unchanged
+        assert current_page['page'] == 1
+
+def test_seen_urls(tmp_path, monkeypatch):
+    """Test that downloads are remembered and existing caches seed the store."""
+    from functions.functions_scraper import save_to_cache, get_seen_urls, find_known_jobs
+    from functions.functions_manifest import get_manifest, record_entry, ManifestEntry
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    
+    # Pages cached before the store existed are picked up from the manifest
+    record_entry(get_manifest(cache_dir), ManifestEntry("abc", "example.com", "https://example.com/old", 1.0, 500, "hash"))
+    assert find_known_jobs(["https://example.com/old", "https://example.com/new"]) == {"https://example.com/old"}
+    
+    save_to_cache("example.com", "https://example.com/new", "<html>" + "x" * 200 + "</html>")
+    assert find_known_jobs(["https://example.com/new"]) == {"https://example.com/new"}
+    assert get_seen_urls() is get_seen_urls()
+
+def test_download_all_links_adaptive_rate(tmp_path, monkeypatch, mock_driver):
+    """Test that a rate limiter paces detail pages instead of the fixed sleep."""
+    from functions.functions_ratelimit import AdaptiveRateLimiter
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    # Job pages hosted on an applicant tracking system rather than the listing's site
+    links = ["https://jobs.example-ats.com/job1", "https://jobs.example-ats.com/job2"]
+    limiter = AdaptiveRateLimiter(initial_delay=2.0)
+    responses = [
+        (FetchResult("<html>" + "x" * 200 + "</html>", 200), "selenium"),
+        (FetchResult(status=429), "http")
+    ]
+    
+    with patch('functions.functions_scraper.fetch_detail_page', side_effect=responses), \
+         patch.object(limiter, 'wait') as mock_wait, \
+         patch('functions.functions_scraper.time.sleep') as mock_sleep:
+        download_all_links(links, mock_driver, "example.com", sleep_time=2, rate_limiter=limiter)
+        
+    assert mock_wait.call_count == 2
+    mock_wait.assert_called_with("jobs.example-ats.com")
+    mock_sleep.assert_not_called()
+    assert limiter.get_delay("jobs.example-ats.com") > 2.0
+    assert limiter.get_delay("example.com") == 2.0
+
+def test_speculative_paged_scraper(mock_driver):
+    """Test that pages load ahead in tabs and stop after the end of the listing."""
+    from functions.functions_scraper import speculative_paged_scraper_by_xpath
+    from functions.functions_ratelimit import AdaptiveRateLimiter
+    pages = {page: [f"https://example.com/job{page}-{index}" for index in range(3)] for page in range(1, 6)}
+    tab_pages = {}
+    requested = []
+    current = {}
+    
+    def fake_start(driver, handle, url):
+        page = int(url.rsplit("=", 1)[1])
+        tab_pages[handle] = page
+        requested.append(page)
+    
+    def fake_wait(driver, handle, *args):
+        current['page'] = tab_pages[handle]
+    
+    def fake_process(driver, xpath, base_url, existing_jobs, offline):
+        return [job for job in pages.get(current['page'], []) if job not in existing_jobs]
+    
+    limiter = AdaptiveRateLimiter()
+    with patch('functions.functions_selenium.open_tabs', return_value=["t1", "t2", "t3"]), \
+         patch('functions.functions_selenium.start_navigation', side_effect=fake_start), \
+         patch('functions.functions_selenium.wait_for_tab_ready', side_effect=fake_wait), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process), \
+         patch('functions.functions_selenium.close_tabs') as mock_close, \
+         patch.object(limiter, 'wait') as mock_wait:
+        links = speculative_paged_scraper_by_xpath("https://example.com/jobs?page=", mock_driver, "//a", 3, limiter)
+        
+    assert sorted(links) == sorted(job for jobs in pages.values() for job in jobs)
+    # Page 6 ends the listing; pages 7 and 8 were already in flight and are discarded
+    assert requested == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert mock_wait.call_count == len(requested)
+    mock_close.assert_called_once()
+    
+    # With a total count, nothing past the last page is requested
+    requested.clear()
+    with patch('functions.functions_selenium.open_tabs', return_value=["t1", "t2", "t3"]), \
+         patch('functions.functions_selenium.start_navigation', side_effect=fake_start), \
+         patch('functions.functions_selenium.wait_for_tab_ready', side_effect=fake_wait), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process), \
+         patch('functions.functions_scraper.get_page_html', return_value='<p>1-3 of 15</p>'), \
+         patch('functions.functions_selenium.close_tabs'), \
+         patch.object(limiter, 'wait'):
+        links = speculative_paged_scraper_by_xpath(
+            "https://example.com/jobs?page=", mock_driver, "//a", 3, limiter, total_count_xpath="//p"
+        )
+        
+    assert len(links) == 15
+    assert requested == [1, 2, 3, 4, 5]
+
+def test_parse_total_count():
+    """Test reading total job counts from listing summary text."""
+    from functions.functions_scraper import parse_total_count
+    assert parse_total_count("Showing 1-20 of 437 jobs") == 437
+    assert parse_total_count("Page 1 of about 1,204 results") == 1204
+    assert parse_total_count("58 positions") == 58
+    assert parse_total_count("2.350 Jobs gefunden") == 2350
+    assert parse_total_count("No matches") is None
+    # Page positions and other "N of M" texts are not job totals
+    assert parse_total_count("Page 1 of 22") is None
+    assert parse_total_count("1 of 5 locations") is None
+    assert parse_total_count("Page 2 of 40 (800 jobs)") is None
+    assert parse_total_count("1–25 of 1,000") == 1000
+
+def test_plan_last_page():
+    """Test computing the last page from the total count."""
+    from functions.functions_scraper import plan_last_page
+    page_html = '<html><body><p id="count">Showing 1-20 of 45 jobs</p></body></html>'
+    xpath = "//p[@id='count']"
+    assert plan_last_page(page_html, xpath, 20, 1, 1) == 3
+    assert plan_last_page(page_html, xpath, 20, 0, 20) == 40
+    assert plan_last_page(page_html, "//p[@id='missing']", 20, 1, 1) is None
+    assert plan_last_page(page_html, xpath, 0, 1, 1) is None
+
+def test_generic_paged_scraper_total_count(mock_driver):
+    """Test that a known total count stops pagination without an empty probe."""
+    from functions.functions_scraper import generic_paged_scraper_by_xpath
+    pages = {page: [f"https://example.com/job{page}-{index}" for index in range(2)] for page in range(1, 4)}
+    requested = []
+    
+    def fake_navigate(driver, url):
+        requested.append(int(url.rsplit("=", 1)[1]))
+    
+    def fake_process(driver, xpath, base_url, existing_jobs, offline):
+        return pages[requested[-1]]
+    
+    with patch('functions.functions_scraper.navigate_and_wait', side_effect=fake_navigate), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process), \
+         patch('functions.functions_scraper.get_page_html', return_value='<p id="n">6 jobs</p>'), \
+         patch('functions.functions_scraper.time.sleep'):
+        links = generic_paged_scraper_by_xpath(
+            "https://example.com/jobs?page=", mock_driver, "//a", total_count_xpath="//p[@id='n']"
+        )
+        
+    assert len(links) == 6
+    assert requested == [1, 2, 3]
+
+def test_generic_paged_scraper_returns_unique_links(mock_driver):
+    """Test that links repeated on a page or across pages are returned once."""
+    from functions.functions_scraper import generic_paged_scraper_by_xpath
+    pages = {
+        1: ["https://example.com/a", "https://example.com/a", "https://example.com/b"],
+        2: ["https://example.com/b", "https://example.com/c", "https://example.com/c"],
+        3: []
+    }
+    requested = []
+    
+    def fake_navigate(driver, url):
+        requested.append(int(url.rsplit("=", 1)[1]))
+    
+    def fake_process(driver, xpath, base_url, existing_jobs, offline):
+        return pages[requested[-1]]
+    
+    with patch('functions.functions_scraper.navigate_and_wait', side_effect=fake_navigate), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process), \
+         patch('functions.functions_scraper.time.sleep'):
+        links = generic_paged_scraper_by_xpath("https://example.com/jobs?page=", mock_driver, "//a")
+        
+    assert links == ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+
+def test_generic_paged_scraper_total_count_duplicate_anchors(mock_driver):
+    """Test that a job linked twice on a page does not shorten the planned listing."""
+    from functions.functions_scraper import generic_paged_scraper_by_xpath
+    # Each job has a title link and an "Apply" link to the same URL
+    pages = {
+        page: [f"https://example.com/job{page}-{index}" for index in range(2) for _ in range(2)]
+        for page in range(1, 4)
+    }
+    requested = []
+    
+    def fake_navigate(driver, url):
+        requested.append(int(url.rsplit("=", 1)[1]))
+    
+    def fake_process(driver, xpath, base_url, existing_jobs, offline):
+        return pages[requested[-1]]
+    
+    with patch('functions.functions_scraper.navigate_and_wait', side_effect=fake_navigate), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process), \
+         patch('functions.functions_scraper.get_page_html', return_value='<p id="n">of 6 jobs</p>'), \
+         patch('functions.functions_scraper.time.sleep'):
+        links = generic_paged_scraper_by_xpath(
+            "https://example.com/jobs?page=", mock_driver, "//a", total_count_xpath="//p[@id='n']"
+        )
+        
+    assert len(links) == 6
+    assert requested == [1, 2, 3]
+
+def test_download_all_links_in_tabs(tmp_path, monkeypatch, mock_driver):
+    """Test that browser downloads overlap in tabs and every page is saved."""
+    from functions.functions_ratelimit import AdaptiveRateLimiter
+    from functions.functions_scraper import save_to_cache, load_from_cache
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    links = [f"https://example.com/job{index}" for index in range(5)]
+    save_to_cache("example.com", links[0], "<html>" + "x" * 200 + "</html>")
+    
+    pool = Mock()
+    pool.__enter__ = Mock(return_value=pool)
+    pool.__exit__ = Mock(return_value=False)
+    submitted = []
+    pool.has_idle_tab = True
+    pool.loading = []
+    
+    def fake_submit(url):
+        submitted.append(url)
+        pool.loading.append(Mock(url=url, started=0))
+        
+    def fake_next_ready():
+        return pool.loading.pop()
+        
+    pool.submit.side_effect = fake_submit
+    pool.next_ready.side_effect = fake_next_ready
+    limiter = AdaptiveRateLimiter()
+    
+    with patch('functions.functions_scraper.TabPool', return_value=pool) as mock_pool, \
+         patch('functions.functions_scraper.get_page_html', return_value="<html>" + "y" * 200 + "</html>"), \
+         patch('functions.functions_scraper.navigate_and_wait') as mock_navigate, \
+         patch.object(limiter, 'wait') as mock_wait:
+        download_all_links(links, mock_driver, "example.com", rate_limiter=limiter, tabs=3)
+        
+    assert mock_pool.call_args.args[1] == 3
+    assert sorted(submitted) == links[1:]
+    assert mock_wait.call_count == 4
+    mock_navigate.assert_not_called()
+    assert all(load_from_cache("example.com", link) for link in links)
+
+def test_download_all_links_in_tabs_keeps_fixed_delay(tmp_path, monkeypatch, mock_driver):
+    """Test that tabs without a rate limiter are paced by the fixed sleep time."""
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    
+    with patch('functions.functions_scraper.download_links_in_tabs') as mock_tabs:
+        download_all_links(["https://example.com/job1"], mock_driver, "example.com", sleep_time=3, tabs=2)
+        
+    assert mock_tabs.call_args.args[4].get_delay("example.com") == 3
+
+def test_generic_paged_scraper_resumes_from_checkpoint(tmp_path, mock_driver):
+    """Test that an interrupted listing continues after its last journaled page."""
+    from functions.functions_scraper import generic_paged_scraper_by_xpath
+    from functions.functions_checkpoint import CheckpointJournal
+    url = "https://example.com/jobs?page="
+    pages = {page: [f"https://example.com/job{page}-{index}" for index in range(2)] for page in range(1, 5)}
+    journal = CheckpointJournal(tmp_path / "checkpoint.sqlite3")
+    journal.record_page(url, pages[1], 2)
+    journal.record_page(url, pages[2], 3)
+    requested = []
+    
+    def fake_navigate(driver, page_url):
+        requested.append(int(page_url.rsplit("=", 1)[1]))
+    
+    def fake_process(driver, xpath, base_url, existing_jobs, offline):
+        return [job for job in pages.get(requested[-1], []) if job not in existing_jobs]
+    
+    with patch('functions.functions_scraper.navigate_and_wait', side_effect=fake_navigate), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process), \
+         patch('functions.functions_scraper.time.sleep'):
+        links = generic_paged_scraper_by_xpath(url, mock_driver, "//a", checkpoint=journal)
+        
+        # Pages 1 and 2 are never reloaded
+        assert requested == [3, 4, 5]
+        assert sorted(links) == sorted(job for jobs in pages.values() for job in jobs)
+        assert journal.get_listing_progress(url).finished
+        
+        # A finished listing is answered from the journal alone
+        requested.clear()
+        assert sorted(generic_paged_scraper_by_xpath(url, mock_driver, "//a", checkpoint=journal)) == sorted(links)
+        assert requested == []
+    journal.close()
+
+def test_fingerprint_jobs():
+    """Test that job set fingerprints ignore order and duplicates."""
+    from functions.functions_scraper import fingerprint_jobs
+    assert fingerprint_jobs(["a", "b"]) == fingerprint_jobs(["b", "a", "a"])
+    assert fingerprint_jobs(["a", "b"]) != fingerprint_jobs(["a", "c"])
+
+def test_scrape_single_site(tmp_path, monkeypatch, mock_driver):
     """Test scraping process for a single site."""
+    from functions.functions_scraper import save_to_cache
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    mock_driver.current_url = "https://example.com/jobs?page=1"
+    save_to_cache("example.com", "https://example.com/job1", "<html>" + "x" * 200 + "</html>")
     config = {
         'xpath': '//div[@class="job"]',
         'url': 'https://example.com/jobs?page=',
@@ -236,7 +884,278 @@ def test_scrape_single_site(mock_driver):
     with patch('functions.functions_scraper.generic_paged_scraper_by_xpath', return_value=['job1', 'job2']), \
          patch('functions.functions_scraper.download_all_links') as mock_download:
         
-        scrape_single_site(config, mock_driver)
+        new_jobs = scrape_single_site(config, mock_driver)
         
         # Verify download was called with correct arguments
-        mock_download.assert_called_once()
\ No newline at end of file
+        mock_download.assert_called_once()
+        
+    # Only job2 had never been downloaded before
+    assert new_jobs == 1
+    
+    # A failed scrape is reported as None, not as a crawl with no new jobs
+    with patch('functions.functions_scraper.generic_paged_scraper_by_xpath', side_effect=Exception("Bad xpath")):
+        assert scrape_single_site(config, mock_driver) is None
+
+def test_scrape_single_site_streaming(tmp_path, monkeypatch, mock_driver):
+    """Test that streaming mode hands the page generator to the streaming downloader."""
+    from functions.functions_scraper import ScrapeOptions, DEFAULT_SLEEP_TIME
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    config = {'xpath': '//a', 'url': 'https://example.com/jobs?page=', 'increment': 1}
+    pages = iter([["https://example.com/job1"]])
+    
+    with patch('functions.functions_scraper.iter_paged_jobs_by_xpath', return_value=pages) as mock_pages, \
+         patch('functions.functions_scraper.download_streamed_links', return_value=1) as mock_stream, \
+         patch('functions.functions_scraper.download_all_links') as mock_download:
+        new_jobs = scrape_single_site(config, mock_driver, options=ScrapeOptions(stream_downloads=True))
+        
+    assert new_jobs == 1
+    assert mock_stream.call_args.args[0] is pages
+    assert mock_stream.call_args.kwargs['interleave']
+    mock_download.assert_not_called()
+    
+    # Without --adaptive-rate, pagination and downloads keep their fixed delays
+    assert mock_pages.call_args.args[8].get_delay("example.com") == DEFAULT_SLEEP_TIME
+    assert mock_stream.call_args.args[7].get_delay("example.com") == mock_stream.call_args.args[3]
+    
+    with patch('functions.functions_scraper.iter_paged_jobs_by_xpath', return_value=iter([])) as mock_pages, \
+         patch('functions.functions_scraper.download_streamed_links', return_value=0) as mock_stream:
+        scrape_single_site(config, mock_driver, options=ScrapeOptions(stream_downloads=True, adaptive_rate=True))
+    
+    # With it, they pace the host with the same learned rate limiter
+    limiter = mock_stream.call_args.args[7]
+    assert limiter is not None
+    assert mock_pages.call_args.args[8] is limiter
+
+def test_scrape_single_site_deferred(tmp_path, monkeypatch, mock_driver):
+    """Test that a deferred site is paginated but left unfinished for the download pass."""
+    from functions.functions_checkpoint import CheckpointJournal
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    mock_driver.current_url = "https://example.com/jobs?page=1"
+    journal = CheckpointJournal(tmp_path / "checkpoint.sqlite3")
+    config = {'xpath': '//a', 'url': 'https://example.com/jobs?page=', 'increment': 1}
+    deferred = []
+    
+    with patch('functions.functions_scraper.generic_paged_scraper_by_xpath', return_value=['job1']), \
+         patch('functions.functions_scraper.download_all_links') as mock_download:
+        assert scrape_single_site(config, mock_driver, checkpoint=journal, deferred=deferred) == 1
+        
+    mock_download.assert_not_called()
+    assert [(site.name, site.links) for site in deferred] == [("example.com", ["https://example.com/job1"])]
+    assert not journal.is_site_done(config['url'])
+    journal.close()
+
+def test_scrape_single_site_lite(tmp_path, monkeypatch, mock_driver):
+    """Test that scrape-lite mode applies the site's allowlist."""
+    from functions.functions_scraper import ScrapeOptions
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    config = {
+        'xpath': '//div[@class="job"]',
+        'url': 'https://example.com/jobs?page=',
+        'increment': 1,
+        'allowlist': ['fonts']
+    }
+    
+    with patch('functions.functions_scraper.generic_paged_scraper_by_xpath', return_value=[]), \
+         patch('functions.functions_scraper.download_all_links'), \
+         patch('functions.functions_scraper.apply_resource_blocking') as mock_blocking:
+        scrape_single_site(config, mock_driver, options=ScrapeOptions(lite=True))
+        
+        mock_blocking.assert_called_once_with(mock_driver, ['fonts'])
+
+def test_scrape_single_site_records_fingerprint(tmp_path, monkeypatch, mock_driver):
+    """Test that incremental runs remember the listing's first page."""
+    from functions.functions_scraper import ScrapeOptions
+    from functions.functions_manifest import get_manifest, get_listing_fingerprint
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    config = {
+        'xpath': '//div[@class="job"]',
+        'url': 'https://example.com/jobs?page=',
+        'increment': 1
+    }
+    
+    def fake_scraper(url, driver, xpath, debug, page, increment, offline, incremental, rate_limiter, total_count_xpath="", checkpoint=None):
+        incremental.fingerprint = "abc"
+        return ['https://example.com/job1']
+    
+    with patch('functions.functions_scraper.generic_paged_scraper_by_xpath', side_effect=fake_scraper), \
+         patch('functions.functions_scraper.download_all_links'):
+        scrape_single_site(config, mock_driver, options=ScrapeOptions(incremental_pages=2))
+        
+    assert get_listing_fingerprint(get_manifest(cache_dir), config['url']) == "abc"
+
+def test_run_queue_worker(tmp_path, monkeypatch, mock_driver):
+    """Test a queue worker crawling listing pages and downloading their jobs as tasks."""
+    from functions.functions_queue import SQLiteQueueBackend
+    from functions.functions_scraper import build_site_task, run_queue_worker, get_cache_entry
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    queue = SQLiteQueueBackend(tmp_path / "queue.sqlite3")
+    config = {'xpath': "//a", 'url': "https://example.com/jobs?page=", 'increment': 1}
+    listing_pages = {
+        1: ["https://example.com/job1", "https://example.com/job2"],
+        2: ["https://example.com/job2"],  # Nothing new ends pagination
+        3: ["https://example.com/job3"]
+    }
+    page_html = "<html>" + "x" * 200 + "</html>"
+    
+    def fake_process_jobs_page(driver, xpath, base_url, existing_jobs, offline=False):
+        return listing_pages[int(driver.navigated_to.rsplit("=", 1)[1])]
+        
+    def fake_navigate(driver, url, *args):
+        driver.navigated_to = url
+        
+    queue.put([build_site_task(config)])
+    with patch('functions.functions_scraper.navigate_and_wait', side_effect=fake_navigate), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process_jobs_page), \
+         patch('functions.functions_scraper.fetch_detail_page', side_effect=[
+             (FetchResult("short", 200), "selenium"),
+             (FetchResult(page_html, 200), "selenium"),
+             (FetchResult(page_html, 200), "selenium")
+         ]) as mock_fetch:
+        completed = run_queue_worker(queue, mock_driver, politeness_delay=0, retry_delay=0)
+    
+    # site, two listing pages, two jobs; the unusable page was retried
+    assert completed == 5
+    assert mock_fetch.call_count == 3
+    assert queue.stats() == {'done': 5}
+    assert get_cache_entry("example.com", "https://example.com/job1") is not None
+    assert get_cache_entry("example.com", "https://example.com/job3") is None
+    queue.close()
+
+def test_run_listing_task_retry_queues_next_page(tmp_path, mock_driver):
+    """Test that a retried listing task still queues the next page after its jobs were queued."""
+    from functions.functions_queue import SQLiteQueueBackend
+    from functions.functions_scraper import build_listing_task, build_detail_task, run_listing_task, ScrapeOptions
+    queue = SQLiteQueueBackend(tmp_path / "queue.sqlite3")
+    config = {'xpath': "//a", 'url': "https://example.com/jobs?page=", 'increment': 1}
+    jobs = ["https://example.com/job1", "https://example.com/job2"]
+    # The failed first attempt queued the jobs but not the next page
+    queue.put([build_detail_task(config, job) for job in jobs])
+    task = build_listing_task(config, 1)
+    task.attempts = 2
+    
+    with patch('functions.functions_scraper.navigate_and_wait'), \
+         patch('functions.functions_scraper.process_jobs_page', return_value=jobs):
+        assert run_listing_task(task, queue, mock_driver, ScrapeOptions()) == 0
+        
+    assert queue.count_open() == 3
+    queue.close()
+
+def test_iter_paged_jobs_by_xpath(mock_driver):
+    """Test that each listing page's new jobs are yielded before the next page loads."""
+    from functions.functions_scraper import iter_paged_jobs_by_xpath
+    pages = {1: ["https://example.com/a", "https://example.com/b"], 2: ["https://example.com/b", "https://example.com/c"], 3: []}
+    requested = []
+    
+    def fake_process(driver, xpath, base_url, existing_jobs, offline):
+        return [job for job in pages[requested[-1]] if job not in existing_jobs]
+    
+    with patch('functions.functions_scraper.navigate_and_wait', side_effect=lambda driver, url: requested.append(int(url[-1]))), \
+         patch('functions.functions_scraper.process_jobs_page', side_effect=fake_process), \
+         patch('functions.functions_scraper.time.sleep'):
+        generator = iter_paged_jobs_by_xpath("https://example.com/jobs?page=", mock_driver, "//a")
+        assert next(generator) == ["https://example.com/a", "https://example.com/b"]
+        assert requested == [1]
+        assert list(generator) == [["https://example.com/c"]]
+        
+    assert requested == [1, 2, 3]
+
+def test_download_streamed_links_in_browser(tmp_path, monkeypatch, mock_driver):
+    """Test that without HTTP each listing page's jobs are downloaded before the next page."""
+    from functions.functions_scraper import download_streamed_links
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    events = []
+    
+    def pages():
+        events.append("page 1")
+        yield ["https://example.com/job1"]
+        events.append("page 2")
+        yield ["https://example.com/job2", "https://example.com/job3"]
+        
+    with patch('functions.functions_scraper.download_all_links', side_effect=lambda links, *args, **kwargs: events.append(links)):
+        new_jobs = download_streamed_links(pages(), mock_driver, "example.com")
+        
+    assert new_jobs == 3
+    assert events == [
+        "page 1", ["https://example.com/job1"], "page 2", ["https://example.com/job2", "https://example.com/job3"]
+    ]
+
+def test_download_streamed_links_over_http(tmp_path, monkeypatch, mock_driver):
+    """Test that a consumer thread downloads over HTTP while pagination continues."""
+    from functions.functions_scraper import download_streamed_links
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    batches = []
+    
+    def fake_async(links, name, per_host_limit, delay, user_agent, compress, rate_limiter=None):
+        batches.append(links)
+        return 1, [link for link in links if link.endswith("gated")]
+        
+    session = Mock(headers={'User-Agent': "test"})
+    with patch('functions.functions_scraper.download_links_async', side_effect=fake_async), \
+         patch('functions.functions_scraper.download_all_links') as mock_download:
+        new_jobs = download_streamed_links(
+            iter([["https://example.com/job1"], ["https://example.com/gated"]]),
+            mock_driver,
+            "example.com",
+            session=session
+        )
+        
+    assert new_jobs == 2
+    assert batches == [["https://example.com/job1"], ["https://example.com/gated"]]
+    # Only the page that needs JavaScript goes through the browser, after pagination
+    assert mock_download.call_args.args[0] == ["https://example.com/gated"]
+    assert "http" in (cache_dir / "fetch_modes.json").read_text()
+
+def test_download_links_interleaved(tmp_path, monkeypatch, mock_driver):
+    """Test that hosts take turns so their politeness delays overlap."""
+    from functions.functions_ratelimit import AdaptiveRateLimiter
+    from functions.functions_scraper import download_links_interleaved, get_cache_entry
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    clock = {'now': 100.0, 'slept': 0.0}
+    
+    def fake_sleep(seconds):
+        clock['now'] += seconds
+        clock['slept'] += seconds
+        
+    monkeypatch.setattr("functions.functions_ratelimit.time.monotonic", lambda: clock['now'])
+    monkeypatch.setattr("functions.functions_ratelimit.time.sleep", fake_sleep)
+    limiter = AdaptiveRateLimiter(None, 10, 10, 10)
+    site_links = {
+        "a.com": ["https://a.com/1", "https://a.com/2"],
+        "b.com": ["https://b.com/1", "https://b.com/2"],
+        "c.com": ["https://c.com/1"]
+    }
+    fetched = []
+    
+    def fake_fetch(url, driver, session, mode, cached):
+        fetched.append(url)
+        return FetchResult("<html>" + "x" * 200 + "</html>", 200), "selenium"
+        
+    with patch('functions.functions_scraper.fetch_detail_page', side_effect=fake_fetch):
+        saved = download_links_interleaved(site_links, mock_driver, limiter)
+        
+    assert saved == 5
+    assert fetched == ["https://a.com/1", "https://b.com/1", "https://c.com/1", "https://a.com/2", "https://b.com/2"]
+    # One 10 second wait covers both second pages, instead of 10 seconds per host
+    assert clock['slept'] == 10
+    assert get_cache_entry("c.com", "https://c.com/1") is not None
+
+def test_download_deferred_sites(tmp_path, monkeypatch, mock_driver):
+    """Test that deferred sites are finished only after the interleaved pass."""
+    from functions.functions_checkpoint import CheckpointJournal
+    from functions.functions_scraper import DeferredSite, download_deferred_sites
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    journal = CheckpointJournal(tmp_path / "checkpoint.sqlite3")
+    sites = [
+        DeferredSite({'url': "https://a.com/jobs?page="}, "a.com", ["https://a.com/1"]),
+        DeferredSite({'url': "https://b.com/jobs?page="}, "b.com", ["https://b.com/1"])
+    ]
+    
+    with patch('functions.functions_scraper.download_links_interleaved', return_value=2) as mock_download:
+        assert download_deferred_sites(sites, mock_driver, checkpoint=journal) == 2
+        
+    assert mock_download.call_args.args[0] == {"a.com": ["https://a.com/1"], "b.com": ["https://b.com/1"]}
+    assert mock_download.call_args.args[2].get_delay("a.com") == 2
+    assert journal.count_finished_sites() == 2
+    journal.close()
\ No newline at end of file
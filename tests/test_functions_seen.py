@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch
+from functions.functions_seen import (
+    BloomFilter,
+    SeenStore,
+    get_bloom_parameters,
+    get_seen_store,
+    hash_url
+)
+
+def test_get_bloom_parameters():
+    """Test Bloom filter sizing for a target error rate."""
+    bit_count, hash_count = get_bloom_parameters(1_000_000, 0.01)
+    assert 9_500_000 < bit_count < 9_700_000
+    assert hash_count == 7
+
+def test_bloom_filter_persists(tmp_path):
+    """Test that filter bits survive reopening the memory-mapped file."""
+    path = tmp_path / "seen.bloom"
+    bloom = BloomFilter(path, capacity=1000, error_rate=0.01)
+    bloom.add(hash_url("https://example.com/job1"))
+    assert bloom.might_contain(hash_url("https://example.com/job1"))
+    assert not bloom.might_contain(hash_url("https://example.com/job2"))
+    bloom.close()
+    
+    reopened = BloomFilter(path, capacity=5000)
+    assert reopened.bit_count == get_bloom_parameters(1000, 0.01)[0]
+    assert reopened.might_contain(hash_url("https://example.com/job1"))
+    reopened.close()
+    
+    (tmp_path / "bad.bloom").write_bytes(b"not a filter" * 4)
+    with pytest.raises(ValueError):
+        BloomFilter(tmp_path / "bad.bloom")
+
+def test_seen_store(tmp_path):
+    """Test bulk lookups against the filter and exact index."""
+    store = SeenStore(tmp_path)
+    assert store.is_empty()
+    
+    seen_urls = [f"https://example.com/job{index}" for index in range(0, 2000, 2)]
+    store.add_many(seen_urls, "example.com")
+    store.add("https://other.com/job", "other.com")
+    
+    urls = [f"https://example.com/job{index}" for index in range(2000)]
+    assert store.find_seen(urls) == set(seen_urls)
+    assert store.filter_unseen(urls[:4]) == ["https://example.com/job1", "https://example.com/job3"]
+    assert not store.is_empty()
+    store.close()
+
+def test_seen_store_confirms_filter_hits(tmp_path):
+    """Test that Bloom filter false positives are rejected by the exact index."""
+    store = SeenStore(tmp_path)
+    store.add("https://example.com/job1")
+    
+    with patch.object(store.bloom, 'might_contain', return_value=True):
+        assert store.find_seen(["https://example.com/job1", "https://example.com/job2"]) == {"https://example.com/job1"}
+    store.close()
+
+def test_get_seen_store(tmp_path):
+    """Test that stores are reused per directory."""
+    assert get_seen_store(tmp_path) is get_seen_store(tmp_path)
+    assert (tmp_path / "seen.bloom").exists()
+    assert (tmp_path / "seen.sqlite3").exists()
\ No newline at end of file
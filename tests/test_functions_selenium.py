@@ -1,13 +1,32 @@
 import pytest
+import json
+import time
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from functions.functions_selenium import (
     create_browser_config,
     setup_chrome_options,
     setup_chrome_capabilities,
-    analyze_network_activity,
+    get_blocked_url_patterns,
+    apply_resource_blocking,
+    get_applied_blocking,
+    NetworkState,
+    update_network_state,
+    count_active_requests,
+    get_document_state,
+    is_page_idle,
     wait_for_page_load,
     navigate_and_wait,
+    open_tabs,
+    start_navigation,
+    wait_for_tab_ready,
+    close_tabs,
+    TabPool,
+    DriverPool,
+    ManagedDriver,
+    is_browser_crash,
+    get_process_tree_rss,
+    get_chromedriver_path,
     get_page_html,
     extract_links_by_xpath
 )
@@ -24,6 +43,181 @@ def test_create_browser_config():
     assert isinstance(config.screen_size, str)
     assert config.debug is False
 
+def test_get_chromedriver_path(monkeypatch, tmp_path):
+    """Test that the driver binary is resolved once and an explicit path wins."""
+    from unittest.mock import patch
+    from functions import functions_selenium
+    functions_selenium._resolve_chromedriver_path.cache_clear()
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    with patch('functions.functions_selenium.ChromeDriverManager') as mock_manager:
+        mock_manager.return_value.install.return_value = "/drivers/chromedriver"
+        assert get_chromedriver_path() == "/drivers/chromedriver"
+        assert get_chromedriver_path() == "/drivers/chromedriver"
+    assert mock_manager.return_value.install.call_count == 1
+    
+    functions_selenium._resolve_chromedriver_path.cache_clear()
+    binary = tmp_path / "chromedriver"
+    binary.write_text("")
+    monkeypatch.setenv("CHROMEDRIVER_PATH", str(binary))
+    with patch('functions.functions_selenium.ChromeDriverManager') as mock_manager:
+        assert get_chromedriver_path() == str(binary)
+    mock_manager.assert_not_called()
+    functions_selenium._resolve_chromedriver_path.cache_clear()
+
+def test_driver_pool():
+    """Test that drivers are launched ahead of time, reused and quit on close."""
+    from unittest.mock import Mock
+    launched = []
+    
+    def factory():
+        driver = Mock()
+        driver.window_handles = ["main"]
+        launched.append(driver)
+        return driver
+    
+    with DriverPool(factory, 2) as pool:
+        first = pool.acquire(timeout=5)
+        second = pool.acquire(timeout=5)
+        assert {first, second} == set(launched)
+        
+        pool.release(first)
+        assert pool.acquire(timeout=5) is first
+        
+        # A discarded driver is replaced in the background
+        pool.discard(second)
+        second.quit.assert_called_once()
+        replacement = pool.acquire(timeout=5)
+        assert replacement is launched[2]
+        
+    assert len(launched) == 3
+    assert first.quit.called and replacement.quit.called
+
+def test_driver_pool_resets_released_drivers():
+    """Test that a released driver comes back without extra tabs or blocking."""
+    from unittest.mock import Mock
+    driver = Mock()
+    driver.window_handles = ["main", "tab-1", "tab-2"]
+    apply_resource_blocking(driver, ["fonts"])
+    
+    drivers = iter([driver, Mock()])
+    pool = DriverPool(lambda: next(drivers), 1)
+    assert pool.acquire() is driver
+    pool.release(driver)
+    
+    assert [call.args[0] for call in driver.switch_to.window.call_args_list] == ["tab-1", "tab-2", "main"]
+    assert driver.close.call_count == 2
+    driver.execute_cdp_cmd.assert_called_with('Network.setBlockedURLs', {'urls': []})
+    assert get_applied_blocking(driver) is None
+    assert pool.acquire(timeout=5) is driver
+    
+    # A driver that cannot be reset is replaced
+    driver.switch_to.window.side_effect = Exception("no such window")
+    pool.release(driver)
+    driver.quit.assert_called_once()
+    pool.close()
+
+def test_is_browser_crash():
+    """Test telling a dead browser apart from page-level errors."""
+    from selenium.common.exceptions import InvalidSessionIdException, WebDriverException, TimeoutException
+    assert is_browser_crash(InvalidSessionIdException("gone"))
+    assert is_browser_crash(WebDriverException("unknown error: session deleted because of page crash"))
+    assert is_browser_crash(ConnectionRefusedError())
+    assert not is_browser_crash(TimeoutException("timed out"))
+    assert not is_browser_crash(ValueError("chrome not reachable"))
+
+def test_get_process_tree_rss():
+    """Test measuring this process's memory."""
+    import os
+    rss = get_process_tree_rss(os.getpid())
+    assert rss is None or rss > 0
+
+def test_managed_driver_recycles():
+    """Test that the browser is replaced after N navigations and setup is replayed."""
+    from unittest.mock import Mock
+    launched = []
+    
+    def factory():
+        driver = Mock()
+        driver.page_source = f"<html>{len(launched)}</html>"
+        launched.append(driver)
+        return driver
+    
+    driver = ManagedDriver(factory, max_navigations=2)
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': ["*.png*"]})
+    driver.get("https://example.com/1")
+    driver.get("https://example.com/2")
+    assert len(launched) == 1
+    assert driver.page_source == "<html>0</html>"
+    
+    driver.get("https://example.com/3")
+    assert len(launched) == 2
+    launched[0].quit.assert_called_once()
+    launched[1].execute_cdp_cmd.assert_called_once_with('Network.setBlockedURLs', {'urls': ["*.png*"]})
+    launched[1].get.assert_called_once_with("https://example.com/3")
+    assert driver.navigations == 1
+
+def test_managed_driver_recycles_on_memory():
+    """Test that the browser is replaced once its memory passes the threshold."""
+    from unittest.mock import Mock, patch
+    launched = []
+    
+    def factory():
+        driver = Mock()
+        launched.append(driver)
+        return driver
+    
+    driver = ManagedDriver(factory, max_navigations=0, max_rss_mb=100)
+    with patch('functions.functions_selenium.get_browser_rss', return_value=150e6), \
+         patch('functions.functions_selenium.RSS_CHECK_INTERVAL', 1):
+        driver.get("https://example.com/1")
+        assert len(launched) == 1
+        driver.get("https://example.com/2")
+    assert len(launched) == 2
+
+def test_managed_driver_restarts_after_crash():
+    """Test that a crashed browser is relaunched and the current page reloaded."""
+    from unittest.mock import Mock, PropertyMock, patch
+    from selenium.common.exceptions import InvalidSessionIdException
+    crashed = Mock()
+    type(crashed).page_source = PropertyMock(side_effect=InvalidSessionIdException("gone"))
+    replacement = Mock()
+    replacement.page_source = "<html>job</html>"
+    drivers = iter([crashed, replacement])
+    
+    driver = ManagedDriver(lambda: next(drivers), max_navigations=0)
+    driver.get("https://example.com/job")
+    with patch('functions.functions_selenium.navigate_and_wait') as mock_navigate:
+        assert driver.page_source == "<html>job</html>"
+        
+    mock_navigate.assert_called_once_with(replacement, "https://example.com/job")
+    assert driver.recycles == 1
+    
+    # Page-level errors are not treated as crashes
+    replacement.find_elements.side_effect = ValueError("bad xpath")
+    with pytest.raises(ValueError):
+        driver.find_elements("xpath", "//a")
+
+def test_managed_driver_tabs():
+    """Test that tab navigations are counted and switch_to follows a restarted browser."""
+    from unittest.mock import Mock
+    launched = []
+    
+    def factory():
+        driver = Mock()
+        launched.append(driver)
+        return driver
+        
+    driver = ManagedDriver(factory, max_navigations=0)
+    switch_to = driver.switch_to
+    start_navigation(driver, "tab-1", "https://example.com/job1")
+    launched[0].switch_to.window.assert_called_once_with("tab-1")
+    assert (driver.navigations, driver.last_url) == (1, "https://example.com/job1")
+    
+    driver.restart()
+    switch_to.window("tab-2")
+    launched[1].switch_to.window.assert_called_once_with("tab-2")
+    launched[0].switch_to.window.assert_called_once()
+
 def test_setup_chrome_options():
     """Test Chrome options setup."""
     config = create_browser_config(debug=False)
@@ -40,6 +234,42 @@ def test_setup_chrome_options():
     debug_options = setup_chrome_options(debug_config)
     assert "--headless" not in debug_options.arguments
 
+def test_get_blocked_url_patterns():
+    """Test scrape-lite blocking patterns and allowlist overrides."""
+    from fnmatch import fnmatchcase
+    
+    def is_blocked(url, patterns):
+        # Network.setBlockedURLs patterns use * as the only wildcard
+        return any(fnmatchcase(url, pattern) for pattern in patterns)
+        
+    patterns = get_blocked_url_patterns()
+    assert is_blocked("https://example.com/logo.png", patterns)
+    assert is_blocked("https://cdn.example.com/font.woff2?v=3", patterns)
+    assert is_blocked("https://example.com/intro.mp4", patterns)
+    assert is_blocked("https://www.googletagmanager.com/gtm.js", patterns)
+    # Extensions only match at the end of the path, hosts only as hosts
+    assert not is_blocked("https://careers.movado.com/jobs", patterns)
+    assert not is_blocked("https://example.com/png-careers/jobs", patterns)
+    assert not is_blocked("https://example.com/jobs?ref=hotjar.com", patterns)
+    
+    # Category names and individual hosts or extensions can be allowed, matched exactly
+    allowed = get_blocked_url_patterns(["fonts", "googletagmanager.com", ".svg", "com"])
+    assert not is_blocked("https://example.com/font.woff", allowed)
+    assert not is_blocked("https://www.googletagmanager.com/gtm.js", allowed)
+    assert not is_blocked("https://example.com/icon.svg", allowed)
+    assert is_blocked("https://example.com/logo.png", allowed)
+    assert is_blocked("https://www.google-analytics.com/analytics.js", allowed)
+    assert "*://*/*.woff2" not in allowed
+    
+def test_apply_resource_blocking(mock_driver):
+    """Test resource blocking through CDP."""
+    apply_resource_blocking(mock_driver, ["images"])
+    
+    method, params = mock_driver.execute_cdp_cmd.call_args.args
+    assert method == 'Network.setBlockedURLs'
+    assert "*://*/*.png" not in params['urls']
+    assert "*://*/*.woff" in params['urls']
+
 def test_setup_chrome_capabilities():
     """Test Chrome capabilities setup."""
     capabilities = setup_chrome_capabilities()
@@ -49,33 +279,81 @@ def test_setup_chrome_capabilities():
     assert 'performance' in capabilities['goog:loggingPrefs']
     assert capabilities['goog:loggingPrefs']['performance'] == 'ALL'
 
-def test_analyze_network_activity(mock_driver):
-    """Test network activity analysis."""
-    # Test initial call
-    is_loaded, length = analyze_network_activity(mock_driver, None)
-    assert not is_loaded
-    assert isinstance(length, int)
+def make_log_entry(method, **params):
+    """Build a performance log entry wrapping a CDP event."""
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+def test_update_network_state():
+    """Test in-flight request tracking from CDP events."""
+    state = NetworkState()
+    update_network_state(state, [
+        make_log_entry('Network.requestWillBeSent', requestId='1', type='Document'),
+        make_log_entry('Network.requestWillBeSent', requestId='2', type='Script'),
+        make_log_entry('Network.requestWillBeSent', requestId='3', type='XHR'),
+        {'message': 'not json'}
+    ])
+    assert set(state.inflight) == {'1', '2', '3'}
     
-    # Test subsequent call with no new activity
-    mock_driver.get_log.return_value = []
-    is_loaded, length = analyze_network_activity(mock_driver, 10)
-    assert is_loaded
-    assert length == 0
+    update_network_state(state, [
+        make_log_entry('Network.loadingFinished', requestId='1'),
+        make_log_entry('Network.loadingFailed', requestId='2')
+    ])
+    assert set(state.inflight) == {'3'}
+
+def test_count_active_requests():
+    """Test that long-running sub-resource requests are ignored."""
+    now = time.monotonic()
+    state = NetworkState(inflight={
+        'doc': (now - 10, True),
+        'poll': (now - 10, False),
+        'xhr': (now, False)
+    })
+    assert count_active_requests(state, now, long_request_grace=2.0) == 2
+
+def test_get_document_state(mock_driver):
+    """Test reading document readiness from the page."""
+    mock_driver.execute_script.return_value = ['interactive', False, 0.1]
+    assert get_document_state(mock_driver) == ('interactive', False, 0.1)
+    
+    # Unexpected results are treated as a complete document
+    mock_driver.execute_script.side_effect = Exception("No such window")
+    assert get_document_state(mock_driver) == ('complete', False, None)
+
+def test_is_page_idle():
+    """Test combination of network, readyState and DOM signals."""
+    quiet = NetworkState(started=time.monotonic() - 5, last_activity=time.monotonic() - 1)
+    assert is_page_idle(quiet, ('complete', False, 1.0), quiet_window=0.3)
+    assert is_page_idle(quiet, ('complete', False, None), quiet_window=0.3)
     
-    # Test with new activity
-    mock_driver.get_log.return_value = ['event1', 'event2']
-    is_loaded, length = analyze_network_activity(mock_driver, 1)
-    assert not is_loaded
-    assert length == 2
+    # Document still loading or DOM still changing
+    assert not is_page_idle(quiet, ('interactive', False, 1.0), quiet_window=0.3)
+    assert not is_page_idle(quiet, ('complete', False, 0.1), quiet_window=0.3)
+    
+    # Recent network activity or requests still in flight
+    busy = NetworkState(last_activity=time.monotonic())
+    assert not is_page_idle(busy, ('complete', False, 1.0), quiet_window=0.3)
+    loading = NetworkState(
+        inflight={'1': (time.monotonic(), False)},
+        last_activity=time.monotonic() - 1
+    )
+    assert not is_page_idle(loading, ('complete', False, 1.0), quiet_window=0.3)
+    
+    # The previous document is ignored until the stale grace period passes
+    fresh = NetworkState(last_activity=time.monotonic() - 1)
+    assert not is_page_idle(fresh, ('complete', True, 1.0), quiet_window=0.3)
 
 def test_wait_for_page_load(mock_driver):
     """Test page load waiting."""
     mock_driver.get_log.return_value = []
+    mock_driver.execute_script.return_value = ['complete', False, 1.0]
     
-    with wait_for_page_load(mock_driver, timeout=1, sleep=0.1):
+    start = time.time()
+    with wait_for_page_load(mock_driver, timeout=5, sleep=0.01, quiet_window=0.1):
         pass
     
     assert mock_driver.get_log.called
+    # Returns once the page is idle rather than waiting for the timeout
+    assert time.time() - start < 1
 
 def test_navigate_and_wait(mock_driver):
     """Test navigation with waiting."""
@@ -85,6 +363,101 @@ def test_navigate_and_wait(mock_driver):
     assert result == mock_driver
     mock_driver.get.assert_called_once_with(url)
 
+def test_tabs(mock_driver):
+    """Test opening, navigating and closing background tabs."""
+    from unittest.mock import PropertyMock
+    type(mock_driver).current_window_handle = PropertyMock(side_effect=["tab1", "tab2"])
+    
+    assert open_tabs(mock_driver, 2) == ["tab1", "tab2"]
+    assert mock_driver.switch_to.new_window.call_count == 2
+    # Each tab gets its own readiness tracker
+    tracker_calls = [
+        call for call in mock_driver.execute_cdp_cmd.call_args_list
+        if call.args[0] == 'Page.addScriptToEvaluateOnNewDocument'
+    ]
+    assert len(tracker_calls) == 2
+    
+    start_navigation(mock_driver, "tab1", "https://example.com/jobs?page=2")
+    mock_driver.switch_to.window.assert_called_with("tab1")
+    assert mock_driver.execute_script.call_args.args[1] == "https://example.com/jobs?page=2"
+    
+    close_tabs(mock_driver, ["tab1", "tab2"], "main")
+    assert mock_driver.close.call_count == 2
+    mock_driver.switch_to.window.assert_called_with("main")
+
+def test_open_tabs_applies_blocking(mock_driver):
+    """Test that tabs opened after scrape-lite blocking get the same blocking."""
+    from unittest.mock import PropertyMock
+    type(mock_driver).current_window_handle = PropertyMock(side_effect=["tab1"])
+    apply_resource_blocking(mock_driver, ["images"])
+    patterns = mock_driver.execute_cdp_cmd.call_args.args[1]['urls']
+    mock_driver.execute_cdp_cmd.reset_mock()
+    
+    open_tabs(mock_driver, 1)
+    
+    mock_driver.execute_cdp_cmd.assert_any_call('Network.setBlockedURLs', {'urls': patterns})
+
+def test_wait_for_tab_ready(mock_driver):
+    """Test that a tab is ready once its new document has settled."""
+    mock_driver.execute_script.side_effect = [
+        Exception("document unloaded"),
+        ['loading', False, None, 0, None],
+        ['complete', True, 1.0, 0, 1.0],
+        ['complete', False, 1.0, 1, 0.5],  # A request is still in flight
+        ['complete', False, 1.0, 0, 1.0]
+    ]
+    
+    wait_for_tab_ready(mock_driver, "tab1", timeout=5, sleep=0.001, quiet_window=0.1)
+    
+    mock_driver.switch_to.window.assert_called_once_with("tab1")
+    assert mock_driver.execute_script.call_count == 5
+
+def test_is_tab_ready_requires_tracker(mock_driver):
+    """Test that a loaded tab without the page tracker is not reported ready."""
+    from functions.functions_selenium import is_tab_ready, MUTATION_TRACKER_SCRIPT
+    mock_driver.execute_script.side_effect = [['complete', False, None, 0, None], None]
+    
+    assert not is_tab_ready(mock_driver, quiet_window=0.1)
+    # The tracker is injected so the tab can be judged on the next check
+    assert mock_driver.execute_script.call_args.args[0] == MUTATION_TRACKER_SCRIPT
+    
+    mock_driver.execute_script.side_effect = [['complete', False, 0.05, 0, 0.05]]
+    assert not is_tab_ready(mock_driver, quiet_window=0.1)
+
+def test_tab_pool(mock_driver):
+    """Test that pages are harvested from whichever tab finishes first."""
+    from unittest.mock import PropertyMock
+    type(mock_driver).current_window_handle = PropertyMock(side_effect=["main", "tab1", "tab2"])
+    states = {"tab1": ['loading', False, None, 0, None], "tab2": ['complete', False, 1.0, 0, 1.0]}
+    current = {}
+    
+    def fake_execute(script, *args):
+        if args:
+            return None
+        return states[current['handle']]
+    
+    mock_driver.switch_to.window.side_effect = lambda handle: current.update(handle=handle)
+    mock_driver.execute_script.side_effect = fake_execute
+    
+    with TabPool(mock_driver, 2, sleep=0.001, quiet_window=0.1) as pool:
+        first = pool.submit("https://example.com/1")
+        second = pool.submit("https://example.com/2")
+        assert not pool.has_idle_tab
+        with pytest.raises(RuntimeError):
+            pool.submit("https://example.com/3")
+            
+        assert pool.next_ready() is second
+        assert current['handle'] == "tab2"
+        pool.release(second)
+        assert pool.has_idle_tab
+        
+        states["tab1"] = ['complete', False, 1.0, 0, 1.0]
+        assert pool.next_ready() is first
+        assert pool.next_ready() is None
+        
+    assert mock_driver.close.call_count == 2
+    assert current['handle'] == "main"
+
 def test_get_page_html(mock_driver):
     """Test HTML content retrieval."""
     mock_driver.page_source = "<html><body>Test content</body></html>"
@@ -112,4 +485,19 @@ def test_extract_links_by_xpath(mock_driver):
     
     assert len(links) == 2
     assert all(link.startswith('https://example.com/') for link in links)
-    mock_driver.find_elements.assert_called_once()
\ No newline at end of file
+    mock_driver.find_elements.assert_called_once()
+
+def test_extract_links_by_xpath_bulk(mock_driver):
+    """Test single round-trip link extraction."""
+    mock_driver.execute_script.return_value = [
+        'https://example.com/job1',
+        'https://example.com/job2',
+        None
+    ]
+    
+    links = extract_links_by_xpath(mock_driver, "//a[@class='job']")
+    
+    assert links == ['https://example.com/job1', 'https://example.com/job2']
+    assert mock_driver.execute_script.call_count == 1
+    assert mock_driver.execute_script.call_args.args[1] == "//a[@class='job']"
+    mock_driver.find_elements.assert_not_called()
\ No newline at end of file
@@ -0,0 +1,68 @@
+import pytest
+from functions.functions_manifest import get_manifest, get_entry
+from manage_cache import parse_arguments, main
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the scraper cache at a temporary directory."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", cache_dir)
+    return cache_dir
+
+def test_parse_arguments():
+    """Test command line argument parsing."""
+    assert parse_arguments(['rebuild']).command == 'rebuild'
+    assert parse_arguments(['migrate']).command == 'migrate'
+    assert parse_arguments(['stats']).command == 'stats'
+    assert parse_arguments(['gc', '--max-size-mb', '50']).max_size_mb == 50
+    assert parse_arguments(['gc', '--cache-size-cap', '0']).max_size_mb == 0
+    assert parse_arguments(['gc']).max_age_days == 28
+    
+    with pytest.raises(SystemExit):
+        parse_arguments([])
+
+def test_main_rebuild(cache_dir, capsys):
+    """Test the rebuild command indexes the cache directory."""
+    (cache_dir / "example.com_abc.html").write_text("<!-- https://example.com/job -->\n<html></html>")
+    
+    main(['rebuild'])
+    
+    assert "Indexed 1 cached pages" in capsys.readouterr().out
+    assert get_entry(get_manifest(cache_dir), "abc").url == "https://example.com/job"
+
+def test_main_migrate(cache_dir, capsys):
+    """Test the migrate command moves flat files into shards."""
+    from functions.functions_scraper import create_cache_filename, get_cache_path
+    filename = create_cache_filename("example.com", "https://example.com/job")
+    (cache_dir / filename).write_text("<!-- https://example.com/job -->\n<html></html>")
+    
+    main(['migrate'])
+    
+    assert "Migrated 1 cache files" in capsys.readouterr().out
+    assert get_cache_path(filename).exists()
+    assert not (cache_dir / filename).exists()
+
+def test_main_stats(cache_dir, capsys):
+    """Test the stats command reports compressed storage."""
+    from functions.functions_scraper import save_to_cache
+    body = "<html>" + "Job description. " * 100 + "</html>"
+    save_to_cache("example.com", "https://example.com/job1", body, compress=True)
+    save_to_cache("example.com", "https://example.com/job2", body, compress=True)
+    
+    main(['stats'])
+    
+    output = capsys.readouterr().out
+    assert "Entries: 2 (2 compressed)" in output
+    assert "Distinct compressed objects: 1" in output
+    assert "Storage ratio" in output
+
+def test_main_gc(cache_dir, capsys):
+    """Test the gc command removes expired pages."""
+    from functions.functions_scraper import save_to_cache, create_cache_filename, find_cache_file
+    save_to_cache("example.com", "https://example.com/job", "<html>" + "x" * 200 + "</html>")
+    
+    main(['gc', '--max-age-days', '0'])
+    
+    assert "Removed 1 expired" in capsys.readouterr().out
+    assert not find_cache_file(create_cache_filename("example.com", "https://example.com/job")).exists()
\ No newline at end of file
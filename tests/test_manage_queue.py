@@ -0,0 +1,47 @@
+import csv
+import pytest
+from functions.functions_queue import SQLiteQueueBackend
+from manage_queue import parse_arguments, main
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Write a site configuration CSV with two sites."""
+    path = tmp_path / "sites_to_scrape.csv"
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Company', 'Careers', 'XPath', 'URL', 'Increment'])
+        writer.writerow(['A', '', '//a', 'https://a.com/jobs?page=', '1'])
+        writer.writerow(['B', '', '//a', 'https://b.com/jobs?offset=', '20'])
+    return path
+
+def test_parse_arguments():
+    """Test command line argument parsing."""
+    assert parse_arguments(['stats']).queue == 'queue.sqlite3'
+    assert parse_arguments(['--queue', 'http://10.0.0.1:8765/', 'seed']).queue == 'http://10.0.0.1:8765/'
+    assert parse_arguments(['serve', '--port', '9000']).port == 9000
+    assert parse_arguments(['seed', '--config', 'sites.csv']).config == 'sites.csv'
+    
+    with pytest.raises(SystemExit):
+        parse_arguments([])
+
+def test_main_seed_stats_reset(tmp_path, config_path, capsys):
+    """Test seeding the configured sites, reporting and resetting the queue."""
+    queue_path = str(tmp_path / "queue.sqlite3")
+    
+    main(['--queue', queue_path, 'seed', '--config', str(config_path)])
+    main(['--queue', queue_path, 'seed', '--config', str(config_path)])
+    assert "Queued 2 of 2 sites" in capsys.readouterr().out
+    
+    main(['--queue', queue_path, 'stats'])
+    assert "Pending: 2" in capsys.readouterr().out
+    
+    main(['--queue', queue_path, 'reset'])
+    queue = SQLiteQueueBackend(tmp_path / "queue.sqlite3")
+    assert queue.count_open() == 0
+    queue.close()
+
+def test_main_error_handling(tmp_path):
+    """Test that errors exit with status 1."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(['--queue', str(tmp_path / "queue.sqlite3"), 'seed', '--config', str(tmp_path / "missing.csv")])
+    assert exc_info.value.code == 1
\ No newline at end of file
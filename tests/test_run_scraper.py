@@ -5,7 +5,7 @@ import sys
 from pathlib import Path
 
 # Import functions to test
-from run_scraper import run_scrapers, main
+from run_scraper import run_scrapers, run_scrapers_parallel, run_daemon, parse_arguments, main
 
 @pytest.fixture
 def mock_selenium(monkeypatch):
@@ -49,8 +49,26 @@ def test_run_scrapers(mock_selenium, mock_configs):
             assert args[0] == mock_configs[idx]
             assert args[1] == mock_selenium
 
-def test_main_function(mock_selenium):
+def test_run_scrapers_interleaved(mock_selenium, mock_configs):
+    """Test that interleaving paginates every site before one shared download pass."""
+    from functions.functions_scraper import ScrapeOptions
+    events = []
+    
+    def fake_scrape(config, driver, options=None, checkpoint=None, deferred=None):
+        events.append(config['url'])
+        deferred.append(config['url'])
+        return 0
+        
+    with patch('run_scraper.scrape_single_site', side_effect=fake_scrape), \
+         patch('run_scraper.download_deferred_sites', side_effect=lambda sites, *args, **kwargs: events.append(list(sites))):
+        run_scrapers(mock_configs, mock_selenium, ScrapeOptions(interleave_downloads=True))
+        
+    urls = [config['url'] for config in mock_configs]
+    assert events == urls + [urls]
+
+def test_main_function(mock_selenium, tmp_path, monkeypatch):
     """Test the main function execution flow."""
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
     mock_configs = [{'xpath': '//div', 'url': 'https://test.com', 'increment': 1}]
     
     with patch('run_scraper.load_scraper_configs', return_value=mock_configs) as mock_load, \
@@ -66,13 +84,184 @@ def test_main_function(mock_selenium):
         
         # Verify driver was properly cleaned up
         mock_selenium.quit.assert_called_once()
+        
+    # A completed run leaves nothing to resume
+    from functions.functions_checkpoint import CheckpointJournal
+    assert CheckpointJournal(tmp_path / "cache" / "checkpoint.sqlite3").count_finished_sites() == 0
+
+def test_main_enforces_cache_size_cap(mock_selenium, tmp_path, monkeypatch):
+    """Test that a size cap without background GC is enforced once before scraping."""
+    from functions.functions_gc import GCReport
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    
+    with patch('run_scraper.load_scraper_configs', return_value=[]), \
+         patch('run_scraper.run_scrapers'), \
+         patch('run_scraper.collect_garbage', return_value=GCReport()) as mock_gc:
+        main(['--cache-size-cap', '0'])
+        
+    assert mock_gc.call_args.args[1] == 0
+    
+def test_main_resumes_interrupted_run(mock_selenium, tmp_path, monkeypatch):
+    """Test that an interrupted run skips the sites it already finished."""
+    from functions.functions_checkpoint import CheckpointJournal
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    configs = [
+        {'xpath': '//a', 'url': 'https://done.com/jobs?page=', 'increment': 1},
+        {'xpath': '//a', 'url': 'https://todo.com/jobs?page=', 'increment': 1}
+    ]
+    journal = CheckpointJournal(tmp_path / "cache" / "checkpoint.sqlite3")
+    journal.mark_site_done('https://done.com/jobs?page=')
+    
+    with patch('run_scraper.load_scraper_configs', return_value=configs), \
+         patch('functions.functions_scraper.generic_paged_scraper_by_xpath', return_value=[]) as mock_scraper, \
+         patch('functions.functions_scraper.download_all_links'):
+        main()
+        
+    assert [call.args[0] for call in mock_scraper.call_args_list] == ['https://todo.com/jobs?page=']
+    assert journal.count_finished_sites() == 0
 
-def test_main_function_error_handling(mock_selenium):
+def test_main_works_queue(mock_selenium, tmp_path, monkeypatch):
+    """Test that --queue works queued tasks instead of the configured sites."""
+    from functions.functions_queue import SQLiteQueueBackend, Task, TASK_DETAIL_PAGE
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    queue_path = tmp_path / "queue.sqlite3"
+    queue = SQLiteQueueBackend(queue_path)
+    queue.put([Task("detail:https://example.com/job1", TASK_DETAIL_PAGE, "example.com",
+                    {'name': "example.com", 'url': "https://example.com/job1"})])
+    
+    with patch('run_scraper.load_scraper_configs') as mock_load, \
+         patch('functions.functions_scraper.run_detail_task') as mock_detail:
+        main(['--queue', str(queue_path), '--queue-delay', '0'])
+        
+    mock_load.assert_not_called()
+    assert mock_detail.call_args.args[0].payload['url'] == "https://example.com/job1"
+    assert queue.stats() == {'done': 1}
+    queue.close()
+
+def test_main_function_error_handling(mock_selenium, tmp_path, monkeypatch):
     """Test error handling in main function."""
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
     with patch('run_scraper.load_scraper_configs', side_effect=Exception("Test error")), \
          pytest.raises(SystemExit) as exc_info:
         main()
         
         # Verify driver is cleaned up even if an error occurs
         mock_selenium.quit.assert_called_once()
-        assert exc_info.value.code == 1  # Verify correct exit code
\ No newline at end of file
+        assert exc_info.value.code == 1  # Verify correct exit code
+
+def test_parse_arguments():
+    """Test command line argument parsing."""
+    assert parse_arguments([]).workers == 1
+    assert parse_arguments(['--workers', '4']).workers == 4
+    assert not parse_arguments([]).http_first
+    assert parse_arguments(['--http-first']).http_first
+    assert parse_arguments(['--async-download', '8']).async_download == 8
+    assert parse_arguments(['--lite']).lite
+    assert parse_arguments(['--offline-xpath']).offline_xpath
+    assert parse_arguments(['--compress-cache']).compress_cache
+    assert parse_arguments(['--gc-interval', '30']).gc_interval == 30
+    assert parse_arguments(['--cache-size-cap', '500']).cache_size_cap == 500
+    assert parse_arguments(['--incremental', '2']).incremental == 2
+    assert parse_arguments(['--parallel-pages', '4']).parallel_pages == 4
+    assert parse_arguments(['--detail-tabs', '3']).detail_tabs == 3
+    assert parse_arguments(['--stream']).stream
+    assert parse_arguments(['--interleave']).interleave
+    assert parse_arguments([]).recycle_after == 500
+    assert parse_arguments(['--daemon']).daemon
+    assert parse_arguments(['--no-resume']).no_resume
+    assert parse_arguments(['--queue', 'queue.sqlite3', '--queue-delay', '5']).queue_delay == 5
+    assert parse_arguments(['--max-browser-mb', '800']).max_browser_mb == 800
+    assert parse_arguments(['--adaptive-rate', '--min-delay', '1', '--max-delay', '10']).max_delay == 10
+    
+    with pytest.raises(SystemExit):
+        parse_arguments(['--workers', '0'])
+    with pytest.raises(SystemExit):
+        parse_arguments(['--min-delay', '5', '--max-delay', '1'])
+    with pytest.raises(SystemExit):
+        parse_arguments(['--detail-tabs', '0'])
+    with pytest.raises(SystemExit):
+        parse_arguments(['--queue', 'queue.sqlite3', '--daemon'])
+    with pytest.raises(SystemExit):
+        parse_arguments(['--interleave', '--stream'])
+
+def test_run_scrapers_parallel(mock_configs):
+    """Test that the worker pool scrapes every site with one driver per worker."""
+    configs = mock_configs + [
+        {'xpath': "//a", 'url': "https://example.com/other?page=", 'increment': 1}
+    ]
+    drivers = []
+    
+    def driver_factory():
+        driver = Mock()
+        drivers.append(driver)
+        return driver
+    
+    with patch('run_scraper.scrape_single_site') as mock_scrape:
+        run_scrapers_parallel(configs, 4, driver_factory)
+        
+    # Only one worker per host group is started
+    assert len(drivers) == 2
+    assert mock_scrape.call_count == len(configs)
+    assert all(driver.quit.called for driver in drivers)
+    
+    # Both example.com configs were handled by the same driver
+    drivers_by_url = {call.args[0]['url']: call.args[1] for call in mock_scrape.call_args_list}
+    assert drivers_by_url["https://example.com/jobs?page="] is drivers_by_url["https://example.com/other?page="]
+
+def test_run_scrapers_parallel_releases_drivers(mock_configs):
+    """Test that pooled drivers are handed back instead of quit."""
+    drivers = [Mock(), Mock()]
+    released = []
+    
+    with patch('run_scraper.scrape_single_site'):
+        run_scrapers_parallel(mock_configs, 2, iter(drivers).__next__, release_driver=released.append)
+        
+    assert sorted(released, key=id) == sorted(drivers, key=id)
+    assert not any(driver.quit.called for driver in drivers)
+
+def test_run_daemon(tmp_path, monkeypatch, mock_configs):
+    """Test that the daemon scrapes due sites, schedules them and sleeps until the next is due."""
+    import threading
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    stop_event = threading.Event()
+    pool = Mock()
+    pool.acquire.return_value = Mock()
+    waits = []
+    
+    def fake_wait(timeout):
+        waits.append(timeout)
+        stop_event.set()
+        return True
+    
+    monkeypatch.setattr(stop_event, "wait", fake_wait)
+    with patch('run_scraper.load_scraper_configs', return_value=mock_configs), \
+         patch('run_scraper.scrape_single_site', return_value=3) as mock_scrape:
+        run_daemon(pool, 2, stop_event=stop_event)
+        
+    # Both sites were due once, then the daemon slept until the next round
+    assert mock_scrape.call_count == 2
+    assert len(waits) == 1 and 0 < waits[0] <= 300
+    assert (tmp_path / "cache" / "schedule.json").exists()
+    assert pool.release.call_count == pool.acquire.call_count
+
+def test_run_daemon_retries_failed_crawls(tmp_path, monkeypatch, mock_configs):
+    """Test that a failed crawl is retried soon instead of being scheduled as a quiet board."""
+    import threading
+    import time
+    from functions.functions_schedule import load_schedule, FAILED_CRAWL_RETRY
+    monkeypatch.setattr("functions.functions_scraper.CACHE_DIR", tmp_path / "cache")
+    stop_event = threading.Event()
+    pool = Mock()
+    pool.acquire.return_value = Mock()
+    monkeypatch.setattr(stop_event, "wait", lambda timeout: stop_event.set())
+    results = {mock_configs[0]['url']: None, mock_configs[1]['url']: 3}
+    
+    with patch('run_scraper.load_scraper_configs', return_value=mock_configs[:2]), \
+         patch('run_scraper.scrape_single_site', side_effect=lambda config, *args, **kwargs: results[config['url']]):
+        run_daemon(pool, 1, stop_event=stop_event)
+        
+    schedule = load_schedule(tmp_path / "cache" / "schedule.json")
+    failed = schedule[mock_configs[0]['url']]
+    assert failed.last_crawl == 0 and failed.new_jobs_per_hour is None
+    assert failed.next_due - time.time() == pytest.approx(FAILED_CRAWL_RETRY, abs=60)
+    assert schedule[mock_configs[1]['url']].last_crawl > 0
\ No newline at end of file